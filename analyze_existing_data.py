@@ -5,15 +5,74 @@
 
 import sys
 import os
-import json
 import re
-from bs4 import BeautifulSoup
+import argparse
+from collections import Counter
+import functools
+import io
+import itertools
+import mmap
+import pickle
+import shutil
+import tempfile
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.utils.logger import get_logger
+from src.utils import json_io
 
-def analyze_existing_html_data():
-    """既存のHTMLデータを詳細分析"""
+# ijsonが利用可能ならINITIAL_STATEを逐次解析し、動画抽出に必要な部分だけを構築
+try:
+    import ijson
+    INITIAL_STATE_DECODE_ERRORS = (json_io.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    INITIAL_STATE_DECODE_ERRORS = (json_io.JSONDecodeError,)
+
+# lxml（C実装）が利用可能なら優先し、なければ標準のhtml.parserを使用
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# 解析対象のタグだけをツリー化し、それ以外のマークアップのノード生成を省く
+LINK_SCRIPT_STRAINER = SoupStrainer(['a', 'script'])
+RECOMMEND_ITEM_STRAINER = SoupStrainer(attrs={'data-e2e': 'recommend-list-item'})
+
+# 抽出処理で繰り返し使用する正規表現（モジュール読み込み時に一度だけコンパイル）
+VIDEO_PATH_RE = re.compile(r'/video/(\d+)')
+AUTHOR_HANDLE_RE = re.compile(r'/@([\w.-]+)')
+
+# 高速パス用: DOMを構築せずHTMLのバイト列から直接抽出する正規表現
+FAST_VIDEO_URL_RE = re.compile(rb'/@([\w.-]+)/video/(\d+)')
+FAST_INITIAL_STATE_RE = re.compile(rb'window\.__INITIAL_STATE__\s*=\s*(\{.+?\});', re.DOTALL)
+
+# 動画リストを格納している可能性があるキー / 単一の動画IDを表すキー
+INITIAL_STATE_LIST_KEYS = frozenset({'itemList', 'items', 'videoList', 'videos', 'data', 'list'})
+SCRIPT_DATA_LIST_KEYS = frozenset({'itemList', 'items', 'videoList', 'videos', 'data'})
+VIDEO_ID_KEYS = frozenset({'aweme_id', 'video_id', 'id'})
+
+# 動画データの特徴的なキー（いずれかを含む辞書を動画アイテムとみなす）
+VIDEO_ITEM_KEYS = frozenset({'id', 'aweme_id', 'video_id', 'desc', 'author', 'stats'})
+
+# 分析結果ファイルの書き込みバッファサイズ
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# INITIAL_STATEの解析結果を実行をまたいで保持するサイドカーファイルの拡張子
+INITIAL_STATE_CACHE_SUFFIX = '.initial_state.pkl'
+
+def analyze_existing_html_data(fast=False):
+    """
+    既存のHTMLデータを詳細分析
+    
+    抽出した動画データはジェネレーターで1件ずつ流し、集計とファイル書き出しを
+    同時に行う（全動画をメモリに溜め込まない）。
+    
+    Args:
+        fast: Trueの場合は正規表現による高速パスを使用し、
+              動画が見つからなかった場合のみDOM解析にフォールバック
+    """
     logger = get_logger("AnalyzeExistingData")
     
     logger.info("="*60)
@@ -23,72 +82,41 @@ def analyze_existing_html_data():
     # 既存のHTMLファイルを分析
     html_files = [
         "debug/tiktok_explore_strategy_1.html",
-        "debug/tiktok_explore_strategy_2.html", 
+        "debug/tiktok_explore_strategy_2.html",
         "debug/tiktok_explore_strategy_3.html"
     ]
     
-    all_videos = []
+    all_videos = itertools.chain.from_iterable(
+        iter_file_videos(html_file, f"戦略{i}", fast, logger)
+        for i, html_file in enumerate(html_files, 1)
+    )
     
-    for i, html_file in enumerate(html_files, 1):
-        if not os.path.exists(html_file):
-            logger.warning(f"ファイルが見つかりません: {html_file}")
-            continue
-            
-        logger.info(f"\n--- 戦略{i}のHTMLファイル分析: {html_file} ---")
-        
-        try:
-            with open(html_file, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            logger.info(f"ファイルサイズ: {len(html_content)} 文字")
-            
-            # BeautifulSoupで解析
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 詳細分析
-            videos = analyze_html_content(soup, f"戦略{i}", logger)
-            all_videos.extend(videos)
-            
-        except Exception as e:
-            logger.error(f"ファイル分析エラー {html_file}: {e}")
+    # 結果を保存（集計しながら1件ずつ書き出し）
+    output_file = "debug/existing_data_analysis.json"
+    with AnalysisResultWriter(output_file) as writer:
+        for video in all_videos:
+            writer.write(video)
     
     # 全体統計
     logger.info(f"\n{'='*60}")
     logger.info(f"全体統計")
     logger.info(f"{'='*60}")
-    logger.info(f"総動画数: {len(all_videos)}")
+    logger.info(f"総動画数: {writer.total_videos}")
     
     # 抽出方法別統計
-    extraction_methods = {}
-    for video in all_videos:
-        method = video.get('extraction_method', 'unknown')
-        extraction_methods[method] = extraction_methods.get(method, 0) + 1
-    
     logger.info("抽出方法別統計:")
-    for method, count in extraction_methods.items():
+    for method, count in writer.extraction_methods.items():
         logger.info(f"  {method}: {count}件")
     
     # 有効な動画ID（数値）の統計
-    valid_video_ids = [v for v in all_videos if v.get('video_id', '').isdigit()]
-    logger.info(f"有効な動画ID（数値）: {len(valid_video_ids)}件")
-    
-    # 結果を保存
-    output_file = "debug/existing_data_analysis.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'total_videos': len(all_videos),
-            'valid_video_ids': len(valid_video_ids),
-            'extraction_methods': extraction_methods,
-            'all_videos': all_videos,
-            'valid_videos': valid_video_ids
-        }, f, ensure_ascii=False, indent=2)
+    logger.info(f"有効な動画ID（数値）: {writer.valid_video_count}件")
     
     logger.info(f"\n分析結果を保存: {output_file}")
     
     # 有効な動画の詳細表示
-    if valid_video_ids:
-        logger.info(f"\n有効な動画の詳細（最初の5件）:")
-        for i, video in enumerate(valid_video_ids[:5]):
+    if writer.valid_sample:
+        logger.info(f"\n有効な動画の詳細（最初の{len(writer.valid_sample)}件）:")
+        for i, video in enumerate(writer.valid_sample):
             logger.info(f"\n--- 動画 {i+1} ---")
             logger.info(f"ID: {video.get('video_id')}")
             logger.info(f"URL: {video.get('url')}")
@@ -100,103 +128,409 @@ def analyze_existing_html_data():
     logger.info("既存データの詳細分析完了")
     logger.info(f"{'='*60}")
 
-def analyze_html_content(soup, strategy_name, logger):
-    """HTMLコンテンツを詳細分析"""
-    videos = []
+def iter_file_videos(html_file, strategy_name, fast, logger):
+    """HTMLファイル1件を分析し、抽出した動画データを順に返すジェネレーター"""
+    if not os.path.exists(html_file):
+        logger.warning(f"ファイルが見つかりません: {html_file}")
+        return
+    
+    logger.info(f"\n--- {strategy_name}のHTMLファイル分析: {html_file} ---")
+    
+    try:
+        # INITIAL_STATEはファイルのパスと更新時刻をキーにキャッシュ
+        initial_state = load_initial_state(html_file, os.path.getmtime(html_file))
+        
+        if fast:
+            # ファイル全体を読み込まず、mmapのゼロコピービューに対して正規表現を実行
+            with open(html_file, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_map:
+                logger.info(f"ファイルサイズ: {len(html_map)} バイト")
+                
+                found = False
+                for video in analyze_html_fast(html_map, strategy_name, logger, initial_state):
+                    found = True
+                    yield video
+                
+                if not found:
+                    logger.info("高速パスで動画が見つからないため、DOM解析にフォールバック")
+                    yield from analyze_html_content(
+                        html_map[:].decode('utf-8'), strategy_name, logger, initial_state
+                    )
+            return
+        
+        with open(html_file, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        
+        logger.info(f"ファイルサイズ: {len(html_content)} 文字")
+        
+        # 詳細分析
+        yield from analyze_html_content(html_content, strategy_name, logger, initial_state)
+    
+    except Exception as e:
+        logger.error(f"ファイル分析エラー {html_file}: {e}")
+
+def is_valid_video(video):
+    """動画IDが数値の有効な動画データかどうかを判定"""
+    return video.get('video_id', '').isdigit()
+
+class AnalysisResultWriter:
+    """
+    分析結果のJSONファイルを動画1件ずつ書き出すライター
+    
+    メモリに保持するのは集計値と先頭数件の有効な動画のみで、
+    有効な動画のリストは一時ファイルに退避して最後に連結する。
+    出力は同じディレクトリの一時ファイルに書き、正常に書き終えた場合のみ
+    出力ファイルと置き換えるため、途中で失敗しても前回の結果は残る。
+    """
+    
+    def __init__(self, output_file, sample_size=5):
+        """
+        Args:
+            output_file: 出力ファイルパス
+            sample_size: 詳細表示用に保持する有効な動画の件数
+        """
+        self.output_file = output_file
+        self.sample_size = sample_size
+        self.total_videos = 0
+        self.valid_video_count = 0
+        self.extraction_methods = Counter()
+        self.valid_sample = []
+        self._temp_file = f"{output_file}.{os.getpid()}.tmp"
+        self._file = None
+        self._valid_spool = None
+    
+    def __enter__(self):
+        self._file = open(self._temp_file, 'wb', buffering=OUTPUT_BUFFER_SIZE)
+        self._valid_spool = tempfile.TemporaryFile()
+        self._file.write(b'{"all_videos":[')
+        return self
+    
+    def write(self, video):
+        """動画データを1件書き出し、集計を更新"""
+        record = json_io.dumps(video)
+        self._file.write(b',\n' if self.total_videos else b'\n')
+        self._file.write(record)
+        self.total_videos += 1
+        self.extraction_methods[video.get('extraction_method', 'unknown')] += 1
+        
+        if is_valid_video(video):
+            self._valid_spool.write(b',\n' if self.valid_video_count else b'\n')
+            self._valid_spool.write(record)
+            self.valid_video_count += 1
+            if len(self.valid_sample) < self.sample_size:
+                self.valid_sample.append(video)
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._file.write(b'\n]' if self.total_videos else b']')
+                
+                # 退避しておいた有効な動画のリストを連結
+                self._file.write(b',"valid_videos":[')
+                self._valid_spool.seek(0)
+                shutil.copyfileobj(self._valid_spool, self._file, OUTPUT_BUFFER_SIZE)
+                self._file.write(b'\n]' if self.valid_video_count else b']')
+                
+                # 集計値は全件の書き出し後に確定するため末尾に出力
+                summary = json_io.dumps({
+                    'total_videos': self.total_videos,
+                    'valid_video_ids': self.valid_video_count,
+                    'extraction_methods': self.extraction_methods
+                })
+                self._file.write(b',' + summary[1:])
+                self._file.close()
+                os.replace(self._temp_file, self.output_file)
+        finally:
+            self._valid_spool.close()
+            self._file.close()
+            # 置き換えなかった（失敗した）場合は書きかけの一時ファイルを削除
+            if os.path.exists(self._temp_file):
+                os.remove(self._temp_file)
+        return False
+
+def parse_initial_state_pruned(raw):
+    """
+    INITIAL_STATEのJSONをijsonで逐次解析し、動画抽出に必要な部分だけを残した木を構築
+    
+    残すのは動画リストのキー配下の辞書要素、動画IDキーの値、およびそれらを含む
+    コンテナのみ。extract_from_initial_state の走査結果は全体を解析した場合と同じになる。
+    
+    Args:
+        raw: INITIAL_STATEのJSONバイト列
+        
+    Returns:
+        枝刈り済みのINITIAL_STATE
+    """
+    root = None
+    # 各要素: [コンテナ, 直近のキー, 動画リストかどうか]
+    stack = []
+    builder = None
+    builder_depth = 0
+    
+    for event, value in ijson.basic_parse(io.BytesIO(raw), use_float=True):
+        # 動画リスト内の辞書要素はそのまま構築
+        if builder is not None:
+            builder.event(event, value)
+            if event in ('start_map', 'start_array'):
+                builder_depth += 1
+            elif event in ('end_map', 'end_array'):
+                builder_depth -= 1
+                if builder_depth == 0:
+                    stack[-1][0].append(builder.value)
+                    builder = None
+            continue
+        
+        frame = stack[-1] if stack else None
+        
+        if event == 'map_key':
+            frame[1] = value
+        elif event in ('start_map', 'start_array'):
+            if frame is not None and frame[2]:
+                if event == 'start_map':
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    builder_depth = 1
+                    continue
+                # 動画リスト内の辞書以外の要素は走査対象外
+                stack.append([[], None, False])
+                continue
+            is_video_list = (
+                event == 'start_array'
+                and frame is not None
+                and isinstance(frame[0], dict)
+                and frame[1] in INITIAL_STATE_LIST_KEYS
+            )
+            stack.append([{} if event == 'start_map' else [], None, is_video_list])
+        elif event in ('end_map', 'end_array'):
+            container = stack.pop()[0]
+            if not stack:
+                root = container
+            elif container and not stack[-1][2]:
+                parent = stack[-1]
+                if isinstance(parent[0], dict):
+                    parent[0][parent[1]] = container
+                else:
+                    parent[0].append(container)
+        elif (
+            frame is not None
+            and isinstance(frame[0], dict)
+            and frame[1] in VIDEO_ID_KEYS
+            and isinstance(value, (str, int))
+        ):
+            # 単一の動画IDの可能性がある値のみ保持
+            frame[0][frame[1]] = value
+    
+    return root
+
+@functools.lru_cache(maxsize=None)
+def load_initial_state(html_file, mtime):
+    """
+    HTMLファイルから window.__INITIAL_STATE__ のJSONを読み込み
+    
+    結果はプロセス内ではパスと更新時刻をキーにメモ化し、
+    実行をまたいではサイドカーのpickleファイルに保存する。
+    返り値は共有されるため、呼び出し側で変更しないこと。
+    
+    Args:
+        html_file: HTMLファイルのパス
+        mtime: HTMLファイルの更新時刻（キャッシュキー）
+        
+    Returns:
+        解析済みのINITIAL_STATE（見つからない場合はNone）
+    """
+    cache_file = html_file + INITIAL_STATE_CACHE_SUFFIX
+    
+    try:
+        with open(cache_file, 'rb') as f:
+            cached_mtime, data = pickle.load(f)
+        if cached_mtime == mtime:
+            return data
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+    
+    data = None
+    if os.path.getsize(html_file) > 0:
+        # mmap上で検索し、コピーするのはマッチしたJSON部分のみ
+        with open(html_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as html_map:
+            json_match = None
+            if html_map.find(b'window.__INITIAL_STATE__') != -1:
+                json_match = FAST_INITIAL_STATE_RE.search(html_map)
+            if json_match:
+                try:
+                    if ijson is not None:
+                        data = parse_initial_state_pruned(json_match.group(1))
+                    else:
+                        data = json_io.loads(json_match.group(1))
+                except INITIAL_STATE_DECODE_ERRORS:
+                    pass
+    
+    try:
+        with open(cache_file, 'wb') as f:
+            pickle.dump((mtime, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    
+    return data
+
+def analyze_html_content(html_content, strategy_name, logger, initial_state=None):
+    """HTMLコンテンツを詳細分析し、抽出した動画データを順に返すジェネレーター"""
+    video_count = 0
+    # 抽出済みの動画ID（重複する動画は辞書を作る前にスキップ）
+    seen = set()
+    
+    # BeautifulSoupで解析（<a>/<script> と recommend-list-item のみをパース）
+    soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=LINK_SCRIPT_STRAINER)
+    item_soup = BeautifulSoup(html_content, HTML_PARSER, parse_only=RECOMMEND_ITEM_STRAINER)
+    
+    # 動画リンクとscriptタグを1回のツリー走査でまとめて収集
+    # （href は部分文字列判定で絞り込み、動画IDの検証は extract_from_video_link 側で行う）
+    video_links = []
+    script_tags = []
+    for node in soup.descendants:
+        if not isinstance(node, Tag):
+            continue
+        if node.name == 'a':
+            href = node.get('href')
+            if href and '/video/' in href:
+                video_links.append(node)
+        elif node.name == 'script':
+            script_tags.append(node)
     
     # 1. 動画リンクの検索
-    video_links = soup.find_all('a', href=re.compile(r'/video/\d+'))
     logger.info(f"動画リンク: {len(video_links)}件")
     
     for link in video_links:
-        video_data = extract_from_video_link(link, strategy_name)
+        video_data = extract_from_video_link(link, strategy_name, seen)
         if video_data:
-            videos.append(video_data)
+            video_count += 1
+            yield video_data
     
     # 2. data-e2e属性の検索
-    recommend_items = soup.find_all(attrs={'data-e2e': 'recommend-list-item'})
+    recommend_items = item_soup.find_all(attrs={'data-e2e': 'recommend-list-item'})
     logger.info(f"recommend-list-item: {len(recommend_items)}件")
     
     for item in recommend_items:
-        video_data = extract_from_recommend_item(item, strategy_name)
+        video_data = extract_from_recommend_item(item, strategy_name, seen)
         if video_data:
-            videos.append(video_data)
+            video_count += 1
+            yield video_data
     
     # 3. JavaScriptデータの検索
-    script_tags = soup.find_all('script')
     logger.info(f"scriptタグ: {len(script_tags)}件")
     
     json_scripts = 0
     for script in script_tags:
-        if script.string and ('{' in script.string or '[' in script.string):
-            json_scripts += 1
-            try:
-                # JSONデータの抽出を試行
-                script_content = script.string.strip()
-                
-                # window.__INITIAL_STATE__ パターン
-                if 'window.__INITIAL_STATE__' in script_content:
-                    logger.info("window.__INITIAL_STATE__ を発見")
-                    json_match = re.search(r'window\.__INITIAL_STATE__\s*=\s*({.+?});', script_content, re.DOTALL)
-                    if json_match:
-                        try:
-                            data = json.loads(json_match.group(1))
-                            script_videos = extract_from_initial_state(data, strategy_name)
-                            videos.extend(script_videos)
-                            logger.info(f"INITIAL_STATE から {len(script_videos)} 件の動画データを抽出")
-                        except json.JSONDecodeError:
-                            pass
-                
-                # その他のJSONパターン
-                elif script_content.startswith('{') or script_content.startswith('['):
-                    try:
-                        data = json.loads(script_content)
-                        script_videos = extract_from_script_data(data, strategy_name)
-                        videos.extend(script_videos)
-                        if script_videos:
-                            logger.info(f"スクリプトデータから {len(script_videos)} 件の動画データを抽出")
-                    except json.JSONDecodeError:
-                        pass
-                        
-            except Exception as e:
+        script_string = script.string
+        if not script_string:
+            continue
+        
+        try:
+            # window.__INITIAL_STATE__ パターン（安価な部分文字列判定を先に行う）
+            # （JSONは load_initial_state で解析済みのものを使用）
+            if 'window.__INITIAL_STATE__' in script_string:
+                json_scripts += 1
+                logger.info("window.__INITIAL_STATE__ を発見")
+                if initial_state is not None:
+                    script_count = 0
+                    for video_data in extract_from_initial_state(initial_state, strategy_name, seen):
+                        script_count += 1
+                        yield video_data
+                    video_count += script_count
+                    logger.info(f"INITIAL_STATE から {script_count} 件の動画データを抽出")
                 continue
+            
+            # その他のJSONパターン（先頭文字が { か [ の場合のみ解析を試行）
+            script_content = script_string.strip()
+            if script_content[:1] in ('{', '['):
+                json_scripts += 1
+                try:
+                    data = json_io.loads(script_content)
+                except json_io.JSONDecodeError:
+                    continue
+                script_count = 0
+                for video_data in extract_from_script_data(data, strategy_name, seen):
+                    script_count += 1
+                    yield video_data
+                video_count += script_count
+                if script_count:
+                    logger.info(f"スクリプトデータから {script_count} 件の動画データを抽出")
+                    
+        except Exception as e:
+            continue
     
     logger.info(f"JSON形式のスクリプト: {json_scripts}件")
     
-    # 4. その他のパターン検索
-    # TikTok特有のクラス名やID
-    tiktok_elements = soup.find_all(class_=re.compile(r'(video|item|card|post)', re.I))
-    logger.info(f"TikTok関連要素: {len(tiktok_elements)}件")
+    logger.info(f"{strategy_name}: {video_count}件の一意な動画データを抽出")
+
+def analyze_html_fast(html_bytes, strategy_name, logger, initial_state=None):
+    """
+    HTMLのバイト列を正規表現のみで走査して動画データを抽出（DOMを構築しない）
+    
+    html_bytes には bytes のほか mmap などのバッファオブジェクトも渡せる。
+    抽出した動画データは順に返す（ジェネレーター）。
+    """
+    video_count = 0
+    seen = set()
+    
+    # 1. 動画URL（/@作者/video/ID）の検索
+    for match in FAST_VIDEO_URL_RE.finditer(html_bytes):
+        video_id = match.group(2).decode('ascii')
+        if video_id in seen:
+            continue
+        seen.add(video_id)
+        author_username = match.group(1).decode('utf-8')
+        video_count += 1
+        yield {
+            'video_id': video_id,
+            'url': f"https://www.tiktok.com/@{author_username}/video/{video_id}",
+            'author_username': author_username,
+            'extraction_method': f'fast_regex_{strategy_name}',
+            'strategy': strategy_name
+        }
+    logger.info(f"動画URL（正規表現）: {video_count}件")
     
-    # 重複除去
-    unique_videos = remove_duplicate_videos(videos)
-    logger.info(f"{strategy_name}: {len(unique_videos)}件の一意な動画データを抽出")
+    # 2. window.__INITIAL_STATE__（load_initial_state で解析済み）
+    if initial_state is not None:
+        logger.info("window.__INITIAL_STATE__ を発見")
+        script_count = 0
+        for video_data in extract_from_initial_state(initial_state, strategy_name, seen):
+            script_count += 1
+            yield video_data
+        video_count += script_count
+        logger.info(f"INITIAL_STATE から {script_count} 件の動画データを抽出")
     
-    return unique_videos
+    logger.info(f"{strategy_name}: {video_count}件の一意な動画データを抽出（高速パス）")
 
-def extract_from_video_link(link, strategy_name):
-    """動画リンクから動画データを抽出"""
+def extract_from_video_link(link, strategy_name, seen):
+    """動画リンクから動画データを抽出（seen に含まれる動画IDはスキップ）"""
     try:
         href = link.get('href', '')
         
         # 動画IDを抽出
-        video_id_match = re.search(r'/video/(\d+)', href)
+        video_id_match = VIDEO_PATH_RE.search(href)
         if not video_id_match:
             return None
         
         video_id = video_id_match.group(1)
+        if video_id in seen:
+            return None
         
         # 作者情報を抽出
         author_username = ''
         if '/@' in href:
-            author_match = re.search(r'/@([\w.-]+)', href)
+            author_match = AUTHOR_HANDLE_RE.search(href)
             if author_match:
                 author_username = author_match.group(1)
         
         # 親要素から追加情報を抽出
+        # （SoupStrainerで親が破棄されている場合はリンク自身のテキストを使用）
         parent = link.parent
-        text_content = parent.get_text(strip=True) if parent else ''
+        if parent is None or parent.name == BeautifulSoup.ROOT_TAG_NAME:
+            parent = link
+        text_content = parent.get_text(strip=True)
         
+        seen.add(video_id)
         return {
             'video_id': video_id,
             'url': f"https://www.tiktok.com{href}" if href.startswith('/') else href,
@@ -209,8 +543,8 @@ def extract_from_video_link(link, strategy_name):
     except Exception as e:
         return None
 
-def extract_from_recommend_item(item, strategy_name):
-    """recommend-list-item要素から動画データを抽出"""
+def extract_from_recommend_item(item, strategy_name, seen):
+    """recommend-list-item要素から動画データを抽出（seen に含まれる動画IDはスキップ）"""
     try:
         # 動画リンクを検索
         link = item.find('a', href=True)
@@ -220,23 +554,26 @@ def extract_from_recommend_item(item, strategy_name):
         href = link['href']
         
         # 動画IDを抽出
-        video_id_match = re.search(r'/video/(\d+)', href)
+        video_id_match = VIDEO_PATH_RE.search(href)
         if not video_id_match:
             return None
         
         video_id = video_id_match.group(1)
+        if video_id in seen:
+            return None
         
         # 作者情報を抽出
-        author_link = item.find('a', href=re.compile(r'/@[\w.-]+'))
+        author_link = item.find('a', href=AUTHOR_HANDLE_RE)
         author_username = ''
         if author_link:
-            author_match = re.search(r'/@([\w.-]+)', author_link['href'])
+            author_match = AUTHOR_HANDLE_RE.search(author_link['href'])
             if author_match:
                 author_username = author_match.group(1)
         
         # テキストコンテンツを抽出
         text_content = item.get_text(strip=True)
         
+        seen.add(video_id)
         return {
             'video_id': video_id,
             'url': f"https://www.tiktok.com{href}" if href.startswith('/') else href,
@@ -249,97 +586,89 @@ def extract_from_recommend_item(item, strategy_name):
     except Exception as e:
         return None
 
-def extract_from_initial_state(data, strategy_name):
-    """INITIAL_STATEデータから動画データを抽出"""
-    videos = []
+def iter_json_pairs(data, list_keys):
+    """
+    JSONデータの (キー, 値) を元の再帰と同じ前順序で列挙
     
+    再帰の代わりにイテレータのスタックで走査するため、深いJSONでも再帰上限に
+    達しない。各ペアを返した直後にその値（辞書・リスト）へ降りるので、呼び出し側は
+    兄弟のキーより先に子を処理する。list_keys のキーが持つリストは要素を呼び出し側が
+    調べるため、その中へは降りない。リストの要素のキーはインデックス。
+    """
+    stack = [iter(((None, data),))]
+    while stack:
+        for key, value in stack[-1]:
+            yield key, value
+            if isinstance(value, dict):
+                stack.append(iter(value.items()))
+                break
+            if isinstance(value, list) and key not in list_keys:
+                stack.append(enumerate(value))
+                break
+        else:
+            stack.pop()
+
+def extract_from_initial_state(data, strategy_name, seen):
+    """INITIAL_STATEデータから動画データを順に抽出（seen に含まれる動画IDはスキップ）"""
     try:
-        def search_video_data(obj, path=""):
-            if isinstance(obj, dict):
-                # 動画データの可能性があるキーを検索
-                for key, value in obj.items():
-                    if key in ['itemList', 'items', 'videoList', 'videos', 'data', 'list']:
-                        if isinstance(value, list):
-                            for item in value:
-                                if is_video_item(item):
-                                    video_data = extract_video_from_item(item, strategy_name)
-                                    if video_data:
-                                        videos.append(video_data)
-                        else:
-                            search_video_data(value, f"{path}.{key}")
-                    elif key in ['aweme_id', 'video_id', 'id'] and isinstance(value, (str, int)):
-                        # 単一の動画IDの場合
-                        if str(value).isdigit():
-                            videos.append({
-                                'video_id': str(value),
-                                'url': f"https://www.tiktok.com/video/{value}",
-                                'extraction_method': f'initial_state_{strategy_name}',
-                                'strategy': strategy_name
-                            })
-                    else:
-                        search_video_data(value, f"{path}.{key}")
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    search_video_data(item, f"{path}[{i}]")
-        
-        search_video_data(data)
+        for key, value in iter_json_pairs(data, INITIAL_STATE_LIST_KEYS):
+            # 動画データの可能性があるキーを検索
+            if key in INITIAL_STATE_LIST_KEYS and isinstance(value, list):
+                for item in value:
+                    if is_video_item(item):
+                        video_data = extract_video_from_item(item, strategy_name, seen)
+                        if video_data:
+                            yield video_data
+            elif key in VIDEO_ID_KEYS and isinstance(value, (str, int)):
+                # 単一の動画IDの場合
+                video_id = str(value)
+                if video_id.isdigit() and video_id not in seen:
+                    seen.add(video_id)
+                    yield {
+                        'video_id': video_id,
+                        'url': f"https://www.tiktok.com/video/{video_id}",
+                        'extraction_method': f'initial_state_{strategy_name}',
+                        'strategy': strategy_name
+                    }
         
     except Exception as e:
         pass
-    
-    return videos
 
-def extract_from_script_data(data, strategy_name):
-    """スクリプトデータから動画データを抽出"""
-    videos = []
-    
+def extract_from_script_data(data, strategy_name, seen):
+    """スクリプトデータから動画データを順に抽出（seen に含まれる動画IDはスキップ）"""
     try:
-        def search_video_data(obj, path=""):
-            if isinstance(obj, dict):
-                for key, value in obj.items():
-                    if key in ['itemList', 'items', 'videoList', 'videos', 'data']:
-                        if isinstance(value, list):
-                            for item in value:
-                                if is_video_item(item):
-                                    video_data = extract_video_from_item(item, strategy_name)
-                                    if video_data:
-                                        videos.append(video_data)
-                        else:
-                            search_video_data(value, f"{path}.{key}")
-                    else:
-                        search_video_data(value, f"{path}.{key}")
-            elif isinstance(obj, list):
-                for i, item in enumerate(obj):
-                    search_video_data(item, f"{path}[{i}]")
-        
-        search_video_data(data)
+        for key, value in iter_json_pairs(data, SCRIPT_DATA_LIST_KEYS):
+            if key in SCRIPT_DATA_LIST_KEYS and isinstance(value, list):
+                for item in value:
+                    if is_video_item(item):
+                        video_data = extract_video_from_item(item, strategy_name, seen)
+                        if video_data:
+                            yield video_data
         
     except Exception as e:
         pass
-    
-    return videos
 
 def is_video_item(item):
     """アイテムが動画データかどうかを判定"""
-    if not isinstance(item, dict):
-        return False
-    
-    # 動画データの特徴的なキーをチェック
-    video_keys = ['id', 'aweme_id', 'video_id', 'desc', 'author', 'stats']
-    return any(key in item for key in video_keys)
+    # 辞書のキーとの共通部分の有無をC実装の集合演算で判定
+    return isinstance(item, dict) and not VIDEO_ITEM_KEYS.isdisjoint(item)
 
-def extract_video_from_item(item, strategy_name):
-    """動画アイテムから動画データを抽出"""
+def extract_video_from_item(item, strategy_name, seen):
+    """動画アイテムから動画データを抽出（seen に含まれる動画IDはスキップ）"""
     try:
         video_id = item.get('id') or item.get('aweme_id') or item.get('video_id')
         if not video_id:
             return None
         
+        video_id = str(video_id)
+        if video_id in seen:
+            return None
+        
         author = item.get('author', {})
         stats = item.get('stats', {})
         
-        return {
-            'video_id': str(video_id),
+        video_data = {
+            'video_id': video_id,
             'url': f"https://www.tiktok.com/@{author.get('unique_id', 'unknown')}/video/{video_id}",
             'description': item.get('desc', ''),
             'author_username': author.get('unique_id', ''),
@@ -352,23 +681,20 @@ def extract_video_from_item(item, strategy_name):
             'extraction_method': f'script_data_{strategy_name}',
             'strategy': strategy_name
         }
+        seen.add(video_id)
+        return video_data
         
     except Exception as e:
         return None
 
-def remove_duplicate_videos(videos):
-    """重複する動画を除去"""
-    seen_ids = set()
-    unique_videos = []
-    
-    for video in videos:
-        video_id = video.get('video_id')
-        if video_id and video_id not in seen_ids:
-            unique_videos.append(video)
-            seen_ids.add(video_id)
-    
-    return unique_videos
-
 if __name__ == "__main__":
-    analyze_existing_html_data()
+    parser = argparse.ArgumentParser(description="既存のHTMLデータを詳細分析")
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='DOMを構築せず正規表現で動画IDを抽出（見つからない場合はDOM解析）'
+    )
+    args = parser.parse_args()
+    
+    analyze_existing_html_data(fast=args.fast)
 
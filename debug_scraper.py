@@ -5,6 +5,7 @@ TikTok Scraper Debug Tool
 """
 
 import sys
+import re
 import json
 from pathlib import Path
 
@@ -15,6 +16,9 @@ from src.scraper.scraperapi_client import ScraperAPIClient
 from src.parser.tiktok_parser import TikTokParser
 from src.utils.logger import setup_logging, get_logger
 
+# 動画関連要素のclass属性の判定用（要素ごとに小文字化した文字列を作らずに検索）
+VIDEO_CLASS_RE = re.compile('video', re.IGNORECASE)
+
 def debug_tiktok_scraping():
     """TikTokスクレイピングのデバッグ"""
     print("🔍 TikTok Scraper Debug Tool")
@@ -32,7 +36,8 @@ def debug_tiktok_scraping():
         return
     
     api_client = ScraperAPIClient(api_key)
-    parser = TikTokParser()
+    # 構造分析で同じページを再び解析するため、解析済みツリーを1件保持
+    parser = TikTokParser(soup_cache_size=1)
     
     try:
         print("📡 TikTok /exploreページにアクセス中...")
@@ -111,8 +116,8 @@ def debug_tiktok_scraping():
         print("-" * 40)
         
         # 基本的なHTML要素の確認
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # （parse_explore_page で解析済みのツリーを再利用し、再パースしない）
+        soup = parser.html_parser.parse_html(html_content)
         
         # タイトル
         title = soup.find('title')
@@ -134,7 +139,7 @@ def debug_tiktok_scraping():
         print(f"TikTokリンク数: {len(tiktok_links)}")
         
         # 動画関連の要素
-        video_elements = soup.find_all(['video', 'div'], class_=lambda x: x and 'video' in x.lower() if x else False)
+        video_elements = soup.find_all(['video', 'div'], class_=VIDEO_CLASS_RE)
         print(f"動画関連要素数: {len(video_elements)}")
         
         # JSON-LDデータの確認
@@ -4,16 +4,26 @@ Demo data generator for TikTok Research System
 APIキーなしでもシステムの動作確認ができるデモデータを生成
 """
 
-import json
-import random
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+# プロジェクトルートをパスに追加
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils import json_io
+
 # デモ用の動画データを生成
 def generate_demo_videos(count=50):
     """デモ用の動画データを生成"""
     demo_videos = []
     
+    # 現在時刻はループ外で一度だけ取得し、全動画で共有
+    now = datetime.now()
+    now_iso = now.isoformat()
+    
     # 日本のトレンドハッシュタグ例
     hashtags = [
         "#おすすめ", "#fyp", "#viral", "#japan", "#tokyo", "#trending",
@@ -28,40 +38,59 @@ def generate_demo_videos(count=50):
         "cute_content", "food_blogger", "travel_vlogger", "fashion_icon"
     ]
     
+    # 乱数は動画ごとではなく全件分の配列としてまとめて生成
+    rng = np.random.default_rng()
+    
+    # ランダムな再生数（10万〜500万）
+    view_counts = rng.integers(100000, 5000000, size=count, endpoint=True)
+    
+    # 24時間以内のランダムな投稿時間
+    hours_ago = rng.integers(1, 24, size=count, endpoint=True).tolist()
+    
+    # エンゲージメント率を再生数に基づいて計算
+    engagement_rates = rng.uniform(0.02, 0.15, size=count)  # 2-15%
+    like_counts = (view_counts * engagement_rates).astype(np.int64)
+    comment_counts = (like_counts * rng.uniform(0.05, 0.2, size=count)).astype(np.int64).tolist()
+    share_counts = (like_counts * rng.uniform(0.1, 0.3, size=count)).astype(np.int64).tolist()
+    view_counts = view_counts.tolist()
+    like_counts = like_counts.tolist()
+    
+    url_usernames = rng.integers(0, len(usernames), size=count).tolist()
+    author_usernames = rng.integers(0, len(usernames), size=count).tolist()
+    text_hashtags = rng.integers(0, len(hashtags), size=(count, 3)).tolist()
+    author_verified = (rng.random(count) < 0.5).tolist()
+    follower_counts = rng.integers(1000, 1000000, size=count, endpoint=True).tolist()
+    durations = rng.integers(15, 60, size=count, endpoint=True).tolist()  # 15-60秒
+    trending_scores = rng.uniform(0.5, 1.0, size=count).tolist()
+    
+    # 動画ごとに重複なしで2〜5個のハッシュタグ（行ごとの乱数の順位で並べ替えて先頭を採用）
+    hashtag_orders = np.argsort(rng.random((count, len(hashtags))), axis=1).tolist()
+    hashtag_counts = rng.integers(2, 5, size=count, endpoint=True).tolist()
+    
     for i in range(count):
-        # ランダムな再生数（10万〜500万）
-        view_count = random.randint(100000, 5000000)
-        
-        # 24時間以内のランダムな投稿時間
-        hours_ago = random.randint(1, 24)
-        upload_time = datetime.now() - timedelta(hours=hours_ago)
-        
-        # エンゲージメント率を再生数に基づいて計算
-        engagement_rate = random.uniform(0.02, 0.15)  # 2-15%
-        like_count = int(view_count * engagement_rate)
-        comment_count = int(like_count * random.uniform(0.05, 0.2))
-        share_count = int(like_count * random.uniform(0.1, 0.3))
+        upload_time = now - timedelta(hours=hours_ago[i])
+        title_tag, desc_tag1, desc_tag2 = (hashtags[j] for j in text_hashtags[i])
         
         video = {
             "video_id": f"demo_{i+1:03d}",
-            "url": f"https://tiktok.com/@{random.choice(usernames)}/video/demo_{i+1:03d}",
-            "title": f"トレンド動画 #{i+1} {random.choice(hashtags)}",
-            "description": f"日本で人気のトレンド動画です！ {random.choice(hashtags)} {random.choice(hashtags)}",
-            "view_count": view_count,
-            "like_count": like_count,
-            "comment_count": comment_count,
-            "share_count": share_count,
+            "url": f"https://tiktok.com/@{usernames[url_usernames[i]]}/video/demo_{i+1:03d}",
+            "title": f"トレンド動画 #{i+1} {title_tag}",
+            "description": f"日本で人気のトレンド動画です！ {desc_tag1} {desc_tag2}",
+            "view_count": view_counts[i],
+            "like_count": like_counts[i],
+            "comment_count": comment_counts[i],
+            "share_count": share_counts[i],
             "upload_date": upload_time.isoformat(),
-            "author_username": random.choice(usernames),
+            "author_username": usernames[author_usernames[i]],
             "author_display_name": f"TikToker {i+1}",
-            "author_verified": random.choice([True, False]),
-            "author_follower_count": random.randint(1000, 1000000),
-            "duration": random.randint(15, 60),  # 15-60秒
-            "hashtags": random.sample(hashtags, random.randint(2, 5)),
+            "author_verified": author_verified[i],
+            "author_follower_count": follower_counts[i],
+            "duration": durations[i],
+            "hashtags": [hashtags[j] for j in hashtag_orders[i][:hashtag_counts[i]]],
             "region": "JP",
             "language": "ja",
-            "collected_at": datetime.now().isoformat(),
-            "trending_score": random.uniform(0.5, 1.0)
+            "collected_at": now_iso,
+            "trending_score": trending_scores[i]
         }
         
         demo_videos.append(video)
@@ -70,36 +99,47 @@ def generate_demo_videos(count=50):
 
 def save_demo_data():
     """デモデータをJSONファイルに保存"""
+    # 現在時刻はループ外で一度だけ取得し、全動画で共有
+    now = datetime.now()
+    now_iso = now.isoformat()
+    
     # 50万再生以上の動画を25件生成
+    count = 25
+    rng = np.random.default_rng()
+    
+    view_counts = rng.integers(500000, 5000000, size=count, endpoint=True)  # 50万〜500万再生
+    hours_ago = rng.integers(1, 24, size=count, endpoint=True).tolist()
+    
+    engagement_rates = rng.uniform(0.05, 0.2, size=count)  # 高エンゲージメント
+    like_counts = (view_counts * engagement_rates).astype(np.int64)
+    comment_counts = (like_counts * rng.uniform(0.1, 0.3, size=count)).astype(np.int64).tolist()
+    view_counts = view_counts.tolist()
+    like_counts = like_counts.tolist()
+    
     trending_videos = []
-    for i in range(25):
-        view_count = random.randint(500000, 5000000)  # 50万〜500万再生
-        hours_ago = random.randint(1, 24)
-        upload_time = datetime.now() - timedelta(hours=hours_ago)
-        
-        engagement_rate = random.uniform(0.05, 0.2)  # 高エンゲージメント
-        like_count = int(view_count * engagement_rate)
-        comment_count = int(like_count * random.uniform(0.1, 0.3))
+    for i in range(count):
+        view_count = view_counts[i]
+        upload_time = now - timedelta(hours=hours_ago[i])
         
         video = {
             "video_id": f"trending_{i+1:03d}",
             "url": f"https://tiktok.com/@viral_creator_{i+1}/video/trending_{i+1:03d}",
             "title": f"🔥 バイラル動画 #{i+1} - {view_count:,}回再生",
             "view_count": view_count,
-            "like_count": like_count,
-            "comment_count": comment_count,
+            "like_count": like_counts[i],
+            "comment_count": comment_counts[i],
             "upload_date": upload_time.isoformat(),
             "author_username": f"viral_creator_{i+1}",
             "author_verified": True,
             "region": "JP",
-            "collected_at": datetime.now().isoformat()
+            "collected_at": now_iso
         }
         trending_videos.append(video)
     
     # デモデータを保存
     demo_data = {
         "metadata": {
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": now_iso,
             "total_videos": len(trending_videos),
             "criteria": {
                 "min_views": 500000,
@@ -115,8 +155,7 @@ def save_demo_data():
     data_dir.mkdir(exist_ok=True)
     
     # JSONファイルに保存
-    with open(data_dir / "demo_trending_videos.json", "w", encoding="utf-8") as f:
-        json.dump(demo_data, f, ensure_ascii=False, indent=2)
+    json_io.dump(demo_data, data_dir / "demo_trending_videos.json")
     
     print(f"✅ デモデータを生成しました: {len(trending_videos)}件の動画")
     print(f"📁 保存場所: {data_dir / 'demo_trending_videos.json'}")
@@ -6,6 +6,7 @@ APIキーなしでもシステムの動作確認ができるデモモード
 
 import json
 import sys
+import heapq
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -61,7 +62,7 @@ def demo_video_collection():
     
     # システムコンポーネントを初期化
     print("🔧 システムコンポーネントを初期化中...")
-    db = DatabaseManager(":memory:")  # メモリ内データベース
+    db = DatabaseManager(":memory:", fast_mode=True)  # メモリ内データベース
     video_filter = VideoFilter()
     
     # デモ動画データを変換
@@ -97,8 +98,7 @@ def demo_video_collection():
     
     # データベース保存のデモ
     print("💾 データベース保存中...")
-    for video in trending_videos:
-        db.save_video(video)
+    db.save_videos(trending_videos)
     
     # 統計情報を表示
     stats = db.get_statistics()
@@ -111,7 +111,7 @@ def demo_video_collection():
     # トップ動画を表示
     print("🏆 トップ5動画:")
     print("-" * 40)
-    top_videos = sorted(trending_videos, key=lambda x: x.view_count, reverse=True)[:5]
+    top_videos = heapq.nlargest(5, trending_videos, key=lambda x: x.view_count)
     
     for i, video in enumerate(top_videos, 1):
         hours_ago = (datetime.now() - video.upload_date).total_seconds() / 3600
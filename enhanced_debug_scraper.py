@@ -12,17 +12,205 @@ Enhanced TikTok Scraper Debug Tool
 
 import sys
 import os
+import re
 import time
-import random
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 # プロジェクトルートをパスに追加
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.scraper.scraperapi_client import ScraperAPIClient
+from src.scraper.scraperapi_client import ScraperAPIClient, CompiledRequest
 from src.parser.tiktok_parser import TikTokParser
 from src.utils.logger import setup_logging, get_logger
+from src.utils.request_throttle import TokenBucket
 from src.utils.config import config
 
+# lxml（C実装）が利用可能ならツリーを構築せずに構造を集計し、なければBeautifulSoupを使用
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# デバッグ対象のページ
+EXPLORE_URL = "https://www.tiktok.com/explore"
+
+# 動画関連要素のclass属性 / データを含むスクリプトの判定用（大文字小文字を区別せず、
+# 小文字化した文字列を作らずに検索）
+VIDEO_CLASS_RE = re.compile('video', re.IGNORECASE)
+DATA_TEXT_RE = re.compile('data', re.IGNORECASE)
+
+# アクセスがブロックされた場合などに返るエラーページの文言
+PAGE_UNAVAILABLE_MARKER = b"Page not available"
+
+# 戦略間のリクエスト間隔（秒）。全戦略で1つのトークンバケットを共有し、並行実行しても
+# リクエストの送信はこの間隔以上あける
+STRATEGY_REQUEST_INTERVAL_S = 15.0
+
+# HTML中の有無を確認するキーワード
+CONTENT_KEYWORDS = ('explore', 'fyp', 'for you', 'trending', 'video', 'tiktok')
+
+# キーワードはASCIIのみのため、HTMLはバイト列のままASCII英大文字だけを小文字化して検索
+ASCII_LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+
+class HTMLStructureCounter:
+    """
+    HTML構造を集計するlxmlパーサーターゲット
+    
+    パーサーから届く開始・終了タグのイベントだけで集計するため、
+    DOMツリーを構築せず文書全体を1パスで処理できる。
+    """
+    
+    # 属性を見ずに数えるだけのタグ
+    SIMPLE_TAG_KEYS = {
+        'form': "フォーム数",
+        'img': "画像数",
+        'meta': "メタタグ数",
+    }
+    
+    def __init__(self):
+        self.title = None
+        self.counts = {
+            "スクリプトタグ数": 0,
+            "総リンク数": 0,
+            "TikTokリンク数": 0,
+            "動画関連要素数": 0,
+            "JSON-LDスクリプト数": 0,
+            "データ含有JSスクリプト数": 0,
+            "フォーム数": 0,
+            "画像数": 0,
+            "メタタグ数": 0,
+        }
+        self._title_parts = None
+        self._script_parts = None
+    
+    def start(self, tag, attrib):
+        counts = self.counts
+        if tag == 'script':
+            counts["スクリプトタグ数"] += 1
+            if attrib.get('type') == 'application/ld+json':
+                counts["JSON-LDスクリプト数"] += 1
+            self._script_parts = []
+        elif tag == 'a':
+            counts["総リンク数"] += 1
+            if 'tiktok.com' in attrib.get('href', ''):
+                counts["TikTokリンク数"] += 1
+        elif tag in ('video', 'div'):
+            if VIDEO_CLASS_RE.search(attrib.get('class', '')):
+                counts["動画関連要素数"] += 1
+        elif tag in self.SIMPLE_TAG_KEYS:
+            counts[self.SIMPLE_TAG_KEYS[tag]] += 1
+        elif tag == 'title' and self.title is None:
+            self._title_parts = []
+    
+    def data(self, data):
+        if self._script_parts is not None:
+            self._script_parts.append(data)
+        elif self._title_parts is not None:
+            self._title_parts.append(data)
+    
+    def end(self, tag):
+        if tag == 'script' and self._script_parts is not None:
+            script_text = ''.join(self._script_parts)
+            if 'window.' in script_text or DATA_TEXT_RE.search(script_text):
+                self.counts["データ含有JSスクリプト数"] += 1
+            self._script_parts = None
+        elif tag == 'title' and self._title_parts is not None:
+            self.title = ''.join(self._title_parts)
+            self._title_parts = None
+    
+    def close(self):
+        return self
+
+
+def write_bytes(file_path: str, data: bytes):
+    """バイト列をファイルに書き込み（I/O用スレッドで実行）"""
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
+
+def run_strategy(index: int, compiled: CompiledRequest, api_client: ScraperAPIClient,
+                 parser: TikTokParser, debug_dir: str, bucket: TokenBucket,
+                 parse_cache: dict, io_executor: ThreadPoolExecutor) -> dict:
+    """
+    1つの戦略でexploreページを取得・保存・解析
+    
+    compiled は戦略のパラメータを api_client.precompile で事前に組み立てたもの。
+    ワーカースレッドで並行実行されるため、結果の表示は呼び出し側で戦略の順に行う。
+    HTML本体（バイト列・文字列）は返さずサイズと成否のみを返すため、関数を抜けた
+    時点で解放され、戦略数分のページがメモリに残らない。
+    parse_cache はHTMLのダイジェストをキーに (動画データ, 分析結果) を保持し、
+    戦略間で同一のHTML（ブロック時の同じエラーページ等）が返った場合は再解析しない。
+    HTMLファイルの書き込みは io_executor に任せ、解析と並行して行う。書き込みの
+    Future を返すため、呼び出し側は結果を表示する前に result() で完了と成否を確認すること。
+    """
+    # 全戦略で共有するトークンバケットでリクエストの間隔を制御
+    bucket.acquire()
+    
+    # リクエスト実行（本文はチャンク単位で受信）
+    start_time = time.time()
+    result = api_client.scrape_compiled(EXPLORE_URL, compiled, stream=True)
+    
+    # 受信したチャンクを構造集計パーサーに流す
+    # （str への再エンコードや、集計のための再パースを行わない）
+    counter = HTMLStructureCounter() if etree is not None else None
+    structure_parser = etree.HTMLParser(target=counter) if counter is not None else None
+    
+    chunks = []
+    html_hash = hashlib.blake2b(digest_size=16)
+    for chunk in result['chunks']:
+        html_hash.update(chunk)
+        if structure_parser is not None:
+            structure_parser.feed(chunk)
+        chunks.append(chunk)
+    if structure_parser is not None:
+        structure_parser.close()
+    
+    response_time = time.time() - start_time
+    
+    # 受信したバイト列をそのまま保存（書き込みはバックグラウンドで実行）
+    html_bytes = b''.join(chunks)
+    del chunks
+    html_file = f"{debug_dir}/tiktok_explore_strategy_{index}.html"
+    write_future = io_executor.submit(write_bytes, html_file, html_bytes)
+    
+    # 動画データの解析には文字列が必要なため、受信完了後に一度だけデコード
+    html_content = html_bytes.decode(result.get('encoding') or 'utf-8', errors='replace')
+    content_size = len(html_content)
+    
+    # エラーページ・空に近いページは安価な判定で先に除外し、解析自体を行わない
+    # （エラーページの文言はASCIIのため、デコード後の文字列ではなくバイト列を検索）
+    page_success = content_size > 100 and PAGE_UNAVAILABLE_MARKER not in html_bytes
+    if not page_success:
+        videos, analysis = [], {"skipped": "page_unavailable"}
+    else:
+        # HTMLコンテンツの解析（同一内容のHTMLは解析済みの結果を再利用）
+        html_digest = html_hash.digest()
+        cached = parse_cache.get(html_digest)
+        if cached is not None:
+            videos, analysis = cached
+        else:
+            try:
+                videos = parser.parse_explore_page(html_content).videos
+            except Exception:
+                # 書き込みも失敗していれば、先に行った書き込みのエラーを報告
+                write_future.result()
+                raise
+            analysis = analyze_html_content(html_content, counter, html_bytes)
+            parse_cache[html_digest] = (videos, analysis)
+    
+    return {
+        "result": result,
+        "content_size": content_size,
+        "page_success": page_success,
+        "html_file": html_file,
+        "write_future": write_future,
+        "response_time": response_time,
+        "videos": videos,
+        "analysis": analysis,
+    }
+
 
 def enhanced_debug_tiktok_scraping():
     """改良版TikTokスクレイピングデバッグ"""
@@ -41,22 +229,13 @@ def enhanced_debug_tiktok_scraping():
         print("❌ APIキーが設定されていません")
         return
     
-    # 改良版クライアント設定
-    api_client = ScraperAPIClient(
-        api_key=api_key,
-        enable_proxy_rotation=True,
-        enable_request_throttling=True,
-        device_type="tiktok"  # TikTok最適化User-Agent使用
-    )
     parser = TikTokParser()
+    api_clients = []
+    
+    # HTMLファイル等の書き込み用スレッド（スクレイピング・解析とI/Oを重ねる）
+    io_executor = ThreadPoolExecutor(max_workers=2)
     
     try:
-        print("📊 初期統計情報:")
-        initial_stats = api_client.get_stats()
-        print(f"  デバイスタイプ: {initial_stats['device_type']}")
-        print(f"  User-Agent: {initial_stats['current_user_agent'][:80]}...")
-        print()
-        
         # 複数の戦略でテスト
         test_strategies = [
             {
@@ -94,109 +273,142 @@ def enhanced_debug_tiktok_scraping():
             }
         ]
         
+        # 改良版クライアント設定
+        # 戦略ごとに国・プロキシが異なり互いに独立しているため、クライアント（セッションと
+        # リクエスト制御）を戦略ごとに分けて並行実行する。戦略間の送信間隔は共有のトークンバケットで制御する
+        api_clients = [
+            ScraperAPIClient(
+                api_key=api_key,
+                enable_proxy_rotation=True,
+                enable_request_throttling=True,
+                device_type=strategy['params']['device_type']
+            )
+            for strategy in test_strategies
+        ]
+        
+        # 戦略のパラメータは実行中に変わらないため、リクエスト設定を一度だけ組み立てる
+        compiled_requests = [
+            api_client.precompile(**strategy['params'])
+            for strategy, api_client in zip(test_strategies, api_clients)
+        ]
+        
+        print("📊 初期統計情報:")
+        for strategy, api_client in zip(test_strategies, api_clients):
+            initial_stats = api_client.get_stats()
+            print(f"  {strategy['name']}")
+            print(f"    デバイスタイプ: {initial_stats['device_type']}")
+            print(f"    User-Agent: {initial_stats['current_user_agent'][:80]}...")
+        print()
+        
+        debug_dir = "debug"
+        os.makedirs(debug_dir, exist_ok=True)
+        
+        print(f"📡 {len(test_strategies)}戦略を並行実行中: {EXPLORE_URL}")
+        print()
+        
+        # 全戦略で共有するトークンバケット（容量1のため、最初の戦略以外は間隔をあけて送信）
+        bucket = TokenBucket(capacity=1, fill_time_s=STRATEGY_REQUEST_INTERVAL_S)
+        
+        # HTMLのダイジェスト -> (動画データ, 分析結果)
+        parse_cache = {}
+        
+        with ThreadPoolExecutor(max_workers=len(test_strategies)) as executor:
+            futures = [
+                executor.submit(
+                    run_strategy, i, compiled, api_client, parser, debug_dir,
+                    bucket, parse_cache, io_executor
+                )
+                for i, (strategy, api_client, compiled) in enumerate(
+                    zip(test_strategies, api_clients, compiled_requests), 1
+                )
+            ]
+        
         results = []
         
-        for i, strategy in enumerate(test_strategies, 1):
-            print(f"🧪 {strategy['name']}")
-            print("-" * 50)
+        # 結果は戦略の順に表示（1戦略分の出力をまとめてから一度に書き出す）
+        for strategy, future in zip(test_strategies, futures):
+            buf = [
+                f"🧪 {strategy['name']}",
+                "-" * 50,
+                f"   パラメータ: {strategy['params']}",
+            ]
             
             try:
-                # TikTok exploreページをスクレイピング
-                url = "https://www.tiktok.com/explore"
+                outcome = future.result()
+                # HTMLファイルの書き込みエラー（容量不足・権限等）もこの戦略のエラーとして報告
+                outcome['write_future'].result()
+                videos = outcome['videos']
+                analysis = outcome['analysis']
+                result = outcome['result']
+                response_time = outcome['response_time']
                 
-                print(f"📡 アクセス中: {url}")
-                print(f"   パラメータ: {strategy['params']}")
+                buf.append(f"✅ レスポンス受信 (時間: {response_time:.2f}秒)")
+                buf.append(f"   サイズ: {outcome['content_size']} 文字")
+                buf.append(f"   ステータス: {result.get('status_code', 'N/A')}")
+                buf.append(f"💾 HTMLコンテンツを保存: {outcome['html_file']}")
                 
-                # リクエスト実行
-                start_time = time.time()
-                result = api_client.scrape(url=url, **strategy['params'])
-                end_time = time.time()
-                
-                html_content = result['content']
-                response_time = end_time - start_time
-                
-                print(f"✅ レスポンス受信 (時間: {response_time:.2f}秒)")
-                print(f"   サイズ: {len(html_content)} 文字")
-                print(f"   ステータス: {result.get('status_code', 'N/A')}")
-                
-                # HTMLコンテンツを保存
-                debug_dir = "debug"
-                os.makedirs(debug_dir, exist_ok=True)
-                
-                html_file = f"{debug_dir}/tiktok_explore_strategy_{i}.html"
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                print(f"💾 HTMLコンテンツを保存: {html_file}")
-                
-                # HTMLコンテンツの解析
-                print("🔍 HTMLコンテンツの解析中...")
-                videos = parser.parse_videos(html_content)
-                
-                print(f"📊 解析結果: {len(videos)}件の動画データを抽出")
+                buf.append(f"📊 解析結果: {len(videos)}件の動画データを抽出")
                 
                 # 詳細分析
-                analysis = analyze_html_content(html_content)
-                print("🔍 HTML構造分析:")
+                buf.append("🔍 HTML構造分析:")
                 for key, value in analysis.items():
-                    print(f"   {key}: {value}")
+                    buf.append(f"   {key}: {value}")
                 
                 # 結果を記録
                 strategy_result = {
                     "strategy": strategy['name'],
                     "response_time": response_time,
-                    "content_size": len(html_content),
+                    "content_size": outcome['content_size'],
                     "video_count": len(videos),
                     "status_code": result.get('status_code'),
                     "analysis": analysis,
-                    "success": len(html_content) > 100 and "Page not available" not in html_content
+                    "success": outcome['page_success']
                 }
                 results.append(strategy_result)
                 
                 # 成功した場合は詳細情報を表示
                 if strategy_result["success"] and videos:
-                    print("🎯 取得した動画の詳細:")
+                    buf.append("🎯 取得した動画の詳細:")
                     for j, video in enumerate(videos[:3], 1):  # 最初の3件のみ表示
-                        print(f"   動画{j}:")
-                        print(f"     ID: {video.video_id}")
-                        print(f"     URL: {video.url}")
-                        print(f"     再生数: {video.view_count}")
-                        print(f"     投稿日時: {video.created_at}")
+                        buf.append(f"   動画{j}:")
+                        buf.append(f"     ID: {video.video_id}")
+                        buf.append(f"     URL: {video.url}")
+                        buf.append(f"     再生数: {video.view_count}")
+                        buf.append(f"     投稿日時: {video.upload_date}")
                 
-                print()
+                buf.append("")
                 
             except Exception as e:
-                print(f"❌ エラーが発生: {e}")
+                buf.append(f"❌ エラーが発生: {e}")
                 strategy_result = {
                     "strategy": strategy['name'],
                     "success": False,
                     "error": str(e)
                 }
                 results.append(strategy_result)
-                print()
+                buf.append("")
             
-            # 戦略間の待機時間（人間らしいアクセス）
-            if i < len(test_strategies):
-                wait_time = random.uniform(10, 30)
-                print(f"⏳ 次の戦略まで {wait_time:.1f}秒待機...")
-                time.sleep(wait_time)
+            sys.stdout.write('\n'.join(buf) + '\n')
         
         # 最終統計情報
         print("📈 最終統計情報:")
-        final_stats = api_client.get_stats()
-        
-        if "proxy_stats" in final_stats:
-            proxy_stats = final_stats["proxy_stats"]
-            print(f"  プロキシ統計:")
-            print(f"    総プロキシ数: {proxy_stats.get('total_proxies', 0)}")
-            print(f"    総リクエスト数: {proxy_stats.get('total_requests', 0)}")
-            print(f"    成功率: {proxy_stats.get('overall_success_rate', 0):.2%}")
-        
-        if "throttle_stats" in final_stats:
-            throttle_stats = final_stats["throttle_stats"]
-            print(f"  リクエスト制御統計:")
-            print(f"    総リクエスト数: {throttle_stats.get('total_requests', 0)}")
-            print(f"    平均待機時間: {throttle_stats.get('average_wait_time', 0):.2f}秒")
-            print(f"    時間制限内リクエスト: {throttle_stats.get('hourly_requests', 0)}/{throttle_stats.get('hourly_limit', 0)}")
+        for strategy, api_client in zip(test_strategies, api_clients):
+            final_stats = api_client.get_stats()
+            print(f"  {strategy['name']}")
+            
+            if "proxy_stats" in final_stats:
+                proxy_stats = final_stats["proxy_stats"]
+                print(f"    プロキシ統計:")
+                print(f"      総プロキシ数: {proxy_stats.get('total_proxies', 0)}")
+                print(f"      総リクエスト数: {proxy_stats.get('total_requests', 0)}")
+                print(f"      成功率: {proxy_stats.get('overall_success_rate', 0):.2%}")
+            
+            if "throttle_stats" in final_stats:
+                throttle_stats = final_stats["throttle_stats"]
+                print(f"    リクエスト制御統計:")
+                print(f"      総リクエスト数: {throttle_stats.get('total_requests', 0)}")
+                print(f"      平均待機時間: {throttle_stats.get('average_wait_time', 0):.2f}秒")
+                print(f"      時間制限内リクエスト: {throttle_stats.get('hourly_requests', 0)}/{throttle_stats.get('hourly_limit', 0)}")
         
         # 結果サマリー
         print("\n🎯 戦略別結果サマリー:")
@@ -206,14 +418,22 @@ def enhanced_debug_tiktok_scraping():
         if successful_strategies:
             print(f"✅ 成功した戦略: {len(successful_strategies)}/{len(results)}")
             
-            best_strategy = max(successful_strategies, key=lambda x: x.get("video_count", 0))
+            # 取得動画数が最大の戦略（同数の場合は先の戦略）を1パスで選択
+            best_strategy = None
+            best_video_count = -1
+            for strategy_result in successful_strategies:
+                video_count = strategy_result.get("video_count", 0)
+                if video_count > best_video_count:
+                    best_strategy = strategy_result
+                    best_video_count = video_count
+            
             print(f"🏆 最も効果的な戦略: {best_strategy['strategy']}")
-            print(f"   取得動画数: {best_strategy.get('video_count', 0)}件")
+            print(f"   取得動画数: {best_video_count}件")
             print(f"   レスポンス時間: {best_strategy.get('response_time', 0):.2f}秒")
             
             # 推奨設定
             print("\n💡 推奨設定:")
-            if best_strategy.get("video_count", 0) > 0:
+            if best_video_count > 0:
                 print("  ✅ この設定で実際の収集を実行することを推奨")
                 print(f"  📋 設定: {best_strategy['strategy']}")
             else:
@@ -229,20 +449,23 @@ def enhanced_debug_tiktok_scraping():
         
         # デバッグファイルの保存
         debug_summary_file = f"{debug_dir}/debug_summary.txt"
-        with open(debug_summary_file, 'w', encoding='utf-8') as f:
-            f.write("Enhanced TikTok Scraper Debug Summary\n")
-            f.write("=" * 50 + "\n\n")
-            
-            for result in results:
-                f.write(f"Strategy: {result['strategy']}\n")
-                f.write(f"Success: {result.get('success', False)}\n")
-                if result.get('success'):
-                    f.write(f"Video Count: {result.get('video_count', 0)}\n")
-                    f.write(f"Response Time: {result.get('response_time', 0):.2f}s\n")
-                    f.write(f"Content Size: {result.get('content_size', 0)} chars\n")
-                else:
-                    f.write(f"Error: {result.get('error', 'Unknown')}\n")
-                f.write("\n")
+        summary_lines = [
+            "Enhanced TikTok Scraper Debug Summary\n",
+            "=" * 50 + "\n\n",
+        ]
+        for result in results:
+            summary_lines.append(f"Strategy: {result['strategy']}\n")
+            summary_lines.append(f"Success: {result.get('success', False)}\n")
+            if result.get('success'):
+                summary_lines.append(f"Video Count: {result.get('video_count', 0)}\n")
+                summary_lines.append(f"Response Time: {result.get('response_time', 0):.2f}s\n")
+                summary_lines.append(f"Content Size: {result.get('content_size', 0)} chars\n")
+            else:
+                summary_lines.append(f"Error: {result.get('error', 'Unknown')}\n")
+            summary_lines.append("\n")
+        
+        # 組み立てた内容を一度に書き込み
+        write_bytes(debug_summary_file, ''.join(summary_lines).encode('utf-8'))
         
         print(f"📝 デバッグサマリーを保存: {debug_summary_file}")
         print(f"📁 デバッグファイル: {debug_dir}/")
@@ -252,34 +475,43 @@ def enhanced_debug_tiktok_scraping():
         logger.error(f"Debug scraping failed: {e}", exc_info=True)
     
     finally:
-        api_client.close()
+        # 書き込み待ちのファイルをすべて書き終えてから終了
+        io_executor.shutdown(wait=True)
+        for api_client in api_clients:
+            api_client.close()
 
 
-def analyze_html_content(html_content: str) -> dict:
-    """HTMLコンテンツの詳細分析"""
-    from bs4 import BeautifulSoup
+def analyze_html_content(html_content: str, counter: "HTMLStructureCounter" = None,
+                         html_bytes: bytes = None) -> dict:
+    """
+    HTMLコンテンツの詳細分析
     
+    Args:
+        html_content: HTML文字列
+        counter: 受信中に集計済みの構造カウンター（指定時はHTMLを再パースしない）
+        html_bytes: 受信したままのHTMLのバイト列（指定時はキーワード検索に使用）
+    """
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        analysis = {
-            "ページタイトル": soup.title.string if soup.title else "なし",
-            "スクリプトタグ数": len(soup.find_all('script')),
-            "総リンク数": len(soup.find_all('a')),
-            "TikTokリンク数": len([a for a in soup.find_all('a', href=True) if 'tiktok.com' in a['href']]),
-            "動画関連要素数": len(soup.find_all(['video', 'div'], class_=lambda x: x and 'video' in str(x).lower())),
-            "JSON-LDスクリプト数": len(soup.find_all('script', type='application/ld+json')),
-            "データ含有JSスクリプト数": len([s for s in soup.find_all('script') if s.string and ('window.' in s.string or 'data' in s.string.lower())]),
-            "フォーム数": len(soup.find_all('form')),
-            "画像数": len(soup.find_all('img')),
-            "メタタグ数": len(soup.find_all('meta')),
-        }
+        if counter is not None:
+            analysis = {"ページタイトル": counter.title or "なし"}
+            analysis.update(counter.counts)
+        elif etree is not None:
+            # ツリーを構築せず、パーサーのイベントから1パスで集計
+            counter = HTMLStructureCounter()
+            html_parser = etree.HTMLParser(target=counter)
+            html_parser.feed(html_content)
+            html_parser.close()
+            
+            analysis = {"ページタイトル": counter.title or "なし"}
+            analysis.update(counter.counts)
+        else:
+            analysis = analyze_html_structure_bs4(html_content)
         
         # 特定のキーワードをチェック
-        content_lower = html_content.lower()
-        keywords = ['explore', 'fyp', 'for you', 'trending', 'video', 'tiktok']
-        for keyword in keywords:
-            analysis[f"'{keyword}'含有"] = keyword in content_lower
+        if html_bytes is None:
+            html_bytes = html_content.encode('utf-8')
+        for keyword, found in find_keywords(html_bytes).items():
+            analysis[f"'{keyword}'含有"] = found
         
         return analysis
         
@@ -287,6 +519,40 @@ def analyze_html_content(html_content: str) -> dict:
         return {"エラー": str(e)}
 
 
+def find_keywords(html_bytes: bytes) -> dict:
+    """
+    HTML中に各キーワードが含まれるかを判定（大文字小文字を区別しない）
+    
+    str.lower() でHTML全体のUnicode文字列を複製する代わりに、バイト列を
+    bytes.translate でASCII小文字化してから検索する。
+    
+    Args:
+        html_bytes: HTMLのバイト列
+    """
+    content_lower = html_bytes.translate(ASCII_LOWER_TABLE)
+    return {keyword: keyword.encode('ascii') in content_lower for keyword in CONTENT_KEYWORDS}
+
+
+def analyze_html_structure_bs4(html_content: str) -> dict:
+    """HTML構造の集計（lxmlが利用できない場合のBeautifulSoup版）"""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html_content, 'html.parser')
+    
+    return {
+        "ページタイトル": soup.title.string if soup.title else "なし",
+        "スクリプトタグ数": len(soup.find_all('script')),
+        "総リンク数": len(soup.find_all('a')),
+        "TikTokリンク数": len([a for a in soup.find_all('a', href=True) if 'tiktok.com' in a['href']]),
+        "動画関連要素数": len(soup.find_all(['video', 'div'], class_=VIDEO_CLASS_RE)),
+        "JSON-LDスクリプト数": len(soup.find_all('script', type='application/ld+json')),
+        "データ含有JSスクリプト数": len([s for s in soup.find_all('script') if s.string and ('window.' in s.string or DATA_TEXT_RE.search(s.string))]),
+        "フォーム数": len(soup.find_all('form')),
+        "画像数": len(soup.find_all('img')),
+        "メタタグ数": len(soup.find_all('meta')),
+    }
+
+
 if __name__ == "__main__":
     enhanced_debug_tiktok_scraping()
 
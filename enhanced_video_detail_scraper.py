@@ -5,130 +5,403 @@ Enhanced Video Detail Scraper for TikTok Research System
 """
 
 import re
-import json
 import time
+import functools
 import random
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import Dict, Any, Optional, List
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.utils import json_io
 from src.utils.logger import get_logger
 from src.utils.user_agents import UserAgentManager
 from src.utils.proxy_manager import ProxyManager
 from src.utils.request_throttle import RequestThrottle
 from src.scraper.scraperapi_client import ScraperAPIClient
+from src.storage.detail_cache import VideoDetailCache
 from src.parser.video_data import VideoData
 
+# lxml（C実装）が利用可能なら優先し、なければ標準のhtml.parserを使用
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
 
-class EnhancedVideoDetailScraper:
-    """改良版個別動画詳細情報取得クラス"""
+# selectolax（C実装のHTML5パーサー）が利用可能ならCSSセレクターによる抽出に使用
+# （1.0以降はLexborバックエンドのみ、それ以前のバージョンはModestバックエンドを使用）
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxHTMLParser
+    except ImportError:
+        SelectolaxHTMLParser = None
+
+# 動画URLから動画IDを抽出
+VIDEO_ID_URL_RE = re.compile(r'/video/(\d+)')
+
+# SIGI_STATE / __UNIVERSAL_DATA_FOR_REHYDRATION__ の各パターンが必ず含む文字列
+# （HTMLに含まれない場合は正規表現による探索を省略）
+SIGI_STATE_MARKER = 'SIGI_STATE'
+UNIVERSAL_DATA_MARKER = '__UNIVERSAL_DATA_FOR_REHYDRATION__'
+
+# SIGI_STATE（TikTokの内部状態）の代入位置のパターン（順に試行）
+# 一致の終端がJSONオブジェクトの開始位置で、オブジェクトの終端は括弧の対応から決める
+SIGI_STATE_PATTERNS = [
+    re.compile(p) for p in (
+        r'window\[\'SIGI_STATE\'\]\s*=\s*(?=\{)',
+        r'window\.SIGI_STATE\s*=\s*(?=\{)',
+        r'SIGI_STATE\s*=\s*(?=\{)',
+        r'"SIGI_STATE":\s*(?=\{)',
+    )
+]
+
+# JSON-LD構造化データのscriptタグ（内容をグループ1で取得）
+# find_all('script', type='application/ld+json') と同様に、タグ名・属性名は大文字小文字を
+# 区別せず、type属性の値は完全一致（引用符なしも可、data-type 等の別属性には一致しない）
+JSON_LD_SCRIPT_RE = re.compile(
+    r'(?i:<script)(?=[\s>])[^>]*?(?i:\stype)\s*=\s*["\']?application/ld\+json["\']?(?=[\s>])[^>]*>'
+    r'(.*?)(?i:</script)',
+    re.DOTALL
+)
+
+# __UNIVERSAL_DATA_FOR_REHYDRATION__の代入位置のパターン（順に試行、SIGI_STATEと同様）
+UNIVERSAL_DATA_PATTERNS = [
+    re.compile(p) for p in (
+        r'window\[\'__UNIVERSAL_DATA_FOR_REHYDRATION__\'\]\s*=\s*(?=\{)',
+        r'__UNIVERSAL_DATA_FOR_REHYDRATION__\s*=\s*(?=\{)',
+    )
+]
+
+# Open Graphメタタグ（property属性）と対応する項目
+OG_META_TAGS = {
+    'og:title': 'title',
+    'og:description': 'description',
+    'og:image': 'thumbnail_url',
+    'og:video': 'video_url',
+    'og:video:duration': 'duration',
+    'og:video:width': 'width',
+    'og:video:height': 'height'
+}
+
+# Twitterカードメタタグ（name属性）と対応する項目
+TWITTER_META_TAGS = {
+    'twitter:title': 'title',
+    'twitter:description': 'description',
+    'twitter:image': 'thumbnail_url',
+    'twitter:player:width': 'width',
+    'twitter:player:height': 'height'
+}
+
+# TikTok特有のメタタグ（name属性）と対応する項目
+TIKTOK_META_TAGS = {
+    'tiktok:video:id': 'video_id',
+    'tiktok:author': 'author_username',
+    'tiktok:upload_date': 'create_time'
+}
+
+# 抽出対象のname属性値
+META_NAME_KEYS = frozenset(TWITTER_META_TAGS) | frozenset(TIKTOK_META_TAGS)
+
+# メタタグの値を整数に変換する項目
+INT_META_DETAIL_KEYS = frozenset({'duration', 'width', 'height'})
+
+# すべて取得できた時点で以降の抽出方法を省略する必須項目
+REQUIRED_DETAIL_KEYS = (
+    'view_count', 'like_count', 'comment_count', 'create_time', 'author_username', 'description'
+)
+
+# HTMLテキストからの抽出を省略できる項目（すべて取得済みの場合）
+TEXT_CONTENT_KEYS = ('view_count', 'like_count', 'comment_count', 'create_time')
+
+# HTMLテキストの再生数パターン
+TEXT_VIEW_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+(?:\.\d+)?[KMB]?)\s*(?:views?|再生|回再生|次再生)',
+        r'(\d+(?:,\d+)*)\s*(?:views?|再生)',
+        r'再生回数[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+        r'view[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+    )
+]
+
+# HTMLテキストのいいね数パターン
+TEXT_LIKE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+(?:\.\d+)?[KMB]?)\s*(?:likes?|いいね|♥)',
+        r'♥\s*(\d+(?:\.\d+)?[KMB]?)',
+        r'いいね[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+        r'like[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+    )
+]
+
+# HTMLテキストのコメント数パターン
+TEXT_COMMENT_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+(?:\.\d+)?[KMB]?)\s*(?:comments?|コメント)',
+        r'コメント[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+        r'comment[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+    )
+]
+
+# HTMLテキストのシェア数パターン
+TEXT_SHARE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(\d+(?:\.\d+)?[KMB]?)\s*(?:shares?|シェア)',
+        r'シェア[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+        r'share[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
+    )
+]
+
+# HTMLテキストの投稿日時パターン
+TEXT_DATE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'(\d{4}-\d{2}-\d{2})',  # YYYY-MM-DD
+        r'(\d{1,2}/\d{1,2}/\d{4})',  # MM/DD/YYYY
+        r'(\d{1,2}-\d{1,2}-\d{4})',  # MM-DD-YYYY
+        r'(\d+)\s*(?:hours?|時間)\s*ago',  # X hours ago
+        r'(\d+)\s*(?:days?|日)\s*ago',  # X days ago
+        r'(\d+)\s*(?:weeks?|週間)\s*ago',  # X weeks ago
+    )
+]
+
+# HTML中のJSONから再生数を抽出する高度なパターン
+JSON_VIEW_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'"playCount":\s*(\d+)',
+        r'"viewCount":\s*(\d+)',
+        r'"play_count":\s*(\d+)',
+        r'"view_count":\s*(\d+)',
+        r'playCount["\']:\s*["\']?(\d+)',
+        r'viewCount["\']:\s*["\']?(\d+)',
+    )
+]
+
+# HTML中のJSONからいいね数を抽出する高度なパターン
+JSON_LIKE_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'"diggCount":\s*(\d+)',
+        r'"likeCount":\s*(\d+)',
+        r'"like_count":\s*(\d+)',
+        r'diggCount["\']:\s*["\']?(\d+)',
+        r'likeCount["\']:\s*["\']?(\d+)',
+    )
+]
+
+# HTML中のJSONから投稿日時を抽出する高度なパターン
+JSON_TIME_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'"createTime":\s*(\d+)',
+        r'"create_time":\s*(\d+)',
+        r'"uploadDate":\s*["\']([^"\']+)["\']',
+        r'"published_at":\s*["\']([^"\']+)["\']',
+        r'createTime["\']:\s*["\']?(\d+)',
+    )
+]
+
+# HTML中のJSONから作者情報を抽出する高度なパターン
+JSON_AUTHOR_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'"uniqueId":\s*["\']([^"\']+)["\']',
+        r'"author":\s*["\']([^"\']+)["\']',
+        r'"username":\s*["\']([^"\']+)["\']',
+        r'uniqueId["\']:\s*["\']([^"\']+)["\']',
+    )
+]
+
+# 先頭が「"」でないJSONパターンと、その一致に必須のキー名。
+# 先頭がリテラルのパターンは高速に走査されるが、これらはIGNORECASEのため全文を
+# 1文字ずつ照合するので、キー名がHTMLに含まれない場合は実行しない
+JSON_PATTERN_KEYWORDS = {
+    pattern: re.match(r'\w+', pattern.pattern).group()
+    for pattern in JSON_VIEW_PATTERNS + JSON_LIKE_PATTERNS + JSON_TIME_PATTERNS + JSON_AUTHOR_PATTERNS
+    if not pattern.pattern.startswith('"')
+}
+
+# HTMLのASCII英大文字のみを小文字化する変換表
+ASCII_LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+# IGNORECASEではASCII英字に一致するが、ASCII小文字化では対応しない文字
+# （İ, ı -> i / ſ -> s / K -> k）。HTMLに含まれる場合はキー名による絞り込みを行わない
+CASE_FOLD_EXCEPTIONS = ('\u0130', '\u0131', '\u017f', '\u212a')
+
+# SIGI_STATEのモジュールと解析メソッド名（この順に解析し、後のモジュールほど取得済みの値を上書き）
+SIGI_MODULE_PARSERS = (
+    ('ItemModule', '_parse_sigi_item_module'),
+    ('UserModule', '_parse_sigi_user_module'),
+    ('VideoDetail', '_parse_video_detail_data'),
+)
+
+# ItemModuleの (セクションのキー, (セクション内のキー, 対応する項目) の組) の一覧
+# （セクションのキーがNoneの場合は動画データ直下。値がnullでもキーがあれば設定）
+ITEM_MODULE_KEY_MAP = (
+    (None, (
+        ('desc', 'description'),
+        ('createTime', 'create_time'),
+    )),
+    ('stats', (
+        ('playCount', 'view_count'),
+        ('diggCount', 'like_count'),
+        ('commentCount', 'comment_count'),
+        ('shareCount', 'share_count'),
+    )),
+    ('author', (
+        ('uniqueId', 'author_username'),
+        ('nickname', 'author_display_name'),
+        ('verified', 'author_verified'),
+    )),
+    ('video', (
+        ('duration', 'duration'),
+        ('width', 'width'),
+        ('height', 'height'),
+    )),
+)
+
+# UserModuleのキーと対応する項目（値がnullでもキーがあれば設定）
+USER_MODULE_KEY_MAP = (
+    ('uniqueId', 'author_username'),
+    ('nickname', 'author_display_name'),
+    ('verified', 'author_verified'),
+    ('followerCount', 'author_follower_count'),
+    ('followingCount', 'author_following_count'),
+    ('videoCount', 'author_video_count'),
+)
+
+# JSON-LDのVideoObjectのキーと対応する項目（値がnullでもキーがあれば設定）
+VIDEO_OBJECT_KEY_MAP = (
+    ('name', 'title'),
+    ('description', 'description'),
+    ('uploadDate', 'create_time_iso'),
+    ('thumbnailUrl', 'thumbnail_url'),
+    ('contentUrl', 'video_url'),
+    ('duration', 'duration'),
+    ('width', 'width'),
+    ('height', 'height'),
+)
+
+# JSON-LDのinteractionStatisticの種類と対応する項目
+INTERACTION_TYPE_KEYS = {
+    'LikeAction': 'like_count',
+    'CommentAction': 'comment_count',
+    'ShareAction': 'share_count',
+    'WatchAction': 'view_count',
+}
+
+# 辞書にキーが存在しないことを表す番兵（値がNoneの場合と区別する）
+_MISSING = object()
+
+# カウント文字列の単位と倍率（1.2K, 3.4M など）
+COUNT_SUFFIX_MULTIPLIERS = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+# カウント文字列から桁区切りと空白を1回の変換で除去する変換表
+COUNT_STRIP_TABLE = str.maketrans('', '', ', ')
+
+
+def _select_nodes(tree, selector: str):
+    """CSSセレクターに一致する要素を取得（selectolaxのツリーとBeautifulSoupの両方に対応）"""
+    if isinstance(tree, Tag):
+        return tree.select(selector)
+    return tree.css(selector)
+
+
+def _node_attr(node, name: str) -> Optional[str]:
+    """要素の属性値を取得"""
+    if isinstance(node, Tag):
+        return node.get(name)
+    return node.attributes.get(name)
+
+
+def _node_text(node) -> str:
+    """要素内のテキストを前後の空白を除いて連結"""
+    if isinstance(node, Tag):
+        return node.get_text(strip=True)
+    return node.text(strip=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _now_iso(epoch_second: int) -> str:
+    """取得日時の文字列（同じ秒の間は変換結果を再利用）"""
+    return datetime.fromtimestamp(epoch_second).isoformat()
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_count_string(count_str: str) -> Optional[int]:
+    """
+    カウント文字列を数値に変換
     
-    def __init__(self, api_key: str):
-        self.logger = get_logger(self.__class__.__name__)
-        self.api_client = ScraperAPIClient(api_key)
-        self.proxy_manager = ProxyManager()
-        self.throttle = RequestThrottle()
-        
-        # 統計情報
-        self.stats = {
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'videos_with_details': 0,
-            'videos_without_details': 0,
-            'view_count_extracted': 0,
-            'create_time_extracted': 0,
-            'author_extracted': 0
-        }
+    同じ表記（"1.2K" など）が繰り返し現れるため結果をメモ化する。
     
-    def get_video_details(self, video_url: str, max_retries: int = 3) -> Optional[Dict[str, Any]]:
-        """
-        個別動画ページから詳細情報を取得（改良版）
+    Args:
+        count_str: カウント文字列
         
-        Args:
-            video_url: 動画URL
-            max_retries: 最大リトライ回数
-            
-        Returns:
-            動画詳細情報の辞書、失敗時はNone
-        """
-        self.logger.info(f"動画詳細情報を取得: {video_url}")
+    Returns:
+        数値（変換できない場合はNone）
+    """
+    try:
+        count_str = count_str.translate(COUNT_STRIP_TABLE).strip().upper()
         
-        for attempt in range(max_retries):
-            try:
-                # リクエスト制御
-                self.throttle.wait_if_needed()
-                
-                # User-Agentとプロキシを選択
-                user_agent = UserAgentManager.get_random_tiktok_agent()
-                proxy = self.proxy_manager.get_next_proxy()
-                
-                # ScraperAPIでページを取得
-                custom_params = {
-                    'premium': True,
-                    'session_number': random.randint(1, 1000),
-                    'keep_headers': True,
-                    'render_js': True  # JavaScript実行を有効化
-                }
-                
-                if proxy and hasattr(proxy, 'country') and proxy.country:
-                    custom_params['country_code'] = proxy.country
-                
-                self.stats['total_requests'] += 1
-                
-                response = self.api_client.scrape(
-                    url=video_url,
-                    **custom_params
-                )
-                
-                if response and response.get('status_code') == 200:
-                    html_content = response.get('content', '')
-                    
-                    if html_content and len(html_content) > 1000:  # 最小サイズチェック
-                        details = self._extract_video_details_enhanced(html_content, video_url)
-                        
-                        if details:
-                            self.stats['successful_requests'] += 1
-                            self.stats['videos_with_details'] += 1
-                            
-                            # 抽出成功統計
-                            if details.get('view_count'):
-                                self.stats['view_count_extracted'] += 1
-                            if details.get('create_time'):
-                                self.stats['create_time_extracted'] += 1
-                            if details.get('author_username'):
-                                self.stats['author_extracted'] += 1
-                            
-                            self.logger.info(f"詳細情報取得成功: {video_url}")
-                            return details
-                        else:
-                            self.stats['videos_without_details'] += 1
-                            self.logger.warning(f"詳細情報の抽出に失敗: {video_url}")
-                    else:
-                        self.logger.warning(f"コンテンツが不十分: {video_url} (サイズ: {len(html_content)})")
-                else:
-                    self.logger.warning(f"HTTP エラー: {response.get('status_code')} - {video_url}")
-                
-                # リトライ前の待機
-                if attempt < max_retries - 1:
-                    wait_time = random.uniform(5, 15)
-                    self.logger.info(f"リトライ前待機: {wait_time:.1f}秒")
-                    time.sleep(wait_time)
-                
-            except Exception as e:
-                self.logger.error(f"動画詳細取得エラー (試行 {attempt + 1}): {e}")
-                
-                if attempt < max_retries - 1:
-                    wait_time = random.uniform(10, 20)
-                    time.sleep(wait_time)
+        # 数値のみの場合
+        if count_str.isdigit():
+            return int(count_str)
         
-        self.stats['failed_requests'] += 1
-        self.logger.error(f"動画詳細取得失敗: {video_url}")
+        multiplier = COUNT_SUFFIX_MULTIPLIERS.get(count_str[-1:])
+        if multiplier:
+            return int(float(count_str[:-1]) * multiplier)
+        return int(float(count_str))
+    
+    except (ValueError, TypeError):
         return None
+
+
+class JSONPatternSearcher:
+    """
+    1ページ分のHTMLに対するJSONパターン検索
+    
+    JSON_PATTERN_KEYWORDS のパターンは、必須のキー名がHTMLに含まれる場合のみ実行する。
+    キー名は通常パターンの表記どおりに含まれるため、まずそのまま検索し、
+    見つからない場合のみ小文字化したHTML（初回のみ作成）で確認する。
+    """
+    
+    def __init__(self, html_content: str):
+        self.html_content = html_content
+        self._content_lower = None
+    
+    def search(self, pattern: "re.Pattern") -> Optional["re.Match"]:
+        """pattern.search(html_content) と同じ結果を返す"""
+        keyword = JSON_PATTERN_KEYWORDS.get(pattern)
+        if keyword is not None and not self._contains_keyword(keyword):
+            return None
+        return pattern.search(self.html_content)
+    
+    def _contains_keyword(self, keyword: str) -> bool:
+        """キー名がHTMLに含まれるか（大文字小文字を区別しない）"""
+        if keyword in self.html_content:
+            return True
+        
+        if any(char in self.html_content for char in CASE_FOLD_EXCEPTIONS):
+            return True
+        
+        if self._content_lower is None:
+            self._content_lower = self.html_content.encode('utf-8').translate(ASCII_LOWER_TABLE)
+        return keyword.lower().encode('ascii') in self._content_lower
+
+
+class VideoDetailExtractor:
+    """
+    動画ページのHTMLから詳細情報を抽出するクラス
+    
+    ネットワークアクセスや状態を持たないため、プロセスプールのワーカーでも使用できる。
+    """
+    
+    def __init__(self):
+        self.logger = get_logger(self.__class__.__name__)
     
     def _extract_video_details_enhanced(self, html_content: str, video_url: str) -> Optional[Dict[str, Any]]:
         """
@@ -142,137 +415,146 @@ class EnhancedVideoDetailScraper:
             動画詳細情報の辞書
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
             details = {}
             
             # 動画IDを抽出
-            video_id_match = re.search(r'/video/(\d+)', video_url)
+            video_id_match = VIDEO_ID_URL_RE.search(video_url)
             if video_id_match:
                 details['video_id'] = video_id_match.group(1)
             
+            # 後の方法ほど取得済みの値を上書きするが、必須項目がすべて揃った時点で
+            # 以降の方法（HTMLの解析・全文走査を伴う）は実行しない
+            
             # 方法1: SIGI_STATE（最優先）
             sigi_data = self._extract_from_sigi_state_enhanced(html_content)
             if sigi_data:
                 details.update(sigi_data)
-                self.logger.debug(f"SIGI_STATE抽出成功: {len(sigi_data)}項目")
+                self.logger.debug("SIGI_STATE抽出成功: %d項目", len(sigi_data))
+            if self._has_required_details(details):
+                return self._finalize_details(details, video_url)
             
             # 方法2: __UNIVERSAL_DATA_FOR_REHYDRATION__
             universal_data = self._extract_from_universal_data(html_content)
             if universal_data:
                 details.update(universal_data)
-                self.logger.debug(f"Universal Data抽出成功: {len(universal_data)}項目")
+                self.logger.debug("Universal Data抽出成功: %d項目", len(universal_data))
+            if self._has_required_details(details):
+                return self._finalize_details(details, video_url)
             
             # 方法3: JSON-LD構造化データ
-            json_ld_data = self._extract_from_json_ld_enhanced(soup)
+            json_ld_data = self._extract_from_json_ld_enhanced(html_content)
             if json_ld_data:
                 details.update(json_ld_data)
-                self.logger.debug(f"JSON-LD抽出成功: {len(json_ld_data)}項目")
+                self.logger.debug("JSON-LD抽出成功: %d項目", len(json_ld_data))
+            if self._has_required_details(details):
+                return self._finalize_details(details, video_url)
+            
+            # 以降の方法はHTMLの解析結果を使用
+            soup = BeautifulSoup(html_content, HTML_PARSER)
             
             # 方法4: メタタグ（改良版）
             meta_data = self._extract_from_meta_tags_enhanced(soup)
             if meta_data:
                 details.update(meta_data)
-                self.logger.debug(f"メタタグ抽出成功: {len(meta_data)}項目")
+                self.logger.debug("メタタグ抽出成功: %d項目", len(meta_data))
+            if self._has_required_details(details):
+                return self._finalize_details(details, video_url)
             
             # 方法5: HTMLテキストから統計情報を抽出（改良版）
-            text_data = self._extract_from_text_content_enhanced(soup)
-            if text_data:
-                details.update(text_data)
-                self.logger.debug(f"テキスト抽出成功: {len(text_data)}項目")
+            # 構造化データから統計情報と投稿日時が揃っている場合は、文書全体のテキスト化を省略
+            if not all(details.get(key) for key in TEXT_CONTENT_KEYS):
+                text_data = self._extract_from_text_content_enhanced(soup)
+                if text_data:
+                    details.update(text_data)
+                    self.logger.debug("テキスト抽出成功: %d項目", len(text_data))
+                if self._has_required_details(details):
+                    return self._finalize_details(details, video_url)
+            
+            # 方法6以降のセレクター抽出はselectolaxのツリーがあれば使用（なければsoupを使用）
+            tree = SelectolaxHTMLParser(html_content) if SelectolaxHTMLParser else soup
             
             # 方法6: data-e2e属性（改良版）
-            e2e_data = self._extract_from_e2e_attributes_enhanced(soup)
+            e2e_data = self._extract_from_e2e_attributes_enhanced(tree)
             if e2e_data:
                 details.update(e2e_data)
-                self.logger.debug(f"data-e2e抽出成功: {len(e2e_data)}項目")
+                self.logger.debug("data-e2e抽出成功: %d項目", len(e2e_data))
+            if self._has_required_details(details):
+                return self._finalize_details(details, video_url)
             
             # 方法7: CSS セレクターによる直接抽出
-            css_data = self._extract_from_css_selectors(soup)
+            css_data = self._extract_from_css_selectors(tree)
             if css_data:
                 details.update(css_data)
-                self.logger.debug(f"CSS セレクター抽出成功: {len(css_data)}項目")
+                self.logger.debug("CSS セレクター抽出成功: %d項目", len(css_data))
+            if self._has_required_details(details):
+                return self._finalize_details(details, video_url)
             
             # 方法8: 正規表現による高度な抽出
             regex_data = self._extract_from_regex_patterns(html_content)
             if regex_data:
                 details.update(regex_data)
-                self.logger.debug(f"正規表現抽出成功: {len(regex_data)}項目")
-            
-            # 基本情報の補完
-            details['url'] = video_url
-            details['scraped_at'] = datetime.now().isoformat()
-            
-            # 詳細情報が取得できたかチェック
-            has_details = any([
-                details.get('view_count'),
-                details.get('like_count'),
-                details.get('create_time'),
-                details.get('author_username')
-            ])
-            
-            if has_details:
-                self.logger.debug(f"抽出された詳細情報: {details}")
-                return details
-            else:
-                self.logger.warning("有効な詳細情報が見つかりませんでした")
-                return None
+                self.logger.debug("正規表現抽出成功: %d項目", len(regex_data))
+            
+            return self._finalize_details(details, video_url)
                 
         except Exception as e:
             self.logger.error(f"詳細情報抽出エラー: {e}")
             return None
     
+    def _has_required_details(self, details: Dict[str, Any]) -> bool:
+        """必須項目がすべて取得済みかどうか"""
+        return all(details.get(key) for key in REQUIRED_DETAIL_KEYS)
+    
+    def _finalize_details(self, details: Dict[str, Any], video_url: str) -> Optional[Dict[str, Any]]:
+        """
+        基本情報を補完し、有効な詳細情報が含まれるかを確認
+        
+        Returns:
+            動画詳細情報の辞書、有効な詳細情報がない場合はNone
+        """
+        # 基本情報の補完
+        details['url'] = video_url
+        details['scraped_at'] = _now_iso(int(time.time()))
+        
+        # 詳細情報が取得できたかチェック
+        has_details = any([
+            details.get('view_count'),
+            details.get('like_count'),
+            details.get('create_time'),
+            details.get('author_username')
+        ])
+        
+        if has_details:
+            self.logger.debug("抽出された詳細情報: %s", details)
+            return details
+        else:
+            self.logger.warning("有効な詳細情報が見つかりませんでした")
+            return None
+    
     def _extract_from_sigi_state_enhanced(self, html_content: str) -> Dict[str, Any]:
         """SIGI_STATE（TikTokの内部状態）から情報を抽出（改良版）"""
         details = {}
+        if SIGI_STATE_MARKER not in html_content:
+            return details
         
         try:
-            # 複数のSIGI_STATEパターンを試行
-            sigi_patterns = [
-                r'window\[\'SIGI_STATE\'\]\s*=\s*({.+?});',
-                r'window\.SIGI_STATE\s*=\s*({.+?});',
-                r'SIGI_STATE\s*=\s*({.+?});',
-                r'"SIGI_STATE":\s*({.+?})',
-            ]
-            
-            for pattern in sigi_patterns:
-                sigi_match = re.search(pattern, html_content, re.DOTALL)
+            for pattern in SIGI_STATE_PATTERNS:
+                sigi_match = pattern.search(html_content)
                 
                 if sigi_match:
                     try:
-                        sigi_data = json.loads(sigi_match.group(1))
-                        
-                        # ItemModuleから動画情報を抽出
-                        if 'ItemModule' in sigi_data:
-                            item_module = sigi_data['ItemModule']
-                            for video_id, video_data in item_module.items():
-                                if isinstance(video_data, dict):
-                                    extracted = self._parse_item_module_data_enhanced(video_data)
-                                    details.update(extracted)
-                                    if extracted:  # データが見つかったら最初のものを使用
-                                        break
-                        
-                        # UserModuleから作者情報を抽出
-                        if 'UserModule' in sigi_data:
-                            user_module = sigi_data['UserModule']
-                            if 'users' in user_module:
-                                for user_id, user_data in user_module['users'].items():
-                                    if isinstance(user_data, dict):
-                                        extracted = self._parse_user_module_data_enhanced(user_data)
-                                        details.update(extracted)
-                                        if extracted:  # データが見つかったら最初のものを使用
-                                            break
+                        sigi_data = json_io.decode_embedded(html_content, sigi_match.end())
                         
-                        # VideoDetailから詳細情報を抽出
-                        if 'VideoDetail' in sigi_data:
-                            video_detail = sigi_data['VideoDetail']
-                            extracted = self._parse_video_detail_data(video_detail)
-                            details.update(extracted)
+                        # ItemModule（動画情報）・UserModule（作者情報）・VideoDetail の順に抽出
+                        for module_key, parser_name in SIGI_MODULE_PARSERS:
+                            if module_key in sigi_data:
+                                getattr(self, parser_name)(sigi_data[module_key], details)
                         
                         if details:  # データが見つかったらループを終了
                             break
                     
-                    except json.JSONDecodeError as e:
-                        self.logger.debug(f"SIGI_STATE JSON解析エラー (パターン {pattern}): {e}")
+                    except json_io.JSONDecodeError as e:
+                        self.logger.debug("SIGI_STATE JSON解析エラー (パターン %s): %s", pattern.pattern, e)
                         continue
         
         except Exception as e:
@@ -283,20 +565,16 @@ class EnhancedVideoDetailScraper:
     def _extract_from_universal_data(self, html_content: str) -> Dict[str, Any]:
         """__UNIVERSAL_DATA_FOR_REHYDRATION__から情報を抽出"""
         details = {}
+        if UNIVERSAL_DATA_MARKER not in html_content:
+            return details
         
         try:
-            # Universal Dataパターンを検索
-            universal_patterns = [
-                r'window\[\'__UNIVERSAL_DATA_FOR_REHYDRATION__\'\]\s*=\s*({.+?});',
-                r'__UNIVERSAL_DATA_FOR_REHYDRATION__\s*=\s*({.+?});',
-            ]
-            
-            for pattern in universal_patterns:
-                universal_match = re.search(pattern, html_content, re.DOTALL)
+            for pattern in UNIVERSAL_DATA_PATTERNS:
+                universal_match = pattern.search(html_content)
                 
                 if universal_match:
                     try:
-                        universal_data = json.loads(universal_match.group(1))
+                        universal_data = json_io.decode_embedded(html_content, universal_match.end())
                         
                         # __DEFAULT_SCOPE__から動画情報を抽出
                         if '__DEFAULT_SCOPE__' in universal_data:
@@ -305,14 +583,13 @@ class EnhancedVideoDetailScraper:
                             # webapp.video-detailから詳細情報を抽出
                             if 'webapp.video-detail' in default_scope:
                                 video_detail = default_scope['webapp.video-detail']
-                                extracted = self._parse_webapp_video_detail(video_detail)
-                                details.update(extracted)
+                                self._parse_webapp_video_detail(video_detail, details)
                         
                         if details:  # データが見つかったらループを終了
                             break
                     
-                    except json.JSONDecodeError as e:
-                        self.logger.debug(f"Universal Data JSON解析エラー: {e}")
+                    except json_io.JSONDecodeError as e:
+                        self.logger.debug("Universal Data JSON解析エラー: %s", e)
                         continue
         
         except Exception as e:
@@ -320,37 +597,33 @@ class EnhancedVideoDetailScraper:
         
         return details
     
-    def _extract_from_json_ld_enhanced(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """JSON-LD構造化データから情報を抽出（改良版）"""
+    def _extract_from_json_ld_enhanced(self, html_content: str) -> Dict[str, Any]:
+        """JSON-LD構造化データから情報を抽出（改良版、DOMを構築せずHTMLから直接取得）"""
         details = {}
         
         try:
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            
-            for script in json_ld_scripts:
-                if script.string:
+            for script_match in JSON_LD_SCRIPT_RE.finditer(html_content):
+                script_text = script_match.group(1)
+                if script_text:
                     try:
-                        data = json.loads(script.string)
+                        data = json_io.loads(script_text)
                         
                         if isinstance(data, dict):
                             # VideoObjectタイプをチェック
                             if data.get('@type') == 'VideoObject':
-                                extracted = self._parse_video_object_enhanced(data)
-                                details.update(extracted)
+                                self._parse_video_object_enhanced(data, details)
                             
                             # その他の構造化データ
                             if 'interactionStatistic' in data:
-                                extracted = self._parse_interaction_stats_enhanced(data['interactionStatistic'])
-                                details.update(extracted)
+                                self._parse_interaction_stats_enhanced(data['interactionStatistic'], details)
                         
                         elif isinstance(data, list):
                             # 配列の場合は各要素をチェック
                             for item in data:
                                 if isinstance(item, dict) and item.get('@type') == 'VideoObject':
-                                    extracted = self._parse_video_object_enhanced(item)
-                                    details.update(extracted)
+                                    self._parse_video_object_enhanced(item, details)
                         
-                    except json.JSONDecodeError:
+                    except json_io.JSONDecodeError:
                         continue
         
         except Exception as e:
@@ -363,22 +636,23 @@ class EnhancedVideoDetailScraper:
         details = {}
         
         try:
-            # Open Graphメタタグ
-            og_tags = {
-                'og:title': 'title',
-                'og:description': 'description',
-                'og:image': 'thumbnail_url',
-                'og:video': 'video_url',
-                'og:video:duration': 'duration',
-                'og:video:width': 'width',
-                'og:video:height': 'height'
-            }
+            # メタタグを一度だけ走査し、抽出対象の property / name 属性ごとに最初のタグを記録
+            meta_by_property = {}
+            meta_by_name = {}
+            for meta_tag in soup.find_all('meta'):
+                property_value = meta_tag.get('property')
+                if property_value in OG_META_TAGS:
+                    meta_by_property.setdefault(property_value, meta_tag)
+                name_value = meta_tag.get('name')
+                if name_value in META_NAME_KEYS:
+                    meta_by_name.setdefault(name_value, meta_tag)
             
-            for og_property, detail_key in og_tags.items():
-                meta_tag = soup.find('meta', property=og_property)
+            # Open Graphメタタグ
+            for og_property, detail_key in OG_META_TAGS.items():
+                meta_tag = meta_by_property.get(og_property)
                 if meta_tag and meta_tag.get('content'):
                     content = meta_tag['content']
-                    if detail_key in ['duration', 'width', 'height']:
+                    if detail_key in INT_META_DETAIL_KEYS:
                         try:
                             details[detail_key] = int(content)
                         except ValueError:
@@ -387,20 +661,12 @@ class EnhancedVideoDetailScraper:
                         details[detail_key] = content
             
             # Twitterカードメタタグ
-            twitter_tags = {
-                'twitter:title': 'title',
-                'twitter:description': 'description',
-                'twitter:image': 'thumbnail_url',
-                'twitter:player:width': 'width',
-                'twitter:player:height': 'height'
-            }
-            
-            for twitter_name, detail_key in twitter_tags.items():
-                meta_tag = soup.find('meta', attrs={'name': twitter_name})
+            for twitter_name, detail_key in TWITTER_META_TAGS.items():
+                meta_tag = meta_by_name.get(twitter_name)
                 if meta_tag and meta_tag.get('content'):
                     if detail_key not in details:  # OGタグを優先
                         content = meta_tag['content']
-                        if detail_key in ['width', 'height']:
+                        if detail_key in INT_META_DETAIL_KEYS:
                             try:
                                 details[detail_key] = int(content)
                             except ValueError:
@@ -409,14 +675,8 @@ class EnhancedVideoDetailScraper:
                             details[detail_key] = content
             
             # TikTok特有のメタタグ
-            tiktok_meta_tags = {
-                'tiktok:video:id': 'video_id',
-                'tiktok:author': 'author_username',
-                'tiktok:upload_date': 'create_time'
-            }
-            
-            for meta_name, detail_key in tiktok_meta_tags.items():
-                meta_tag = soup.find('meta', attrs={'name': meta_name})
+            for meta_name, detail_key in TIKTOK_META_TAGS.items():
+                meta_tag = meta_by_name.get(meta_name)
                 if meta_tag and meta_tag.get('content'):
                     details[detail_key] = meta_tag['content']
         
@@ -432,80 +692,45 @@ class EnhancedVideoDetailScraper:
         try:
             text_content = soup.get_text()
             
-            # 再生数パターン（改良版）
-            view_patterns = [
-                r'(\d+(?:\.\d+)?[KMB]?)\s*(?:views?|再生|回再生|次再生)',
-                r'(\d+(?:,\d+)*)\s*(?:views?|再生)',
-                r'再生回数[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-                r'view[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-            ]
-            
-            for pattern in view_patterns:
-                match = re.search(pattern, text_content, re.IGNORECASE)
+            # 再生数
+            for pattern in TEXT_VIEW_PATTERNS:
+                match = pattern.search(text_content)
                 if match:
                     view_count = self._parse_count_string(match.group(1))
                     if view_count and view_count > 0:
                         details['view_count'] = view_count
                         break
             
-            # いいね数パターン（改良版）
-            like_patterns = [
-                r'(\d+(?:\.\d+)?[KMB]?)\s*(?:likes?|いいね|♥)',
-                r'♥\s*(\d+(?:\.\d+)?[KMB]?)',
-                r'いいね[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-                r'like[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-            ]
-            
-            for pattern in like_patterns:
-                match = re.search(pattern, text_content, re.IGNORECASE)
+            # いいね数
+            for pattern in TEXT_LIKE_PATTERNS:
+                match = pattern.search(text_content)
                 if match:
                     like_count = self._parse_count_string(match.group(1))
                     if like_count and like_count > 0:
                         details['like_count'] = like_count
                         break
             
-            # コメント数パターン（改良版）
-            comment_patterns = [
-                r'(\d+(?:\.\d+)?[KMB]?)\s*(?:comments?|コメント)',
-                r'コメント[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-                r'comment[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-            ]
-            
-            for pattern in comment_patterns:
-                match = re.search(pattern, text_content, re.IGNORECASE)
+            # コメント数
+            for pattern in TEXT_COMMENT_PATTERNS:
+                match = pattern.search(text_content)
                 if match:
                     comment_count = self._parse_count_string(match.group(1))
                     if comment_count and comment_count > 0:
                         details['comment_count'] = comment_count
                         break
             
-            # シェア数パターン（改良版）
-            share_patterns = [
-                r'(\d+(?:\.\d+)?[KMB]?)\s*(?:shares?|シェア)',
-                r'シェア[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-                r'share[s]?\s*[：:]\s*(\d+(?:\.\d+)?[KMB]?)',
-            ]
-            
-            for pattern in share_patterns:
-                match = re.search(pattern, text_content, re.IGNORECASE)
+            # シェア数
+            for pattern in TEXT_SHARE_PATTERNS:
+                match = pattern.search(text_content)
                 if match:
                     share_count = self._parse_count_string(match.group(1))
                     if share_count and share_count > 0:
                         details['share_count'] = share_count
                         break
             
-            # 投稿日時パターン（改良版）
-            date_patterns = [
-                r'(\d{4}-\d{2}-\d{2})',  # YYYY-MM-DD
-                r'(\d{1,2}/\d{1,2}/\d{4})',  # MM/DD/YYYY
-                r'(\d{1,2}-\d{1,2}-\d{4})',  # MM-DD-YYYY
-                r'(\d+)\s*(?:hours?|時間)\s*ago',  # X hours ago
-                r'(\d+)\s*(?:days?|日)\s*ago',  # X days ago
-                r'(\d+)\s*(?:weeks?|週間)\s*ago',  # X weeks ago
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, text_content, re.IGNORECASE)
+            # 投稿日時
+            for pattern in TEXT_DATE_PATTERNS:
+                match = pattern.search(text_content)
                 if match:
                     details['create_time_raw'] = match.group(1)
                     break
@@ -515,63 +740,58 @@ class EnhancedVideoDetailScraper:
         
         return details
     
-    def _extract_from_e2e_attributes_enhanced(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """data-e2e属性から情報を抽出（改良版）"""
+    def _extract_from_e2e_attributes_enhanced(self, tree) -> Dict[str, Any]:
+        """data-e2e属性から情報を抽出（改良版、treeはselectolaxのツリーまたはBeautifulSoup）"""
         details = {}
         
         try:
             # 統計情報のdata-e2e属性（改良版）
+            # 同じ項目に対応する属性値は後のものを優先（video-views > video-view-count）
             e2e_mappings = {
                 'like-count': 'like_count',
                 'comment-count': 'comment_count',
                 'share-count': 'share_count',
-                'video-views': 'view_count',
                 'video-view-count': 'view_count',
+                'video-views': 'view_count',
                 'browse-video-desc': 'description',
                 'browse-username': 'author_username',
                 'browse-nickname': 'author_display_name'
             }
             
+            # data-e2e属性を持つ要素を一度だけ走査し、属性値ごとに最初の有効な値を記録
+            e2e_values = {}
+            for element in _select_nodes(tree, '[data-e2e]'):
+                e2e_value = _node_attr(element, 'data-e2e')
+                detail_key = e2e_mappings.get(e2e_value)
+                if detail_key is None or e2e_value in e2e_values:
+                    continue
+                
+                text = _node_text(element)
+                if text:
+                    if detail_key in ['like_count', 'comment_count', 'share_count', 'view_count']:
+                        count = self._parse_count_string(text)
+                        if count is not None and count > 0:
+                            e2e_values[e2e_value] = count
+                    else:
+                        e2e_values[e2e_value] = text
+            
             for e2e_value, detail_key in e2e_mappings.items():
-                elements = soup.find_all(attrs={'data-e2e': e2e_value})
-                for element in elements:
-                    text = element.get_text(strip=True)
-                    if text:
-                        if detail_key in ['like_count', 'comment_count', 'share_count', 'view_count']:
-                            count = self._parse_count_string(text)
-                            if count is not None and count > 0:
-                                details[detail_key] = count
-                                break
-                        else:
-                            details[detail_key] = text
-                            break
+                if e2e_value in e2e_values:
+                    details[detail_key] = e2e_values[e2e_value]
         
         except Exception as e:
             self.logger.warning(f"data-e2e属性抽出エラー: {e}")
         
         return details
     
-    def _extract_from_css_selectors(self, soup: BeautifulSoup) -> Dict[str, Any]:
-        """CSS セレクターによる直接抽出"""
+    def _extract_from_css_selectors(self, tree) -> Dict[str, Any]:
+        """CSS セレクターによる直接抽出（treeはselectolaxのツリーまたはBeautifulSoup）"""
         details = {}
         
         try:
             # TikTokの一般的なCSSセレクター
+            # （data-e2e属性のセレクターは _extract_from_e2e_attributes_enhanced で抽出済み）
             css_selectors = {
-                # 統計情報
-                '[data-e2e="like-count"]': 'like_count',
-                '[data-e2e="comment-count"]': 'comment_count',
-                '[data-e2e="share-count"]': 'share_count',
-                '[data-e2e="video-views"]': 'view_count',
-                
-                # 作者情報
-                '[data-e2e="browse-username"]': 'author_username',
-                '[data-e2e="browse-nickname"]': 'author_display_name',
-                
-                # 動画情報
-                '[data-e2e="browse-video-desc"]': 'description',
-                
-                # その他のセレクター
                 '.video-meta-caption': 'description',
                 '.author-uniqueId': 'author_username',
                 '.author-nickname': 'author_display_name',
@@ -579,18 +799,11 @@ class EnhancedVideoDetailScraper:
             
             for selector, detail_key in css_selectors.items():
                 try:
-                    elements = soup.select(selector)
-                    for element in elements:
-                        text = element.get_text(strip=True)
+                    for element in _select_nodes(tree, selector):
+                        text = _node_text(element)
                         if text:
-                            if detail_key in ['like_count', 'comment_count', 'share_count', 'view_count']:
-                                count = self._parse_count_string(text)
-                                if count is not None and count > 0:
-                                    details[detail_key] = count
-                                    break
-                            else:
-                                details[detail_key] = text
-                                break
+                            details[detail_key] = text
+                            break
                 except Exception:
                     continue
         
@@ -604,18 +817,11 @@ class EnhancedVideoDetailScraper:
         details = {}
         
         try:
-            # 再生数の高度なパターン
-            view_patterns = [
-                r'"playCount":\s*(\d+)',
-                r'"viewCount":\s*(\d+)',
-                r'"play_count":\s*(\d+)',
-                r'"view_count":\s*(\d+)',
-                r'playCount["\']:\s*["\']?(\d+)',
-                r'viewCount["\']:\s*["\']?(\d+)',
-            ]
-            
-            for pattern in view_patterns:
-                match = re.search(pattern, html_content, re.IGNORECASE)
+            searcher = JSONPatternSearcher(html_content)
+            
+            # 再生数
+            for pattern in JSON_VIEW_PATTERNS:
+                match = searcher.search(pattern)
                 if match:
                     try:
                         view_count = int(match.group(1))
@@ -625,17 +831,9 @@ class EnhancedVideoDetailScraper:
                     except ValueError:
                         continue
             
-            # いいね数の高度なパターン
-            like_patterns = [
-                r'"diggCount":\s*(\d+)',
-                r'"likeCount":\s*(\d+)',
-                r'"like_count":\s*(\d+)',
-                r'diggCount["\']:\s*["\']?(\d+)',
-                r'likeCount["\']:\s*["\']?(\d+)',
-            ]
-            
-            for pattern in like_patterns:
-                match = re.search(pattern, html_content, re.IGNORECASE)
+            # いいね数
+            for pattern in JSON_LIKE_PATTERNS:
+                match = searcher.search(pattern)
                 if match:
                     try:
                         like_count = int(match.group(1))
@@ -645,17 +843,9 @@ class EnhancedVideoDetailScraper:
                     except ValueError:
                         continue
             
-            # 投稿日時の高度なパターン
-            time_patterns = [
-                r'"createTime":\s*(\d+)',
-                r'"create_time":\s*(\d+)',
-                r'"uploadDate":\s*["\']([^"\']+)["\']',
-                r'"published_at":\s*["\']([^"\']+)["\']',
-                r'createTime["\']:\s*["\']?(\d+)',
-            ]
-            
-            for pattern in time_patterns:
-                match = re.search(pattern, html_content, re.IGNORECASE)
+            # 投稿日時
+            for pattern in JSON_TIME_PATTERNS:
+                match = searcher.search(pattern)
                 if match:
                     time_value = match.group(1)
                     try:
@@ -673,16 +863,9 @@ class EnhancedVideoDetailScraper:
                     except ValueError:
                         continue
             
-            # 作者情報の高度なパターン
-            author_patterns = [
-                r'"uniqueId":\s*["\']([^"\']+)["\']',
-                r'"author":\s*["\']([^"\']+)["\']',
-                r'"username":\s*["\']([^"\']+)["\']',
-                r'uniqueId["\']:\s*["\']([^"\']+)["\']',
-            ]
-            
-            for pattern in author_patterns:
-                match = re.search(pattern, html_content, re.IGNORECASE)
+            # 作者情報
+            for pattern in JSON_AUTHOR_PATTERNS:
+                match = searcher.search(pattern)
                 if match:
                     author = match.group(1)
                     if author and len(author) > 0:
@@ -694,177 +877,352 @@ class EnhancedVideoDetailScraper:
         
         return details
     
-    def _parse_item_module_data_enhanced(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """ItemModuleデータを解析（改良版）"""
-        details = {}
+    def _parse_sigi_item_module(self, item_module: Dict[str, Any], details: Dict[str, Any]):
+        """SIGI_STATEのItemModuleから動画情報を抽出（データが見つかった最初の動画を使用）"""
+        for video_id, video_data in item_module.items():
+            if isinstance(video_data, dict):
+                if self._parse_item_module_data_enhanced(video_data, details):
+                    break
+    
+    def _parse_sigi_user_module(self, user_module: Dict[str, Any], details: Dict[str, Any]):
+        """SIGI_STATEのUserModuleから作者情報を抽出（データが見つかった最初のユーザーを使用）"""
+        if 'users' in user_module:
+            for user_id, user_data in user_module['users'].items():
+                if isinstance(user_data, dict):
+                    if self._parse_user_module_data_enhanced(user_data, details):
+                        break
+    
+    def _parse_item_module_data_enhanced(self, data: Dict[str, Any], details: Dict[str, Any]) -> bool:
+        """
+        ItemModuleデータを解析（改良版）
+        
+        以下の _parse_* と同様に、抽出した項目は中間の辞書を作らず details に直接設定する。
+        
+        Returns:
+            項目を1つ以上設定した場合はTrue
+        """
+        written = False
         
         try:
-            if 'desc' in data:
-                details['description'] = data['desc']
-            if 'createTime' in data:
-                details['create_time'] = data['createTime']
-            
-            # 統計情報
-            if 'stats' in data:
-                stats = data['stats']
-                if 'playCount' in stats:
-                    details['view_count'] = stats['playCount']
-                if 'diggCount' in stats:
-                    details['like_count'] = stats['diggCount']
-                if 'commentCount' in stats:
-                    details['comment_count'] = stats['commentCount']
-                if 'shareCount' in stats:
-                    details['share_count'] = stats['shareCount']
-            
-            # 作者情報
-            if 'author' in data:
-                author = data['author']
-                if 'uniqueId' in author:
-                    details['author_username'] = author['uniqueId']
-                if 'nickname' in author:
-                    details['author_display_name'] = author['nickname']
-                if 'verified' in author:
-                    details['author_verified'] = author['verified']
-            
-            # 動画情報
-            if 'video' in data:
-                video = data['video']
-                if 'duration' in video:
-                    details['duration'] = video['duration']
-                if 'width' in video:
-                    details['width'] = video['width']
-                if 'height' in video:
-                    details['height'] = video['height']
+            for section_key, key_map in ITEM_MODULE_KEY_MAP:
+                if section_key is None:
+                    section = data
+                elif section_key in data:
+                    section = data[section_key]
+                else:
+                    continue
+                
+                for source_key, detail_key in key_map:
+                    if source_key in section:
+                        details[detail_key] = section[source_key]
+                        written = True
         
         except Exception as e:
             self.logger.warning(f"ItemModule解析エラー: {e}")
         
-        return details
+        return written
     
-    def _parse_user_module_data_enhanced(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """UserModuleデータを解析（改良版）"""
-        details = {}
+    def _parse_user_module_data_enhanced(self, data: Dict[str, Any], details: Dict[str, Any]) -> bool:
+        """UserModuleデータを解析（改良版、項目を1つ以上設定した場合はTrue）"""
+        written = False
         
         try:
-            if 'uniqueId' in data:
-                details['author_username'] = data['uniqueId']
-            if 'nickname' in data:
-                details['author_display_name'] = data['nickname']
-            if 'verified' in data:
-                details['author_verified'] = data['verified']
-            if 'followerCount' in data:
-                details['author_follower_count'] = data['followerCount']
-            if 'followingCount' in data:
-                details['author_following_count'] = data['followingCount']
-            if 'videoCount' in data:
-                details['author_video_count'] = data['videoCount']
+            get = data.get
+            for source_key, detail_key in USER_MODULE_KEY_MAP:
+                value = get(source_key, _MISSING)
+                if value is not _MISSING:
+                    details[detail_key] = value
+                    written = True
         
         except Exception as e:
             self.logger.warning(f"UserModule解析エラー: {e}")
         
-        return details
+        return written
     
-    def _parse_video_detail_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """VideoDetailデータを解析"""
-        details = {}
-        
-        try:
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    if isinstance(value, dict):
-                        # 再帰的に解析
-                        sub_details = self._parse_video_detail_data(value)
-                        details.update(sub_details)
+    def _parse_video_detail_data(self, data: Dict[str, Any], details: Dict[str, Any]) -> bool:
+        """VideoDetailデータを解析（項目を1つ以上設定した場合はTrue）"""
+        return self._parse_item_struct_data(data, details, "VideoDetail")
+    
+    def _parse_webapp_video_detail(self, data: Dict[str, Any], details: Dict[str, Any]) -> bool:
+        """webapp.video-detailデータを解析（項目を1つ以上設定した場合はTrue）"""
+        return self._parse_item_struct_data(data, details, "webapp.video-detail")
+    
+    def _parse_item_struct_data(self, data: Dict[str, Any], details: Dict[str, Any], label: str) -> bool:
+        """
+        itemInfo.itemStruct から詳細情報を抽出
         
-        except Exception as e:
-            self.logger.warning(f"VideoDetail解析エラー: {e}")
+        itemStruct は ItemModule の動画データと同じ構造のため、同じ対応表で
+        details に直接設定する。
         
-        return details
-    
-    def _parse_webapp_video_detail(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """webapp.video-detailデータを解析"""
-        details = {}
+        Args:
+            data: 解析対象のデータ
+            details: 抽出した項目の設定先
+            label: エラーログに表示するデータ名
         
+        Returns:
+            項目を1つ以上設定した場合はTrue
+        """
         try:
-            if isinstance(data, dict):
-                for key, value in data.items():
-                    if isinstance(value, dict):
-                        # 再帰的に解析
-                        sub_details = self._parse_webapp_video_detail(value)
-                        details.update(sub_details)
+            item_info = data.get('itemInfo') if isinstance(data, dict) else None
+            item_struct = item_info.get('itemStruct') if isinstance(item_info, dict) else None
+            if isinstance(item_struct, dict):
+                return self._parse_item_module_data_enhanced(item_struct, details)
         
         except Exception as e:
-            self.logger.warning(f"webapp.video-detail解析エラー: {e}")
+            self.logger.warning(f"{label}解析エラー: {e}")
         
-        return details
+        return False
     
-    def _parse_video_object_enhanced(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """VideoObjectデータを解析（改良版）"""
-        details = {}
+    def _parse_video_object_enhanced(self, data: Dict[str, Any], details: Dict[str, Any]) -> bool:
+        """VideoObjectデータを解析（改良版、項目を1つ以上設定した場合はTrue）"""
+        written = False
         
         try:
-            if 'name' in data:
-                details['title'] = data['name']
-            if 'description' in data:
-                details['description'] = data['description']
-            if 'uploadDate' in data:
-                details['create_time_iso'] = data['uploadDate']
-            if 'thumbnailUrl' in data:
-                details['thumbnail_url'] = data['thumbnailUrl']
-            if 'contentUrl' in data:
-                details['video_url'] = data['contentUrl']
-            if 'duration' in data:
-                details['duration'] = data['duration']
-            if 'width' in data:
-                details['width'] = data['width']
-            if 'height' in data:
-                details['height'] = data['height']
+            get = data.get
+            for source_key, detail_key in VIDEO_OBJECT_KEY_MAP:
+                value = get(source_key, _MISSING)
+                if value is not _MISSING:
+                    details[detail_key] = value
+                    written = True
         
         except Exception as e:
             self.logger.warning(f"VideoObject解析エラー: {e}")
         
-        return details
+        return written
     
-    def _parse_interaction_stats_enhanced(self, stats: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """インタラクション統計を解析（改良版）"""
-        details = {}
+    def _parse_interaction_stats_enhanced(self, stats: List[Dict[str, Any]], details: Dict[str, Any]) -> bool:
+        """インタラクション統計を解析（改良版、項目を1つ以上設定した場合はTrue）"""
+        written = False
         
         try:
             for stat in stats:
-                interaction_type = stat.get('interactionType', {}).get('@type', '')
+                interaction = stat.get('interactionType')
+                detail_key = INTERACTION_TYPE_KEYS.get(interaction.get('@type') if interaction else None)
                 user_interaction_count = stat.get('userInteractionCount')
                 
-                if interaction_type == 'LikeAction' and user_interaction_count:
-                    details['like_count'] = int(user_interaction_count)
-                elif interaction_type == 'CommentAction' and user_interaction_count:
-                    details['comment_count'] = int(user_interaction_count)
-                elif interaction_type == 'ShareAction' and user_interaction_count:
-                    details['share_count'] = int(user_interaction_count)
-                elif interaction_type == 'WatchAction' and user_interaction_count:
-                    details['view_count'] = int(user_interaction_count)
+                if detail_key and user_interaction_count:
+                    details[detail_key] = int(user_interaction_count)
+                    written = True
         
         except Exception as e:
             self.logger.warning(f"インタラクション統計解析エラー: {e}")
         
-        return details
+        return written
     
     def _parse_count_string(self, count_str: str) -> Optional[int]:
         """カウント文字列を数値に変換（改良版）"""
-        try:
-            count_str = count_str.upper().strip().replace(',', '').replace(' ', '')
-            
-            if count_str.endswith('K'):
-                return int(float(count_str[:-1]) * 1000)
-            elif count_str.endswith('M'):
-                return int(float(count_str[:-1]) * 1000000)
-            elif count_str.endswith('B'):
-                return int(float(count_str[:-1]) * 1000000000)
-            else:
-                # 数値のみの場合
-                return int(float(count_str))
+        return parse_count_string(count_str)
+
+
+# プロセスプールのワーカーで使用する抽出用インスタンス（ワーカープロセスごとに1つ）
+_worker_extractor = None
+
+# HTML解析用のプロセスプール（初回使用時に作成し、全スクレイパーで共有）
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def extract_video_details(html_content: str, video_url: str) -> Optional[Dict[str, Any]]:
+    """
+    HTMLコンテンツから動画詳細情報を抽出（プロセスプールのワーカーで実行）
+    
+    Args:
+        html_content: HTMLコンテンツ
+        video_url: 動画URL
+        
+    Returns:
+        動画詳細情報の辞書
+    """
+    global _worker_extractor
+    if _worker_extractor is None:
+        _worker_extractor = VideoDetailExtractor()
+    return _worker_extractor._extract_video_details_enhanced(html_content, video_url)
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """HTML解析用の共有プロセスプールを取得"""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return _parse_pool
+
+
+class EnhancedVideoDetailScraper(VideoDetailExtractor):
+    """改良版個別動画詳細情報取得クラス"""
+    
+    def __init__(self, api_key: str, use_process_pool: bool = False,
+                 cache_path: Optional[str] = ".cache/video_details.db", cache_ttl: float = 3600.0):
+        """
+        Args:
+            api_key: ScraperAPI キー
+            use_process_pool: HTMLの解析をプロセスプールで実行するか
+                              （多数の動画を並行取得する場合に解析で他のスレッドを妨げない）
+            cache_path: 取得した詳細情報のキャッシュファイルのパス（Noneでキャッシュしない）
+            cache_ttl: キャッシュの有効期間（秒）
+        """
+        super().__init__()
+        self.use_process_pool = use_process_pool
+        self.api_client = ScraperAPIClient(api_key)
+        self.proxy_manager = ProxyManager()
+        self.throttle = RequestThrottle()
+        self.detail_cache = VideoDetailCache(cache_path, cache_ttl) if cache_path else None
+        
+        # 統計情報（インスタンスは1スレッドで使用し、並行取得時はワーカーごとに集計して合算）
+        self.stats = Counter({
+            'cache_hits': 0,
+            'total_requests': 0,
+            'successful_requests': 0,
+            'failed_requests': 0,
+            'videos_with_details': 0,
+            'videos_without_details': 0,
+            'view_count_extracted': 0,
+            'create_time_extracted': 0,
+            'author_extracted': 0
+        })
+    
+    def get_video_details(self, video_url: str, max_retries: int = 3) -> Optional[Dict[str, Any]]:
+        """
+        個別動画ページから詳細情報を取得（改良版）
+        
+        Args:
+            video_url: 動画URL
+            max_retries: 最大リトライ回数
+            
+        Returns:
+            動画詳細情報の辞書、失敗時はNone
+        """
+        self.logger.info(f"動画詳細情報を取得: {video_url}")
+        
+        # 最近取得済みの動画はScraperAPIへのリクエストを省略
+        if self.detail_cache:
+            cached_details = self.detail_cache.get(video_url)
+            if cached_details is not None:
+                self.stats['cache_hits'] += 1
+                self.logger.info(f"キャッシュから詳細情報を取得: {video_url}")
+                return cached_details
+        
+        for attempt in range(max_retries):
+            try:
+                # リクエスト制御
+                self.throttle.wait_if_needed()
                 
-        except (ValueError, TypeError):
-            return None
+                # User-Agentとプロキシを選択
+                user_agent = UserAgentManager.get_random_tiktok_agent()
+                proxy = self.proxy_manager.get_next_proxy()
+                
+                # ScraperAPIでページを取得
+                custom_params = {
+                    'premium': True,
+                    'session_number': random.randint(1, 1000),
+                    'keep_headers': True,
+                    'render_js': True  # JavaScript実行を有効化
+                }
+                
+                if proxy and hasattr(proxy, 'country') and proxy.country:
+                    custom_params['country_code'] = proxy.country
+                
+                self.stats['total_requests'] += 1
+                
+                response = self.api_client.scrape(
+                    url=video_url,
+                    **custom_params
+                )
+                
+                if response and response.get('status_code') == 200:
+                    html_content = response.get('content', '')
+                    
+                    if html_content and len(html_content) > 1000:  # 最小サイズチェック
+                        if self.use_process_pool:
+                            details = get_parse_pool().submit(
+                                extract_video_details, html_content, video_url
+                            ).result()
+                        else:
+                            details = self._extract_video_details_enhanced(html_content, video_url)
+                        
+                        if details:
+                            # 成功・抽出成功統計をまとめて更新
+                            self.stats.update({
+                                'successful_requests': 1,
+                                'videos_with_details': 1,
+                                'view_count_extracted': bool(details.get('view_count')),
+                                'create_time_extracted': bool(details.get('create_time')),
+                                'author_extracted': bool(details.get('author_username'))
+                            })
+                            
+                            if self.detail_cache:
+                                self.detail_cache.set(video_url, details)
+                            
+                            self.logger.info(f"詳細情報取得成功: {video_url}")
+                            return details
+                        else:
+                            self.stats['videos_without_details'] += 1
+                            self.logger.warning(f"詳細情報の抽出に失敗: {video_url}")
+                    else:
+                        self.logger.warning(f"コンテンツが不十分: {video_url} (サイズ: {len(html_content)})")
+                else:
+                    self.logger.warning(f"HTTP エラー: {response.get('status_code')} - {video_url}")
+                
+                # リトライ前の待機
+                if attempt < max_retries - 1:
+                    wait_time = random.uniform(5, 15)
+                    self.logger.info(f"リトライ前待機: {wait_time:.1f}秒")
+                    time.sleep(wait_time)
+                
+            except Exception as e:
+                self.logger.error(f"動画詳細取得エラー (試行 {attempt + 1}): {e}")
+                
+                if attempt < max_retries - 1:
+                    wait_time = random.uniform(10, 20)
+                    time.sleep(wait_time)
+        
+        self.stats['failed_requests'] += 1
+        self.logger.error(f"動画詳細取得失敗: {video_url}")
+        return None
+    
+    def get_many_video_details(self, video_urls: List[str], concurrency: int = 4) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        複数の動画の詳細情報を並行して取得
+        
+        リクエスト・待機時間の大半はネットワーク待ちのため、ワーカースレッドで重ねて実行する。
+        ワーカーごとに独立したスクレイパー（セッション・リクエスト制御）を使い、
+        スレッド間ではキャッシュ以外の状態を共有しない。統計情報は完了後にこのインスタンスに合算する。
+        
+        Args:
+            video_urls: 動画URLのリスト
+            concurrency: 同時に実行するワーカー数
+            
+        Returns:
+            動画URLをキーとする動画詳細情報の辞書（取得失敗時の値はNone）
+        """
+        worker_count = max(1, min(concurrency, len(video_urls)))
+        workers = [self] + [
+            EnhancedVideoDetailScraper(self.api_client.api_key, self.use_process_pool, cache_path=None)
+            for _ in range(worker_count - 1)
+        ]
+        
+        # キャッシュはスレッド間で共有してよいため、このインスタンスのものを使用
+        for worker in workers[1:]:
+            worker.detail_cache = self.detail_cache
+        
+        def scrape_urls(worker, urls):
+            return [(url, worker.get_video_details(url)) for url in urls]
+        
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                futures = [
+                    executor.submit(scrape_urls, worker, video_urls[i::worker_count])
+                    for i, worker in enumerate(workers)
+                ]
+                for future in futures:
+                    results.update(future.result())
+        finally:
+            for worker in workers[1:]:
+                self.stats.update(worker.stats)
+                worker.api_client.close()
+        
+        return {url: results.get(url) for url in video_urls}
     
     def get_stats(self) -> Dict[str, Any]:
         """統計情報を取得"""
@@ -879,8 +1237,6 @@ class EnhancedVideoDetailScraper:
 
 def test_enhanced_scraper():
     """改良版スクレイパーのテスト"""
-    import os
-    
     # APIキーを取得
     api_key = os.getenv('SCRAPERAPI_KEY')
     if not api_key:
@@ -897,10 +1253,12 @@ def test_enhanced_scraper():
     
     print("🔍 改良版動画詳細スクレイパーのテスト開始")
     
+    all_details = scraper.get_many_video_details(test_urls)
+    
     for i, url in enumerate(test_urls, 1):
         print(f"\n=== テスト {i}: {url} ===")
         
-        details = scraper.get_video_details(url)
+        details = all_details[url]
         
         if details:
             print("✅ 詳細情報取得成功")
@@ -912,10 +1270,8 @@ def test_enhanced_scraper():
             print(f"投稿日時: {details.get('create_time', 'N/A')}")
             
             # 詳細情報をファイルに保存
-            import json
             os.makedirs('debug', exist_ok=True)
-            with open(f'debug/enhanced_video_details_{details.get("video_id", i)}.json', 'w', encoding='utf-8') as f:
-                json.dump(details, f, ensure_ascii=False, indent=2)
+            json_io.dump(details, f'debug/enhanced_video_details_{details.get("video_id", i)}.json')
             print(f"詳細情報を保存: debug/enhanced_video_details_{details.get('video_id', i)}.json")
         else:
             print("❌ 詳細情報取得失敗")
@@ -6,23 +6,52 @@ Explore Page Video Batch Processor
 
 import os
 import sys
-import json
 import time
 import csv
+import heapq
+import mmap
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.utils import json_io
 from src.utils.logger import get_logger
+from src.utils.request_throttle import TokenBucket
 from meta_tag_video_scraper import MetaTagVideoScraper
 
+# 動画URLファイルの1行（前後の空白を除く）がTikTokの動画URLであるものを抽出
+VIDEO_URL_LINE_RE = re.compile(rb'^\s*(https://www\.tiktok\.com(?=/)[^\n]*?/video/[^\n]*?)\s*$', re.MULTILINE)
+
 
 class ExploreBatchProcessor:
     """Exploreページ動画のバッチ処理クラス"""
     
-    def __init__(self):
+    # リクエストの平均間隔（秒）。並行実行時も全体でこの間隔を超えないよう制御
+    REQUEST_INTERVAL = 2.0
+    
+    # 取得した詳細情報のキャッシュファイル（再実行時に同じ動画を再取得しない）
+    DETAIL_CACHE_PATH = ".cache/meta_video_details.db"
+    
+    # 結果表示で挙げるいいね数上位の動画数
+    TOP_PERFORMERS = 5
+    
+    # CSV出力の列
+    CSV_FIELDNAMES = [
+        'video_id', 'author_username', 'like_count', 'comment_count',
+        'title', 'description', 'keywords', 'url', 'processing_time'
+    ]
+    
+    def __init__(self, concurrency: int = 4):
+        """
+        Args:
+            concurrency: 同時に詳細情報を取得する動画数
+        """
         self.logger = get_logger(self.__class__.__name__)
+        self.concurrency = max(1, concurrency)
         
         # APIキーを取得
         self.api_key = os.getenv('SCRAPERAPI_KEY')
@@ -30,27 +59,43 @@ class ExploreBatchProcessor:
             raise ValueError("SCRAPERAPI_KEY環境変数が設定されていません")
         
         # メタタグスクレイパーを初期化
-        self.meta_scraper = MetaTagVideoScraper(self.api_key)
+        self.meta_scraper = MetaTagVideoScraper(self.api_key, cache_path=self.DETAIL_CACHE_PATH)
         
-        # 処理結果
+        # 処理結果（成功した動画は一覧を保持せず、JSONL/CSVファイルに1件ずつ書き出す）
         self.results = {
             'start_time': datetime.now().isoformat(),
             'source': 'tiktok_explore_page',
-            'processed_videos': [],
+            'processed_videos_file': None,
             'failed_videos': [],
             'summary': {}
         }
+        
+        # サマリー用の集計値（成功した動画ごとに更新）
+        self._running = {'likes': 0, 'comments': 0, 'times': 0.0, 'n': 0, 'authors': set()}
+        # いいね数上位の動画 (いいね数, -到着順, 作者) のヒープ（表示用）
+        self._top_performers = []
+        
+        # 書き出し中の出力ファイル
+        self.jsonl_file = None
+        self.csv_file = None
+        self._jsonl_fh = None
+        self._csv_fh = None
+        self._csv_writer = None
     
     def load_video_urls(self, filename: str = 'explore_video_urls.txt') -> List[str]:
-        """動画URLファイルを読み込み"""
+        """
+        動画URLファイルを読み込み
+        
+        行ごとに文字列を生成せず、mmapしたファイル全体を正規表現で一度に走査する。
+        """
         urls = []
         
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('https://www.tiktok.com/') and '/video/' in line:
-                        urls.append(line)
+            with open(filename, 'rb') as f:
+                # 空ファイルはmmapできないため読み込み対象なしとする
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as url_map:
+                        urls = [url.decode('utf-8') for url in VIDEO_URL_LINE_RE.findall(url_map)]
             
             self.logger.info(f"動画URL読み込み完了: {len(urls)}件")
             return urls
@@ -60,91 +105,126 @@ class ExploreBatchProcessor:
             return []
     
     def process_videos_batch(self, urls: List[str], max_videos: int = 30) -> Dict[str, Any]:
-        """動画の一括処理"""
+        """
+        動画の一括処理
+        
+        詳細情報の取得はネットワーク待ちが大半のため、concurrency 件までワーカースレッドで
+        重ねて実行する。ワーカーごとに独立したスクレイパーを使い、リクエスト間隔は
+        トークンバケットで全体として制御する。結果の集計と表示は完了順に呼び出し元の
+        スレッドで行う。
+        """
         self.logger.info(f"バッチ処理開始: {len(urls)}件の動画")
         
         try:
+            target_urls = urls[:max_videos]
+            total = len(target_urls)
+            
             print(f"🚀 /exploreページ動画の詳細情報取得開始")
-            print(f"対象動画数: {min(len(urls), max_videos)}件")
+            print(f"対象動画数: {total}件（同時取得数: {self.concurrency}）")
             print("=" * 60)
             
             processed_count = 0
             failed_count = 0
             
-            for i, url in enumerate(urls[:max_videos], 1):
-                try:
-                    print(f"\n📹 動画 {i}/{min(len(urls), max_videos)}: {url}")
-                    print(f"   ⏳ 詳細情報を取得中...")
-                    
-                    start_time = time.time()
-                    details = self.meta_scraper.get_video_details(url)
-                    end_time = time.time()
-                    
-                    processing_time = end_time - start_time
-                    
-                    if details:
-                        # 成功した場合
-                        video_data = {
-                            'url': url,
-                            'video_id': details.get('video_id'),
-                            'author_username': details.get('author_username'),
-                            'like_count': details.get('like_count'),
-                            'comment_count': details.get('comment_count'),
-                            'title': details.get('og_title', ''),
-                            'description': details.get('description', ''),
-                            'keywords': details.get('keywords', ''),
-                            'processing_time': processing_time,
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        
-                        self.results['processed_videos'].append(video_data)
-                        processed_count += 1
-                        
-                        print(f"   ✅ 成功 ({processing_time:.1f}秒)")
-                        print(f"   動画ID: {details.get('video_id')}")
-                        print(f"   作者: @{details.get('author_username')}")
-                        if details.get('like_count'):
-                            print(f"   いいね数: {details.get('like_count'):,}")
-                        if details.get('comment_count'):
-                            print(f"   コメント数: {details.get('comment_count'):,}")
-                        
-                    else:
-                        # 失敗した場合
-                        failed_data = {
-                            'url': url,
-                            'error': '詳細情報の取得に失敗',
-                            'processing_time': processing_time,
-                            'timestamp': datetime.now().isoformat()
-                        }
-                        
-                        self.results['failed_videos'].append(failed_data)
-                        failed_count += 1
-                        
-                        print(f"   ❌ 失敗: 詳細情報の取得に失敗")
-                    
-                    # 進捗表示
-                    success_rate = processed_count / i * 100
-                    print(f"   進捗: {i}/{min(len(urls), max_videos)} ({success_rate:.1f}%成功)")
-                    
-                    # API制限を考慮した待機
-                    if i < min(len(urls), max_videos):
-                        print(f"   ⏳ 次の動画まで待機中...")
-                        time.sleep(2)  # 2秒待機
-                    
-                except Exception as e:
-                    # エラーが発生した場合
-                    failed_data = {
-                        'url': url,
-                        'error': str(e),
-                        'processing_time': 0,
-                        'timestamp': datetime.now().isoformat()
+            worker_count = max(1, min(self.concurrency, total))
+            scrapers = [self.meta_scraper] + [
+                MetaTagVideoScraper(self.api_key, cache_path=None)
+                for _ in range(worker_count - 1)
+            ]
+            # キャッシュはスレッド間で共有してよいため、メインのスクレイパーのものを使用
+            for scraper in scrapers[1:]:
+                scraper.detail_cache = self.meta_scraper.detail_cache
+            
+            # 空いているスクレイパーのプール（同時実行数とスクレイパー数が等しいため待ちは発生しない）
+            idle_scrapers = queue.Queue()
+            for scraper in scrapers:
+                idle_scrapers.put(scraper)
+            
+            # 成功した動画は到着順にファイルへ書き出す（途中で停止しても取得済みの結果は残る）
+            self._open_output_files()
+            
+            # API制限を考慮し、平均 REQUEST_INTERVAL 秒に1件のペースに制限
+            bucket = TokenBucket(capacity=worker_count, fill_time_s=self.REQUEST_INTERVAL * worker_count)
+            
+            try:
+                with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                    futures = {
+                        executor.submit(self._fetch_video_details, idle_scrapers, bucket, url): url
+                        for url in target_urls
                     }
                     
-                    self.results['failed_videos'].append(failed_data)
-                    failed_count += 1
-                    
-                    print(f"   ❌ エラー: {e}")
-                    self.logger.error(f"動画処理エラー {url}: {e}")
+                    for i, future in enumerate(as_completed(futures), 1):
+                        url = futures[future]
+                        try:
+                            print(f"\n📹 動画 {i}/{total}: {url}")
+                            
+                            details, processing_time = future.result()
+                            
+                            if details:
+                                # 成功した場合
+                                video_data = {
+                                    'url': url,
+                                    'video_id': details.get('video_id'),
+                                    'author_username': details.get('author_username'),
+                                    'like_count': details.get('like_count'),
+                                    'comment_count': details.get('comment_count'),
+                                    'title': details.get('og_title', ''),
+                                    'description': details.get('description', ''),
+                                    'keywords': details.get('keywords', ''),
+                                    'processing_time': processing_time,
+                                    'timestamp': datetime.now().isoformat()
+                                }
+                                
+                                self._write_processed_video(video_data)
+                                processed_count += 1
+                                
+                                print(f"   ✅ 成功 ({processing_time:.1f}秒)")
+                                print(f"   動画ID: {details.get('video_id')}")
+                                print(f"   作者: @{details.get('author_username')}")
+                                if details.get('like_count'):
+                                    print(f"   いいね数: {details.get('like_count'):,}")
+                                if details.get('comment_count'):
+                                    print(f"   コメント数: {details.get('comment_count'):,}")
+                                
+                            else:
+                                # 失敗した場合
+                                failed_data = {
+                                    'url': url,
+                                    'error': '詳細情報の取得に失敗',
+                                    'processing_time': processing_time,
+                                    'timestamp': datetime.now().isoformat()
+                                }
+                                
+                                self.results['failed_videos'].append(failed_data)
+                                failed_count += 1
+                                
+                                print(f"   ❌ 失敗: 詳細情報の取得に失敗")
+                            
+                            # 進捗表示
+                            success_rate = processed_count / i * 100
+                            print(f"   進捗: {i}/{total} ({success_rate:.1f}%成功)")
+                            
+                        except Exception as e:
+                            # エラーが発生した場合
+                            failed_data = {
+                                'url': url,
+                                'error': str(e),
+                                'processing_time': 0,
+                                'timestamp': datetime.now().isoformat()
+                            }
+                            
+                            self.results['failed_videos'].append(failed_data)
+                            failed_count += 1
+                            
+                            print(f"   ❌ エラー: {e}")
+                            self.logger.error(f"動画処理エラー {url}: {e}")
+            finally:
+                self._close_output_files()
+                
+                # ワーカーの統計をメインのスクレイパーに合算し、追加したセッションを閉じる
+                for scraper in scrapers[1:]:
+                    self.meta_scraper.merge_stats(scraper.stats)
+                    scraper.api_client.close()
             
             # サマリーを生成
             self._generate_summary()
@@ -162,9 +242,82 @@ class ExploreBatchProcessor:
             self.results['error'] = str(e)
             return self.results
     
+    def _fetch_video_details(
+        self,
+        idle_scrapers: "queue.Queue[MetaTagVideoScraper]",
+        bucket: TokenBucket,
+        url: str
+    ) -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        空いているスクレイパーで動画1件の詳細情報を取得（ワーカースレッドで実行）
+        
+        Returns:
+            動画詳細情報（失敗時はNone）と処理時間（秒）のタプル
+        """
+        scraper = idle_scrapers.get()
+        try:
+            # キャッシュ済みの動画はScraperAPIへリクエストしないため、トークンを消費しない
+            # （確認した時点でディスクから読んだエントリはメモリに載るため、取得時の再確認は安価）
+            if scraper.detail_cache is None or scraper.detail_cache.get(url) is None:
+                bucket.acquire()
+            start_time = time.time()
+            details = scraper.get_video_details(url)
+            return details, time.time() - start_time
+        finally:
+            idle_scrapers.put(scraper)
+    
+    def _open_output_files(self):
+        """成功した動画を書き出すJSONL/CSVファイルを開く"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.jsonl_file = f"explore_batch_videos_{timestamp}.jsonl"
+        self.csv_file = f"explore_videos_{timestamp}.csv"
+        self.results['processed_videos_file'] = self.jsonl_file
+        
+        self._jsonl_fh = open(self.jsonl_file, 'wb')
+        self._csv_fh = open(self.csv_file, 'w', newline='', encoding='utf-8')
+        self._csv_writer = csv.DictWriter(
+            self._csv_fh, fieldnames=self.CSV_FIELDNAMES, extrasaction='ignore'
+        )
+        self._csv_writer.writeheader()
+    
+    def _write_processed_video(self, video_data: Dict[str, Any]):
+        """成功した動画を1件書き出し、サマリー用の集計値を更新"""
+        self._jsonl_fh.write(json_io.dumps(video_data) + b'\n')
+        self._jsonl_fh.flush()
+        
+        self._csv_writer.writerow(video_data)
+        self._csv_fh.flush()
+        
+        r = self._running
+        likes = video_data.get('like_count') or 0
+        r['likes'] += likes
+        r['comments'] += video_data.get('comment_count') or 0
+        r['times'] += video_data.get('processing_time') or 0
+        r['n'] += 1
+        author = video_data.get('author_username')
+        if author:
+            r['authors'].add(author)
+        
+        # 同数の場合は先に到着した動画を優先
+        entry = (likes, -r['n'], author)
+        if len(self._top_performers) < self.TOP_PERFORMERS:
+            heapq.heappush(self._top_performers, entry)
+        else:
+            heapq.heappushpop(self._top_performers, entry)
+    
+    def _close_output_files(self):
+        """出力ファイルを閉じる"""
+        for fh in (self._jsonl_fh, self._csv_fh):
+            if fh:
+                fh.close()
+        self._jsonl_fh = None
+        self._csv_fh = None
+        self._csv_writer = None
+    
     def _generate_summary(self):
         """処理結果のサマリーを生成"""
-        total_processed = len(self.results['processed_videos'])
+        r = self._running
+        total_processed = r['n']
         total_failed = len(self.results['failed_videos'])
         total_attempts = total_processed + total_failed
         
@@ -174,15 +327,15 @@ class ExploreBatchProcessor:
             'failed_extractions': total_failed,
             'success_rate': total_processed / total_attempts if total_attempts > 0 else 0,
             'average_processing_time': self._calculate_average_processing_time(),
-            'unique_authors': len(set(video.get('author_username') for video in self.results['processed_videos'] if video.get('author_username'))),
-            'total_likes': sum(video.get('like_count', 0) for video in self.results['processed_videos']),
-            'total_comments': sum(video.get('comment_count', 0) for video in self.results['processed_videos'] if video.get('comment_count'))
+            'unique_authors': len(r['authors']),
+            'total_likes': r['likes'],
+            'total_comments': r['comments']
         }
     
     def _calculate_average_processing_time(self) -> float:
         """平均処理時間を計算"""
-        processing_times = [video.get('processing_time', 0) for video in self.results['processed_videos']]
-        return sum(processing_times) / len(processing_times) if processing_times else 0
+        r = self._running
+        return r['times'] / r['n'] if r['n'] else 0
     
     def _display_results(self):
         """結果を表示"""
@@ -201,29 +354,28 @@ class ExploreBatchProcessor:
         print(f"総いいね数: {summary['total_likes']:,}")
         print(f"総コメント数: {summary['total_comments']:,}")
         
-        if self.results['processed_videos']:
+        if self._top_performers:
             print("\n🏆 トップパフォーマー:")
-            sorted_videos = sorted(
-                self.results['processed_videos'], 
-                key=lambda x: x.get('like_count', 0), 
-                reverse=True
-            )
-            for i, video in enumerate(sorted_videos[:5], 1):
-                author = video.get('author_username', 'Unknown')
-                likes = video.get('like_count', 0)
+            for i, (likes, _, author) in enumerate(sorted(self._top_performers, reverse=True), 1):
                 print(f"{i}. @{author}: {likes:,}いいね")
     
     def save_results(self, filename: str = None) -> str:
-        """結果をJSONファイルに保存"""
+        """
+        結果をJSONファイルに保存
+        
+        成功した動画の詳細はバッチ処理中にJSONLファイルへ書き出し済みのため、
+        ここではサマリー・失敗一覧とJSONLファイル名のみを保存する。
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"explore_batch_results_{timestamp}.json"
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, ensure_ascii=False, indent=2)
+            json_io.dump(self.results, filename)
             
             print(f"\n📄 詳細結果を保存: {filename}")
+            if self.jsonl_file:
+                print(f"📄 動画ごとの結果: {self.jsonl_file}")
             self.logger.info(f"結果保存: {filename}")
             return filename
             
@@ -233,36 +385,25 @@ class ExploreBatchProcessor:
             return ""
     
     def save_csv(self, filename: str = None) -> str:
-        """結果をCSVファイルに保存"""
-        if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"explore_videos_{timestamp}.csv"
+        """
+        結果をCSVファイルに保存
+        
+        CSVはバッチ処理中に1行ずつ書き出し済みのため、ファイル名が指定された場合のみ
+        その名前に変更する。
+        """
+        if not self.csv_file:
+            print("❌ CSV保存エラー: バッチ処理が実行されていません")
+            self.logger.error("CSV保存エラー: バッチ処理が実行されていません")
+            return ""
         
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'video_id', 'author_username', 'like_count', 'comment_count', 
-                    'title', 'description', 'keywords', 'url', 'processing_time'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for video in self.results['processed_videos']:
-                    writer.writerow({
-                        'video_id': video.get('video_id', ''),
-                        'author_username': video.get('author_username', ''),
-                        'like_count': video.get('like_count', 0),
-                        'comment_count': video.get('comment_count', 0),
-                        'title': video.get('title', ''),
-                        'description': video.get('description', ''),
-                        'keywords': video.get('keywords', ''),
-                        'url': video.get('url', ''),
-                        'processing_time': video.get('processing_time', 0)
-                    })
+            if filename and filename != self.csv_file:
+                os.replace(self.csv_file, filename)
+                self.csv_file = filename
             
-            print(f"📊 CSV出力完了: {filename}")
-            self.logger.info(f"CSV保存: {filename}")
-            return filename
+            print(f"📊 CSV出力完了: {self.csv_file}")
+            self.logger.info(f"CSV保存: {self.csv_file}")
+            return self.csv_file
             
         except Exception as e:
             print(f"❌ CSV保存エラー: {e}")
@@ -6,21 +6,39 @@ Final System Test for TikTok Research System
 
 import os
 import sys
-import json
 import time
 import csv
+import queue
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from unittest import mock
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.scraper.exceptions import APIError
+from src.utils import json_io
 from src.utils.logger import get_logger
 from meta_tag_video_scraper import MetaTagVideoScraper
 
+# 結果ファイルの書き込みバッファサイズ
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# データ品質評価で完全性を確認するフィールド
+QUALITY_FIELDS = ('video_id', 'like_count', 'comment_count', 'author_username', 'og_title')
+
+# 信頼性テストで一貫性を確認するフィールド
+CONSISTENCY_FIELDS = ('video_id', 'like_count', 'comment_count', 'author_username')
+
 
 class FinalSystemTest:
     """最終システムテストクラス"""
     
+    # 複数動画を取得する際の最大同時実行数
+    MAX_CONCURRENCY = 4
+    
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
         
@@ -30,7 +48,14 @@ class FinalSystemTest:
             raise ValueError("SCRAPERAPI_KEY環境変数が設定されていません")
         
         # メタタグスクレイパーを初期化
-        self.meta_scraper = MetaTagVideoScraper(self.api_key)
+        # キャッシュは実行ごとの一時ディレクトリに置き、前回の実行結果でAPIを呼ばずに合格しないようにする
+        self._cache_dir = tempfile.TemporaryDirectory(prefix='final_system_test_')
+        self.meta_scraper = MetaTagVideoScraper(
+            self.api_key,
+            cache_path=os.path.join(self._cache_dir.name, 'meta_video_details.db')
+        )
+        # 並行実行するテストからメインのスクレイパーへ統計情報を合算する際のロック
+        self._stats_lock = threading.Lock()
         
         # テスト結果
         self.test_results = {
@@ -50,15 +75,29 @@ class FinalSystemTest:
             basic_result = self._test_basic_functionality()
             self.test_results['tests'].append(basic_result)
             
-            # テスト2: 実用性テスト
-            self.logger.info("テスト2: 実用性テスト")
-            practical_result = self._test_practical_usage()
-            self.test_results['tests'].append(practical_result)
-            
-            # テスト3: 信頼性テスト
-            self.logger.info("テスト3: 信頼性テスト")
-            reliability_result = self._test_reliability()
-            self.test_results['tests'].append(reliability_result)
+            # 基本機能が動作しない場合、以降のテストは同じ原因で失敗するためAPIを呼ばずに打ち切る
+            if not basic_result['success']:
+                self.logger.warning("基本機能テストが失敗したため、以降のテストをスキップ")
+                for test_name in ('practical_usage', 'reliability'):
+                    self.test_results['tests'].append({
+                        'test_name': test_name,
+                        'success': False,
+                        'skipped': True,
+                        'reason': 'basic_functionality failed'
+                    })
+                
+                self._generate_final_evaluation()
+                self.test_results['end_time'] = datetime.now().isoformat()
+                return self.test_results
+            
+            # テスト2・3: 実用性テストと信頼性テスト（互いに独立しているため並行して実行）
+            self.logger.info("テスト2: 実用性テスト / テスト3: 信頼性テスト（並行実行）")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                practical_future = executor.submit(self._test_practical_usage)
+                reliability_future = executor.submit(self._test_reliability)
+                
+                self.test_results['tests'].append(practical_future.result())
+                self.test_results['tests'].append(reliability_future.result())
             
             # 最終評価を生成
             self._generate_final_evaluation()
@@ -72,6 +111,10 @@ class FinalSystemTest:
             self.logger.error(f"最終テスト実行エラー: {e}")
             self.test_results['error'] = str(e)
             return self.test_results
+        
+        finally:
+            # 実行ごとのキャッシュを削除
+            self._cache_dir.cleanup()
     
     def _get_system_info(self) -> Dict[str, Any]:
         """システム情報を取得"""
@@ -85,9 +128,9 @@ class FinalSystemTest:
     
     def _test_basic_functionality(self) -> Dict[str, Any]:
         """基本機能確認テスト"""
+        started = time.perf_counter()
         test_result = {
             'test_name': 'basic_functionality',
-            'start_time': datetime.now().isoformat(),
             'success': False,
             'features_tested': [],
             'error': None
@@ -126,12 +169,9 @@ class FinalSystemTest:
                 })
             
             # 機能3: エラーハンドリング
-            invalid_url = "https://www.tiktok.com/invalid/test"
-            invalid_details = self.meta_scraper.get_video_details(invalid_url)
-            
             features.append({
                 'feature': 'error_handling',
-                'success': invalid_details is None,
+                'success': self._probe_error_handling(),
                 'handled_gracefully': True
             })
             
@@ -144,14 +184,32 @@ class FinalSystemTest:
             test_result['error'] = str(e)
             self.logger.error(f"基本機能テストエラー: {e}")
         
-        test_result['end_time'] = datetime.now().isoformat()
+        test_result['elapsed'] = time.perf_counter() - started
         return test_result
     
+    def _probe_error_handling(self) -> bool:
+        """
+        存在しない動画の取得が失敗として処理される（Noneを返す）かを確認
+        
+        確認したいのはスクレイパー側のエラー処理のため、ScraperAPIへはリクエストせず、
+        404エラーを返すよう差し替えたクライアントで1回だけ取得を試みる。統計情報に
+        含めないよう、メインのスクレイパーとは別のインスタンスを使用する。
+        """
+        invalid_url = "https://www.tiktok.com/invalid/test"
+        probe_scraper = MetaTagVideoScraper(self.api_key, cache_path=None)
+        not_found = APIError("APIエラー: 404 Not Found", status_code=404)
+        
+        try:
+            with mock.patch.object(probe_scraper.api_client, 'scrape', side_effect=not_found):
+                return probe_scraper.get_video_details(invalid_url, max_retries=1) is None
+        finally:
+            probe_scraper.api_client.close()
+    
     def _test_practical_usage(self) -> Dict[str, Any]:
         """実用性テスト"""
+        started = time.perf_counter()
         test_result = {
             'test_name': 'practical_usage',
-            'start_time': datetime.now().isoformat(),
             'success': False,
             'scenarios': [],
             'error': None
@@ -166,16 +224,11 @@ class FinalSystemTest:
                 "https://www.tiktok.com/@ohnoitsrolo/video/7534370912854985997",
             ]
             
-            start_time = time.time()
-            batch_results = []
-            
-            for url in test_urls:
-                details = self.meta_scraper.get_video_details(url)
-                if details:
-                    batch_results.append(details)
-                time.sleep(1)  # 短い間隔でテスト
-            
-            end_time = time.time()
+            batch_started = time.perf_counter()
+            batch_results = [
+                details for details, _ in self._fetch_concurrently(test_urls) if details
+            ]
+            processing_time = time.perf_counter() - batch_started
             
             scenarios.append({
                 'scenario': 'batch_processing',
@@ -183,8 +236,8 @@ class FinalSystemTest:
                 'processed_count': len(batch_results),
                 'total_urls': len(test_urls),
                 'success_rate': len(batch_results) / len(test_urls),
-                'processing_time': end_time - start_time,
-                'average_time_per_video': (end_time - start_time) / len(test_urls)
+                'processing_time': processing_time,
+                'average_time_per_video': processing_time / len(test_urls)
             })
             
             # シナリオ2: データ品質評価
@@ -213,14 +266,14 @@ class FinalSystemTest:
             test_result['error'] = str(e)
             self.logger.error(f"実用性テストエラー: {e}")
         
-        test_result['end_time'] = datetime.now().isoformat()
+        test_result['elapsed'] = time.perf_counter() - started
         return test_result
     
     def _test_reliability(self) -> Dict[str, Any]:
         """信頼性テスト"""
+        started = time.perf_counter()
         test_result = {
             'test_name': 'reliability',
-            'start_time': datetime.now().isoformat(),
             'success': False,
             'reliability_metrics': {},
             'error': None
@@ -229,16 +282,17 @@ class FinalSystemTest:
         try:
             test_url = "https://www.tiktok.com/@_quietlydope/video/7535094688726945079"
             
-            # 複数回実行して一貫性を確認
+            # 複数回実行して一貫性を確認（各回は独立しているため並行して取得）
+            # 1回目は基本機能テストで取得済みの結果を使用し、2回目以降は実際に再取得して比較
+            # （キャッシュから返る1回目は取得時間の計測から除外）
             results = []
             execution_times = []
             
-            for i in range(3):
-                start_time = time.time()
-                details = self.meta_scraper.get_video_details(test_url)
-                end_time = time.time()
-                
-                execution_times.append(end_time - start_time)
+            use_cache = [True, False, False]
+            samples = self._fetch_concurrently([test_url] * 3, use_cache=use_cache)
+            for (details, execution_time), from_cache in zip(samples, use_cache):
+                if not from_cache:
+                    execution_times.append(execution_time)
                 
                 if details:
                     results.append({
@@ -247,22 +301,20 @@ class FinalSystemTest:
                         'comment_count': details.get('comment_count'),
                         'author_username': details.get('author_username')
                     })
-                
-                if i < 2:  # 最後以外は待機
-                    time.sleep(2)
             
             # 一貫性チェック
             consistency_score = self._check_consistency(results)
             
             # 信頼性メトリクス
+            execution_time_range = max(execution_times) - min(execution_times)
             reliability_metrics = {
                 'total_attempts': 3,
                 'successful_attempts': len(results),
                 'success_rate': len(results) / 3,
                 'consistency_score': consistency_score,
                 'average_execution_time': sum(execution_times) / len(execution_times),
-                'execution_time_variance': max(execution_times) - min(execution_times),
-                'stable_performance': (max(execution_times) - min(execution_times)) < 30  # 30秒以内の差
+                'execution_time_variance': execution_time_range,
+                'stable_performance': execution_time_range < 30  # 30秒以内の差
             }
             
             test_result['success'] = (
@@ -277,9 +329,61 @@ class FinalSystemTest:
             test_result['error'] = str(e)
             self.logger.error(f"信頼性テストエラー: {e}")
         
-        test_result['end_time'] = datetime.now().isoformat()
+        test_result['elapsed'] = time.perf_counter() - started
         return test_result
     
+    def _fetch_concurrently(
+        self,
+        urls: List[str],
+        use_cache: Optional[List[bool]] = None
+    ) -> List[Tuple[Optional[Dict[str, Any]], float]]:
+        """
+        複数の動画の詳細情報を並行して取得
+        
+        取得時間の大半はScraperAPIの応答待ちのため、MAX_CONCURRENCY 件までスレッドで
+        重ねて実行する。スクレイパーはスレッド間で共有できないためワーカーごとに用意し
+        （キャッシュはメインのスクレイパーのものを共有）、終了後に統計情報をメインの
+        スクレイパーに合算する。複数のテストから同時に呼び出してよい。
+        テスト間で同じ動画を取得する場合は、既定でキャッシュ済みの結果を再利用する。
+        
+        Args:
+            urls: 動画URLのリスト
+            use_cache: URLごとにキャッシュ済みの結果を使用するか（省略時はすべて使用）
+        
+        Returns:
+            URLと同じ順序の (動画詳細情報（失敗時はNone）, 取得時間（秒）) のリスト
+        """
+        worker_count = max(1, min(self.MAX_CONCURRENCY, len(urls)))
+        scrapers = [
+            MetaTagVideoScraper(self.api_key, cache_path=None)
+            for _ in range(worker_count)
+        ]
+        for scraper in scrapers:
+            scraper.detail_cache = self.meta_scraper.detail_cache
+        
+        idle_scrapers = queue.Queue()
+        for scraper in scrapers:
+            idle_scrapers.put(scraper)
+        
+        def fetch(url: str, url_use_cache: bool) -> Tuple[Optional[Dict[str, Any]], float]:
+            scraper = idle_scrapers.get()
+            try:
+                started = time.perf_counter()
+                details = scraper.get_video_details(url, use_cache=url_use_cache)
+                return details, time.perf_counter() - started
+            finally:
+                idle_scrapers.put(scraper)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                return list(executor.map(fetch, urls, use_cache or [True] * len(urls)))
+        finally:
+            # ワーカーの統計をメインのスクレイパーに合算し、ワーカーのセッションを閉じる
+            for scraper in scrapers:
+                with self._stats_lock:
+                    self.meta_scraper.merge_stats(scraper.stats)
+                scraper.api_client.close()
+    
     def _evaluate_data_quality(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """データ品質を評価"""
         if not results:
@@ -292,19 +396,32 @@ class FinalSystemTest:
             'overall_score': 0
         }
         
-        # 完全性スコア
-        fields = ['video_id', 'like_count', 'comment_count', 'author_username', 'og_title']
-        for field in fields:
-            present_count = sum(1 for r in results if r.get(field))
-            quality_metrics['completeness_scores'][field] = present_count / len(results)
-        
-        # 精度指標
-        like_counts = [r.get('like_count', 0) for r in results if r.get('like_count')]
-        comment_counts = [r.get('comment_count', 0) for r in results if r.get('comment_count')]
+        # 完全性スコアと精度指標を結果の1回の走査で集計
+        present_counts = dict.fromkeys(QUALITY_FIELDS, 0)
+        reasonable_like_count = 0
+        reasonable_comment_count = 0
+        
+        for r in results:
+            get = r.get
+            for field in QUALITY_FIELDS:
+                if get(field):
+                    present_counts[field] += 1
+            
+            like_count = get('like_count')
+            if like_count and like_count > 1000:
+                reasonable_like_count += 1
+            comment_count = get('comment_count')
+            if comment_count and comment_count > 100:
+                reasonable_comment_count += 1
+        
+        quality_metrics['completeness_scores'] = {
+            field: present_counts[field] / len(results) for field in QUALITY_FIELDS
+        }
         
+        # 精度指標（いいね数・コメント数が取得できた動画のうち妥当な値の割合）
         quality_metrics['accuracy_indicators'] = {
-            'reasonable_like_counts': sum(1 for c in like_counts if c > 1000) / max(len(like_counts), 1),
-            'reasonable_comment_counts': sum(1 for c in comment_counts if c > 100) / max(len(comment_counts), 1),
+            'reasonable_like_counts': reasonable_like_count / max(present_counts['like_count'], 1),
+            'reasonable_comment_counts': reasonable_comment_count / max(present_counts['comment_count'], 1),
             'like_comment_ratio_reasonable': True  # 簡略化
         }
         
@@ -324,14 +441,23 @@ class FinalSystemTest:
         consistent_fields = 0
         total_fields = 0
         
-        fields_to_check = ['video_id', 'like_count', 'comment_count', 'author_username']
-        
-        for field in fields_to_check:
-            values = [r.get(field) for r in results if r.get(field) is not None]
-            if values:
+        for field in CONSISTENCY_FIELDS:
+            # 全て同じ値（文字列として比較）かチェックし、異なる値が見つかった時点で打ち切る
+            first_value = None
+            consistent = True
+            for r in results:
+                value = r.get(field)
+                if value is None:
+                    continue
+                if first_value is None:
+                    first_value = str(value)
+                elif str(value) != first_value:
+                    consistent = False
+                    break
+            
+            if first_value is not None:
                 total_fields += 1
-                # 全て同じ値かチェック
-                if len(set(str(v) for v in values)) == 1:
+                if consistent:
                     consistent_fields += 1
         
         return consistent_fields / total_fields if total_fields > 0 else 1.0
@@ -344,20 +470,19 @@ class FinalSystemTest:
             
             filename = 'final_test_results.csv'
             
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as csvfile:
                 fieldnames = ['video_id', 'author_username', 'like_count', 'comment_count', 'title', 'url']
                 writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
                 
                 writer.writeheader()
-                for result in results:
-                    writer.writerow({
-                        'video_id': result.get('video_id', ''),
-                        'author_username': result.get('author_username', ''),
-                        'like_count': result.get('like_count', 0),
-                        'comment_count': result.get('comment_count', 0),
-                        'title': result.get('og_title', ''),
-                        'url': result.get('url', '')
-                    })
+                writer.writerows({
+                    'video_id': result.get('video_id', ''),
+                    'author_username': result.get('author_username', ''),
+                    'like_count': result.get('like_count', 0),
+                    'comment_count': result.get('comment_count', 0),
+                    'title': result.get('og_title', ''),
+                    'url': result.get('url', '')
+                } for result in results)
             
             self.logger.info(f"CSV出力成功: {filename}")
             return True
@@ -368,8 +493,10 @@ class FinalSystemTest:
     
     def _generate_final_evaluation(self):
         """最終評価を生成"""
-        total_tests = len(self.test_results['tests'])
-        successful_tests = sum(1 for test in self.test_results['tests'] if test['success'])
+        # スキップしたテストは成功率の計算に含めない
+        executed_tests = [test for test in self.test_results['tests'] if not test.get('skipped')]
+        total_tests = len(executed_tests)
+        successful_tests = sum(1 for test in executed_tests if test['success'])
         
         # スクレイパー統計を取得
         scraper_stats = self.meta_scraper.get_stats()
@@ -407,8 +534,8 @@ class FinalSystemTest:
             filename = f"final_system_test_report_{timestamp}.json"
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.test_results, f, ensure_ascii=False, indent=2)
+            # レポート全体を1つのバイト列にシリアライズして1回で書き込む
+            json_io.dump(self.test_results, filename)
             
             self.logger.info(f"最終レポートを保存: {filename}")
             return filename
@@ -457,6 +584,9 @@ def main():
         # 個別テスト結果
         print("\n📋 個別テスト結果:")
         for test in results['tests']:
+            if test.get('skipped'):
+                print(f"⏭️ SKIP {test['test_name']} ({test['reason']})")
+                continue
             status = "✅ PASS" if test['success'] else "❌ FAIL"
             print(f"{status} {test['test_name']}")
             if test.get('error'):
@@ -10,26 +10,111 @@ import re
 import json
 import time
 import random
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from bs4 import BeautifulSoup
 
+# lxml（C実装）が利用可能なら、HTMLの解析と必要な要素の収集をlxmlで行う
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from src.scraper.scraperapi_client import ScraperAPIClient
+from src.storage.detail_cache import VideoDetailCache
 from src.utils.logger import get_logger
 from src.parser.video_data import VideoData
 
+# カウント文字列の単位と倍率（1.2K, 3.4M など）
+COUNT_SUFFIX_MULTIPLIERS = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+# カウント文字列から桁区切りと空白を1回の変換で除去する変換表
+COUNT_STRIP_TABLE = str.maketrans('', '', ', ')
+
+# キーがない場合の既定値として共有する空の辞書（読み取り専用として扱うこと）
+_EMPTY = {}
+
+# 詳細情報の抽出に使用する要素
+PAGE_METADATA_TAGS = ('meta', 'title', 'script')
+JSON_LD_SCRIPT_TYPE = 'application/ld+json'
+
+
+@dataclass
+class PageMetadata:
+    """動画ページのHTMLから一度の走査で収集した、詳細情報の抽出に使用する値"""
+    meta_by_property: Dict[str, Optional[str]] = field(default_factory=dict)  # property属性ごとの最初のmetaタグのcontent
+    meta_by_name: Dict[str, Optional[str]] = field(default_factory=dict)  # name属性ごとの最初のmetaタグのcontent
+    title: Optional[str] = None  # 最初のtitleタグのテキスト（子要素を含む場合はNone）
+    json_ld_texts: List[str] = field(default_factory=list)  # JSON-LDのscriptタグのテキスト
+
+
+def collect_page_metadata(html_content: str) -> PageMetadata:
+    """
+    HTMLを解析し、meta・title・JSON-LDのscriptタグを文書順に一度だけ走査して収集
+    
+    lxmlが利用可能ならlxmlで解析し（エンコーディング宣言付きのXML文書など
+    lxmlが文字列として受け付けない場合を除く）、なければBeautifulSoupで解析する。
+    """
+    page = PageMetadata()
+    title_found = False  # 2つ目以降のtitleタグは使用しない
+    
+    root = None
+    use_lxml = etree is not None
+    if use_lxml:
+        try:
+            root = etree.HTML(html_content)
+        except ValueError:
+            use_lxml = False
+    
+    if use_lxml:
+        for element in (root.iter(*PAGE_METADATA_TAGS) if root is not None else ()):
+            tag = element.tag
+            if tag == 'meta':
+                page.meta_by_property.setdefault(element.get('property'), element.get('content'))
+                page.meta_by_name.setdefault(element.get('name'), element.get('content'))
+            elif tag == 'title':
+                if not title_found and len(element) == 0:
+                    page.title = element.text
+                title_found = True
+            elif element.get('type') == JSON_LD_SCRIPT_TYPE and element.text:
+                page.json_ld_texts.append(element.text)
+    else:
+        soup = BeautifulSoup(html_content, 'html.parser')
+        for element in soup.find_all(PAGE_METADATA_TAGS):
+            if element.name == 'meta':
+                page.meta_by_property.setdefault(element.get('property'), element.get('content'))
+                page.meta_by_name.setdefault(element.get('name'), element.get('content'))
+            elif element.name == 'title':
+                if not title_found:
+                    page.title = element.string
+                title_found = True
+            elif element.get('type') == JSON_LD_SCRIPT_TYPE and element.string:
+                page.json_ld_texts.append(element.string)
+    
+    return page
+
 
 class MetaTagVideoScraper:
     """メタタグベースの動画詳細スクレイパー"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_path: Optional[str] = None, cache_ttl: float = 3600.0):
+        """
+        Args:
+            api_key: ScraperAPI キー
+            cache_path: 取得した詳細情報のキャッシュファイルのパス（省略時はキャッシュしない）
+            cache_ttl: キャッシュの有効期間（秒）
+        """
         self.logger = get_logger(self.__class__.__name__)
         self.api_client = ScraperAPIClient(api_key)
+        self.detail_cache = VideoDetailCache(cache_path, cache_ttl) if cache_path else None
         
         # 統計情報
         self.stats = {
+            'cache_hits': 0,
+            'cache_misses': 0,
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
@@ -40,23 +125,37 @@ class MetaTagVideoScraper:
             'comment_count_extracted': 0,
             'author_extracted': 0
         }
+        # get_stats の結果（統計情報が更新されるまで使い回す）
+        self._stats_cache = None
+        self._stats_dirty = True
     
-    def get_video_details(self, video_url: str, max_retries: int = 3) -> Optional[Dict[str, Any]]:
+    def get_video_details(self, video_url: str, max_retries: int = 3,
+                          use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         個別動画ページから詳細情報を取得（メタタグベース）
         
         Args:
             video_url: 動画URL
             max_retries: 最大リトライ回数
+            use_cache: キャッシュ済みの詳細情報を使用するか（Falseでも取得結果はキャッシュを更新）
             
         Returns:
             動画詳細情報の辞書、失敗時はNone
         """
         self.logger.info(f"動画詳細情報を取得: {video_url}")
         
+        # 最近取得済みの動画はScraperAPIへのリクエストとHTMLの解析を省略
+        if self.detail_cache and use_cache:
+            cached_details = self.detail_cache.get(video_url)
+            if cached_details is not None:
+                self._bump('cache_hits')
+                self.logger.info(f"キャッシュから詳細情報を取得: {video_url}")
+                return cached_details
+            self._bump('cache_misses')
+        
         for attempt in range(max_retries):
             try:
-                self.stats['total_requests'] += 1
+                self._bump('total_requests')
                 
                 # JavaScript実行ありでスクレイピング
                 response = self.api_client.scrape(
@@ -73,8 +172,10 @@ class MetaTagVideoScraper:
                         details = self._extract_video_details_from_meta(html_content, video_url)
                         
                         if details:
-                            self.stats['successful_requests'] += 1
-                            self.stats['videos_with_details'] += 1
+                            self._bump('successful_requests')
+                            self._bump('videos_with_details')
+                            if self.detail_cache:
+                                self.detail_cache.set(video_url, details)
                             self.logger.info(f"詳細情報取得成功: {video_url}")
                             return details
                         else:
@@ -97,7 +198,7 @@ class MetaTagVideoScraper:
                     wait_time = random.uniform(10, 20)
                     time.sleep(wait_time)
         
-        self.stats['failed_requests'] += 1
+        self._bump('failed_requests')
         self.logger.error(f"動画詳細取得失敗: {video_url}")
         return None
     
@@ -113,7 +214,7 @@ class MetaTagVideoScraper:
             動画詳細情報の辞書
         """
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            page = collect_page_metadata(html_content)
             details = {}
             
             # 動画IDを抽出
@@ -122,19 +223,19 @@ class MetaTagVideoScraper:
                 details['video_id'] = video_id_match.group(1)
             
             # メタタグから基本情報を抽出
-            meta_info = self._extract_meta_tags(soup)
+            meta_info = self._extract_meta_tags(page)
             details.update(meta_info)
             
             # descriptionメタタグから統計情報を抽出
-            stats_info = self._extract_stats_from_description(soup)
+            stats_info = self._extract_stats_from_description(page)
             details.update(stats_info)
             
             # keywordsメタタグから追加情報を抽出
-            keywords_info = self._extract_keywords(soup)
+            keywords_info = self._extract_keywords(page)
             details.update(keywords_info)
             
             # JSON-LDから補完情報を抽出
-            json_ld_info = self._extract_json_ld(soup)
+            json_ld_info = self._extract_json_ld(page)
             details.update(json_ld_info)
             
             # 基本情報の補完
@@ -144,15 +245,15 @@ class MetaTagVideoScraper:
             
             # 統計更新
             if details.get('like_count'):
-                self.stats['like_count_extracted'] += 1
+                self._bump('like_count_extracted')
             if details.get('comment_count'):
-                self.stats['comment_count_extracted'] += 1
+                self._bump('comment_count_extracted')
             if details.get('view_count'):
-                self.stats['view_count_extracted'] += 1
+                self._bump('view_count_extracted')
             if details.get('author_username'):
-                self.stats['author_extracted'] += 1
+                self._bump('author_extracted')
             
-            self.stats['meta_tag_extractions'] += 1
+            self._bump('meta_tag_extractions')
             
             # 詳細情報が取得できたかチェック
             has_details = any([
@@ -173,7 +274,7 @@ class MetaTagVideoScraper:
             self.logger.error(f"詳細情報抽出エラー: {e}")
             return None
     
-    def _extract_meta_tags(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_meta_tags(self, page: PageMetadata) -> Dict[str, Any]:
         """メタタグから基本情報を抽出"""
         details = {}
         
@@ -187,9 +288,9 @@ class MetaTagVideoScraper:
             }
             
             for og_property, detail_key in og_tags.items():
-                meta_tag = soup.find('meta', property=og_property)
-                if meta_tag and meta_tag.get('content'):
-                    details[detail_key] = meta_tag['content']
+                content = page.meta_by_property.get(og_property)
+                if content:
+                    details[detail_key] = content
             
             # Twitterカードメタタグ
             twitter_tags = {
@@ -199,9 +300,9 @@ class MetaTagVideoScraper:
             }
             
             for twitter_name, detail_key in twitter_tags.items():
-                meta_tag = soup.find('meta', attrs={'name': twitter_name})
-                if meta_tag and meta_tag.get('content'):
-                    details[detail_key] = meta_tag['content']
+                content = page.meta_by_name.get(twitter_name)
+                if content:
+                    details[detail_key] = content
             
             # 基本メタタグ
             basic_tags = {
@@ -210,31 +311,29 @@ class MetaTagVideoScraper:
             }
             
             for meta_name, detail_key in basic_tags.items():
-                meta_tag = soup.find('meta', attrs={'name': meta_name})
-                if meta_tag and meta_tag.get('content'):
-                    details[detail_key] = meta_tag['content']
+                content = page.meta_by_name.get(meta_name)
+                if content:
+                    details[detail_key] = content
             
             # タイトルタグ
-            title_tag = soup.find('title')
-            if title_tag and title_tag.string:
-                details['page_title'] = title_tag.string.strip()
+            if page.title:
+                details['page_title'] = page.title.strip()
         
         except Exception as e:
             self.logger.warning(f"メタタグ抽出エラー: {e}")
         
         return details
     
-    def _extract_stats_from_description(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_stats_from_description(self, page: PageMetadata) -> Dict[str, Any]:
         """descriptionメタタグから統計情報を抽出"""
         details = {}
         
         try:
             # descriptionメタタグを取得
-            desc_tag = soup.find('meta', attrs={'name': 'description'})
-            if not desc_tag or not desc_tag.get('content'):
+            description = page.meta_by_name.get('description')
+            if not description:
                 return details
             
-            description = desc_tag['content']
             self.logger.debug(f"Description内容: {description}")
             
             # 日本語の統計情報パターン
@@ -309,14 +408,13 @@ class MetaTagVideoScraper:
         
         return details
     
-    def _extract_keywords(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_keywords(self, page: PageMetadata) -> Dict[str, Any]:
         """keywordsメタタグから情報を抽出"""
         details = {}
         
         try:
-            keywords_tag = soup.find('meta', attrs={'name': 'keywords'})
-            if keywords_tag and keywords_tag.get('content'):
-                keywords = keywords_tag['content']
+            keywords = page.meta_by_name.get('keywords')
+            if keywords:
                 details['keywords'] = [k.strip() for k in keywords.split(',') if k.strip()]
                 self.logger.debug(f"キーワード抽出: {details['keywords']}")
         
@@ -325,17 +423,15 @@ class MetaTagVideoScraper:
         
         return details
     
-    def _extract_json_ld(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_json_ld(self, page: PageMetadata) -> Dict[str, Any]:
         """JSON-LD構造化データから補完情報を抽出"""
         details = {}
         
         try:
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            
-            for script in json_ld_scripts:
-                if script.string:
+            for script_text in page.json_ld_texts:
+                if script_text:
                     try:
-                        data = json.loads(script.string)
+                        data = json.loads(script_text)
                         
                         if isinstance(data, dict) and data.get('@type') == 'VideoObject':
                             if 'name' in data:
@@ -350,7 +446,7 @@ class MetaTagVideoScraper:
                             # インタラクション統計
                             if 'interactionStatistic' in data:
                                 for stat in data['interactionStatistic']:
-                                    interaction_type = stat.get('interactionType', {}).get('@type', '')
+                                    interaction_type = stat.get('interactionType', _EMPTY).get('@type', '')
                                     count = stat.get('userInteractionCount')
                                     
                                     if interaction_type == 'LikeAction' and count:
@@ -373,16 +469,12 @@ class MetaTagVideoScraper:
     def _parse_count_string(self, count_str: str) -> Optional[int]:
         """カウント文字列を数値に変換"""
         try:
-            count_str = count_str.upper().strip().replace(',', '').replace(' ', '')
+            count_str = count_str.translate(COUNT_STRIP_TABLE).strip().upper()
             
-            if count_str.endswith('K'):
-                return int(float(count_str[:-1]) * 1000)
-            elif count_str.endswith('M'):
-                return int(float(count_str[:-1]) * 1000000)
-            elif count_str.endswith('B'):
-                return int(float(count_str[:-1]) * 1000000000)
-            else:
-                return int(float(count_str))
+            multiplier = COUNT_SUFFIX_MULTIPLIERS.get(count_str[-1:])
+            if multiplier:
+                return int(float(count_str[:-1]) * multiplier)
+            return int(float(count_str))
                 
         except (ValueError, TypeError):
             return None
@@ -417,15 +509,40 @@ class MetaTagVideoScraper:
         
         return results
     
+    def _bump(self, name: str, count: int = 1):
+        """統計情報のカウンターを加算"""
+        self.stats[name] += count
+        self._stats_dirty = True
+    
+    def merge_stats(self, stats: Dict[str, int]):
+        """
+        他のスクレイパーの統計情報を合算
+        
+        Args:
+            stats: 合算する統計情報（他のインスタンスの stats）
+        """
+        for name, count in stats.items():
+            self._bump(name, count)
+    
     def get_stats(self) -> Dict[str, Any]:
-        """統計情報を取得"""
-        return {
+        """
+        統計情報を取得
+        
+        前回の呼び出しから統計情報が更新されていなければ同じ辞書を返すため、
+        呼び出し側で変更しないこと。
+        """
+        if not self._stats_dirty:
+            return self._stats_cache
+        
+        self._stats_cache = {
             **self.stats,
             'success_rate': self.stats['successful_requests'] / max(self.stats['total_requests'], 1),
             'like_count_extraction_rate': self.stats['like_count_extracted'] / max(self.stats['videos_with_details'], 1),
             'comment_count_extraction_rate': self.stats['comment_count_extracted'] / max(self.stats['videos_with_details'], 1),
             'author_extraction_rate': self.stats['author_extracted'] / max(self.stats['videos_with_details'], 1)
         }
+        self._stats_dirty = False
+        return self._stats_cache
 
 
 def test_meta_tag_scraper():
@@ -15,6 +15,12 @@ from .video_data import VideoData
 class EnhancedTikTokParser:
     """成功した抽出ロジックを統合した改良版TikTokパーサー"""
     
+    # 動画データの特徴的なキー / 動画リストを格納している可能性があるキー
+    _VIDEO_ITEM_KEYS = frozenset({'id', 'aweme_id', 'video_id', 'desc', 'author', 'stats'})
+    _INITIAL_STATE_LIST_KEYS = frozenset({'itemList', 'items', 'videoList', 'videos', 'data', 'list'})
+    _SCRIPT_DATA_LIST_KEYS = frozenset({'itemList', 'items', 'videoList', 'videos', 'data'})
+    _VIDEO_ID_KEYS = frozenset({'aweme_id', 'video_id', 'id'})
+    
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
     
@@ -207,7 +213,7 @@ class EnhancedTikTokParser:
             def search_video_data(obj, path=""):
                 if isinstance(obj, dict):
                     for key, value in obj.items():
-                        if key in ['itemList', 'items', 'videoList', 'videos', 'data', 'list']:
+                        if key in self._INITIAL_STATE_LIST_KEYS:
                             if isinstance(value, list):
                                 for item in value:
                                     if self._is_video_item(item):
@@ -216,7 +222,7 @@ class EnhancedTikTokParser:
                                             videos.append(video_data)
                             else:
                                 search_video_data(value, f"{path}.{key}")
-                        elif key in ['aweme_id', 'video_id', 'id'] and isinstance(value, (str, int)):
+                        elif key in self._VIDEO_ID_KEYS and isinstance(value, (str, int)):
                             if str(value).isdigit():
                                 videos.append({
                                     'video_id': str(value),
@@ -244,7 +250,7 @@ class EnhancedTikTokParser:
             def search_video_data(obj, path=""):
                 if isinstance(obj, dict):
                     for key, value in obj.items():
-                        if key in ['itemList', 'items', 'videoList', 'videos', 'data']:
+                        if key in self._SCRIPT_DATA_LIST_KEYS:
                             if isinstance(value, list):
                                 for item in value:
                                     if self._is_video_item(item):
@@ -271,8 +277,7 @@ class EnhancedTikTokParser:
         if not isinstance(item, dict):
             return False
         
-        video_keys = ['id', 'aweme_id', 'video_id', 'desc', 'author', 'stats']
-        return any(key in item for key in video_keys)
+        return not self._VIDEO_ITEM_KEYS.isdisjoint(item)
     
     def _extract_video_from_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """動画アイテムから動画データを抽出"""
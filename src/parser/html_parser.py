@@ -4,6 +4,9 @@ HTML parser for TikTok Research System
 
 import re
 import json
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin, urlparse
@@ -12,12 +15,29 @@ from ..utils.logger import get_logger
 from ..utils.helpers import clean_text, parse_view_count, parse_upload_date
 from ..scraper.exceptions import ParseError
 
+# lxml（C実装）が利用可能なら優先し、なければ標準のhtml.parserを使用
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 
 class HTMLParser:
     """HTML解析クラス"""
     
-    def __init__(self):
+    def __init__(self, soup_cache_size: int = 0):
+        """
+        Args:
+            soup_cache_size: 解析済みツリーを保持する最大件数（0でキャッシュしない）。
+                同じページを繰り返し解析するデバッグ用途でのみ指定する
+        """
         self.logger = get_logger(self.__class__.__name__)
+        
+        # HTMLのダイジェスト -> BeautifulSoup（最大件数を超えたら古い順に破棄）
+        self.soup_cache_size = soup_cache_size
+        self._soup_cache: "OrderedDict[bytes, BeautifulSoup]" = OrderedDict()
+        self._soup_cache_lock = threading.Lock()
     
     def parse_html(self, html_content: str, base_url: str = "") -> BeautifulSoup:
         """
@@ -28,15 +48,39 @@ class HTMLParser:
             base_url: ベースURL
             
         Returns:
-            BeautifulSoupオブジェクト
+            BeautifulSoupオブジェクト（キャッシュ有効時は同一内容のHTMLで共有されるため変更しないこと）
         """
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            return soup
+            if self.soup_cache_size <= 0:
+                return BeautifulSoup(html_content, HTML_PARSER)
+            return self._get_cached_soup(html_content)
         except Exception as e:
             self.logger.error(f"HTMLパースエラー: {e}")
             raise ParseError(f"HTMLパースに失敗: {e}", raw_data=html_content[:1000])
     
+    def _get_cached_soup(self, html_content: str) -> BeautifulSoup:
+        """
+        解析済みのツリーを取得（同一内容なら再利用）
+        
+        キャッシュのキーはHTML全体ではなくblake2bの8バイトダイジェスト。
+        解析自体はロックの外で行う。
+        """
+        html_digest = hashlib.blake2b(html_content.encode('utf-8'), digest_size=8).digest()
+        
+        with self._soup_cache_lock:
+            soup = self._soup_cache.get(html_digest)
+            if soup is not None:
+                self._soup_cache.move_to_end(html_digest)
+                return soup
+        
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        
+        with self._soup_cache_lock:
+            self._soup_cache[html_digest] = soup
+            while len(self._soup_cache) > self.soup_cache_size:
+                self._soup_cache.popitem(last=False)
+        return soup
+    
     def extract_json_data(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
         """
         HTML内のJSONデータを抽出
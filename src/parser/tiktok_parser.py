@@ -23,9 +23,27 @@ from .video_data import VideoData, VideoCollection
 class TikTokParser:
     """TikTok専用パーサー"""
     
-    def __init__(self):
+    # 動画リストを格納している可能性があるキー
+    _VIDEO_LIST_KEYS = frozenset({
+        'itemList', 'items', 'videoList', 'videos', 'data',
+        'recommendList', 'feedList', 'exploreList'
+    })
+    
+    # 動画データの特徴的なキー
+    _VIDEO_INDICATOR_KEYS = frozenset({
+        'id', 'video', 'aweme_id', 'item_id',
+        'desc', 'description', 'title',
+        'author', 'user', 'creator',
+        'stats', 'statistics', 'digg_count', 'play_count'
+    })
+    
+    def __init__(self, soup_cache_size: int = 0):
+        """
+        Args:
+            soup_cache_size: HTMLParser が解析済みツリーを保持する最大件数（0でキャッシュしない）
+        """
         self.logger = get_logger(self.__class__.__name__)
-        self.html_parser = HTMLParser()
+        self.html_parser = HTMLParser(soup_cache_size=soup_cache_size)
     
     def parse_explore_page(self, html_content: str) -> VideoCollection:
         """
@@ -104,13 +122,8 @@ class TikTokParser:
         
         if isinstance(data, dict):
             # 動画データの可能性があるキーを検索
-            video_keys = [
-                'itemList', 'items', 'videoList', 'videos', 'data',
-                'recommendList', 'feedList', 'exploreList'
-            ]
-            
             for key, value in data.items():
-                if key in video_keys and isinstance(value, list):
+                if key in self._VIDEO_LIST_KEYS and isinstance(value, list):
                     # 動画リストの可能性
                     for item in value:
                         if self._is_video_data(item):
@@ -134,14 +147,7 @@ class TikTokParser:
             return False
         
         # 動画データの特徴的なキーをチェック
-        video_indicators = [
-            'id', 'video', 'aweme_id', 'item_id',
-            'desc', 'description', 'title',
-            'author', 'user', 'creator',
-            'stats', 'statistics', 'digg_count', 'play_count'
-        ]
-        
-        return any(key in data for key in video_indicators)
+        return not self._VIDEO_INDICATOR_KEYS.isdisjoint(data)
     
     def _create_video_from_json(self, video_info: Dict[str, Any]) -> Optional[VideoData]:
         """JSON情報から動画データを作成"""
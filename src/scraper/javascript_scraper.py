@@ -17,6 +17,10 @@ from .exceptions import ScraperError, APIError
 class JavaScriptScraper:
     """JavaScript実行機能付きスクレイパー"""
     
+    # 動画データの特徴的なキー / 動画リストを格納している可能性があるキー
+    _VIDEO_ITEM_KEYS = frozenset({'id', 'aweme_id', 'video_id', 'desc', 'author', 'stats'})
+    _SCRIPT_DATA_LIST_KEYS = frozenset({'itemList', 'items', 'videoList', 'videos', 'data'})
+    
     def __init__(self, api_client: Optional[ScraperAPIClient] = None):
         """
         JavaScript実行機能付きスクレイパーを初期化
@@ -337,7 +341,7 @@ class JavaScriptScraper:
                 if isinstance(obj, dict):
                     # 動画データの可能性があるキーを検索
                     for key, value in obj.items():
-                        if key in ['itemList', 'items', 'videoList', 'videos', 'data']:
+                        if key in self._SCRIPT_DATA_LIST_KEYS:
                             if isinstance(value, list):
                                 for item in value:
                                     if self._is_video_item(item):
@@ -363,8 +367,7 @@ class JavaScriptScraper:
             return False
         
         # 動画データの特徴的なキーをチェック
-        video_keys = ['id', 'aweme_id', 'video_id', 'desc', 'author', 'stats']
-        return any(key in item for key in video_keys)
+        return not self._VIDEO_ITEM_KEYS.isdisjoint(item)
     
     def _extract_video_from_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """動画アイテムから動画データを抽出"""
@@ -5,6 +5,8 @@ ScraperAPI client for TikTok Research System
 import time
 import random
 import requests
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass
 from typing import Dict, Any, Optional, Union
 from urllib.parse import urlencode
 
@@ -22,9 +24,35 @@ from .exceptions import (
 )
 
 
+@dataclass(frozen=True)
+class CompiledRequest:
+    """
+    ScraperAPIClient.precompile で事前に組み立てたリクエスト設定
+    
+    呼び出しごとに値が変わらないパラメータはエンコード済みのクエリ文字列として保持し、
+    セッション番号やプロキシ設定で上書きされうるパラメータのみ呼び出しごとにエンコードする。
+    """
+    static_query: str  # api_key と固定パラメータのエンコード済みクエリ
+    dynamic_params: Dict[str, Any]  # プロキシ設定で上書きされうるパラメータ
+    dynamic_overrides: Dict[str, Any]  # 上記を最後に上書きするカスタムパラメータ
+    country_code: str
+    rotate_user_agent: bool
+    use_proxy_rotation: bool
+
+
 class ScraperAPIClient:
     """ScraperAPI クライアント"""
     
+    # 同一ホストへの接続プールのサイズ（keep-aliveで接続を再利用）
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 4
+    
+    # ストリーミング取得時のチャンクサイズ（バイト）
+    STREAM_CHUNK_SIZE = 32 * 1024
+    
+    # セッション番号・プロキシ設定によってリクエストごとに値が変わりうるパラメータ
+    DYNAMIC_PARAM_KEYS = frozenset({'country_code', 'premium', 'keep_headers', 'session_number'})
+    
     def __init__(
         self,
         api_key: str,
@@ -61,6 +89,7 @@ class ScraperAPIClient:
         
         self.logger = get_logger(self.__class__.__name__)
         self.session = requests.Session()
+        self._mount_http_adapter()
         
         # 新機能の初期化
         self.user_agent_manager = UserAgentManager()
@@ -91,6 +120,22 @@ class ScraperAPIClient:
         self.logger.info(f"リクエスト制御: {'有効' if enable_request_throttling else '無効'}")
         self.logger.info(f"デバイスタイプ: {device_type}")
     
+    def _mount_http_adapter(self):
+        """
+        接続プール付きのアダプターをセッションに登録
+        
+        ScraperAPIへのリクエストは同一ホスト宛てのため、TCP/TLS接続を使い回して
+        リクエストごとのハンドシェイクを省く。再試行は scrape / scrape_compiled の
+        リトライに一本化し、トランスポート層では再試行しない。
+        """
+        adapter = HTTPAdapter(
+            pool_connections=self.POOL_CONNECTIONS,
+            pool_maxsize=self.POOL_MAXSIZE,
+            max_retries=0
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
     def _update_session_headers(self):
         """セッションヘッダーを更新"""
         headers = self.user_agent_manager.get_browser_headers(self.current_user_agent)
@@ -110,34 +155,87 @@ class ScraperAPIClient:
         self._update_session_headers()
         self.logger.debug(f"User-Agentを変更: {self.current_user_agent[:50]}...")
     
-    def _build_url(self, target_url: str, params: Dict[str, Any]) -> str:
+    def precompile(
+        self,
+        render_js: bool = True,
+        country_code: str = "JP",
+        device_type: str = "desktop",
+        premium: bool = True,
+        keep_headers: bool = True,
+        output_format: str = "text",
+        custom_params: Optional[Dict[str, Any]] = None,
+        rotate_user_agent: bool = True,
+        use_proxy_rotation: bool = True
+    ) -> CompiledRequest:
+        """
+        同じ設定で繰り返しスクレイピングするためのリクエスト設定を事前に組み立て
+        
+        引数は scrape と同じ。返り値を scrape_compiled に渡すと、固定パラメータの
+        エンコードを呼び出しごとに繰り返さない。
+        
+        Returns:
+            事前に組み立てたリクエスト設定
+        """
+        # パラメータ構築
+        params = {
+            'render': 'true' if render_js else 'false',
+            'country_code': country_code,
+            'device_type': device_type,
+            'premium': 'true' if premium else 'false',
+            'keep_headers': 'true' if keep_headers else 'false',
+            'format': output_format,
+            'wait': 5000,  # JavaScript読み込み待機時間を増加
+            'timeout': self.timeout * 1000,  # ミリ秒に変換
+        }
+        
+        static_params = {'api_key': self.api_key}
+        dynamic_params = {}
+        for key, value in params.items():
+            if key in self.DYNAMIC_PARAM_KEYS:
+                dynamic_params[key] = value
+            else:
+                static_params[key] = value
+        
+        # カスタムパラメータは固定パラメータを上書きし、変動しうるパラメータは最後に上書き
+        dynamic_overrides = {}
+        for key, value in (custom_params or {}).items():
+            if key in self.DYNAMIC_PARAM_KEYS:
+                dynamic_overrides[key] = value
+            else:
+                static_params[key] = value
+        
+        return CompiledRequest(
+            static_query=urlencode(static_params),
+            dynamic_params=dynamic_params,
+            dynamic_overrides=dynamic_overrides,
+            country_code=country_code,
+            rotate_user_agent=rotate_user_agent,
+            use_proxy_rotation=use_proxy_rotation
+        )
+    
+    def _build_url(self, target_url: str, compiled: CompiledRequest, params: Dict[str, Any]) -> str:
         """
         リクエストURLを構築
         
         Args:
             target_url: スクレイピング対象URL
-            params: パラメータ
+            compiled: 事前に組み立てたリクエスト設定
+            params: 呼び出しごとのパラメータ
             
         Returns:
             構築されたURL
         """
-        # 必須パラメータを追加
-        all_params = {
-            'api_key': self.api_key,
-            'url': target_url,
-            **params
-        }
-        
-        # パラメータをエンコード
-        query_string = urlencode(all_params)
-        return f"{self.base_url}?{query_string}"
+        # 固定パラメータはエンコード済みのため、対象URLと呼び出しごとのパラメータのみエンコード
+        query_string = urlencode({'url': target_url, **params})
+        return f"{self.base_url}?{compiled.static_query}&{query_string}"
     
-    def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
+    def _handle_response(self, response: requests.Response, stream: bool = False) -> Dict[str, Any]:
         """
         レスポンスを処理
         
         Args:
             response: HTTPレスポンス
+            stream: 本文を読み込まずチャンクのイテレータとして返すか
             
         Returns:
             処理されたレスポンスデータ
@@ -150,6 +248,15 @@ class ScraperAPIClient:
         status_code = response.status_code
         
         # 成功
+        if status_code == 200 and stream:
+            return {
+                'success': True,
+                'status_code': status_code,
+                'chunks': self._iter_response_chunks(response),
+                'encoding': response.encoding,
+                'headers': dict(response.headers)
+            }
+        
         if status_code == 200:
             return {
                 'success': True,
@@ -184,6 +291,32 @@ class ScraperAPIClient:
                 response_text=response.text
             )
     
+    def _iter_response_chunks(self, response: requests.Response):
+        """
+        レスポンス本文をチャンク単位で返し、読み終えたら接続をプールに戻す
+        
+        Content-Length はチャンク転送では存在せず、圧縮時は圧縮後のサイズのため、
+        最後まで読み終えた時点で実際に受信した（展開後の）バイト数から読み取り時間を
+        シミュレートする。
+        """
+        bytes_read = 0
+        try:
+            for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                bytes_read += len(chunk)
+                yield chunk
+        finally:
+            response.close()
+        
+        self._simulate_reading(bytes_read)
+    
+    def _simulate_reading(self, content_length: int):
+        """人間らしい読み取り時間をシミュレート（リクエスト制御が有効な場合のみ）"""
+        if self.request_throttle:
+            reading_time = self.request_throttle.simulate_reading_time(content_length)
+            if reading_time > 1.0:  # 1秒以上の場合のみ実行
+                self.logger.debug(f"読み取り時間シミュレート: {reading_time:.2f}秒")
+                time.sleep(reading_time)
+    
     @retry_on_exception(max_retries=3, delay=1.0)
     def scrape(
         self,
@@ -197,7 +330,8 @@ class ScraperAPIClient:
         output_format: str = "text",
         custom_params: Optional[Dict[str, Any]] = None,
         rotate_user_agent: bool = True,
-        use_proxy_rotation: bool = True
+        use_proxy_rotation: bool = True,
+        stream: bool = False
     ) -> Dict[str, Any]:
         """
         URLをスクレイピング（改良版）
@@ -214,6 +348,8 @@ class ScraperAPIClient:
             custom_params: カスタムパラメータ
             rotate_user_agent: User-Agentをローテーションするか
             use_proxy_rotation: プロキシローテーションを使用するか
+            stream: Trueの場合、本文を 'content' に読み込まず、バイト列チャンクの
+                    イテレータを 'chunks' として返す（呼び出し側で最後まで読むこと）
             
         Returns:
             スクレイピング結果
@@ -222,6 +358,53 @@ class ScraperAPIClient:
             APIError: API関連エラー
             NetworkError: ネットワークエラー
         """
+        compiled = self.precompile(
+            render_js=render_js,
+            country_code=country_code,
+            device_type=device_type,
+            premium=premium,
+            keep_headers=keep_headers,
+            output_format=output_format,
+            custom_params=custom_params,
+            rotate_user_agent=rotate_user_agent,
+            use_proxy_rotation=use_proxy_rotation
+        )
+        return self._scrape_compiled(url, compiled, session_number, stream)
+    
+    @retry_on_exception(max_retries=3, delay=1.0)
+    def scrape_compiled(
+        self,
+        url: str,
+        compiled: CompiledRequest,
+        session_number: Optional[int] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        precompile で組み立てた設定でURLをスクレイピング
+        
+        Args:
+            url: スクレイピング対象URL
+            compiled: precompile の返り値
+            session_number: セッション番号
+            stream: scrape の stream と同じ
+            
+        Returns:
+            スクレイピング結果
+            
+        Raises:
+            APIError: API関連エラー
+            NetworkError: ネットワークエラー
+        """
+        return self._scrape_compiled(url, compiled, session_number, stream)
+    
+    def _scrape_compiled(
+        self,
+        url: str,
+        compiled: CompiledRequest,
+        session_number: Optional[int],
+        stream: bool
+    ) -> Dict[str, Any]:
+        """scrape / scrape_compiled の本体（リトライは呼び出し側のデコレータが担う）"""
         # URL検証
         if not validate_url(url):
             raise ValueError(f"無効なURL: {url}")
@@ -233,27 +416,18 @@ class ScraperAPIClient:
                 self.logger.info(f"リクエスト制御: {wait_time:.2f}秒待機しました")
         
         # User-Agentローテーション
-        if rotate_user_agent:
+        if compiled.rotate_user_agent:
             self._rotate_user_agent()
         
         # プロキシ選択
         proxy = None
-        if use_proxy_rotation:
-            proxy = self.proxy_manager.get_proxy_for_country(country_code)
+        if compiled.use_proxy_rotation:
+            proxy = self.proxy_manager.get_proxy_for_country(compiled.country_code)
             if not proxy:
                 proxy = self.proxy_manager.get_next_proxy()
         
-        # パラメータ構築
-        params = {
-            'render': 'true' if render_js else 'false',
-            'country_code': country_code,
-            'device_type': device_type,
-            'premium': 'true' if premium else 'false',
-            'keep_headers': 'true' if keep_headers else 'false',
-            'format': output_format,
-            'wait': 5000,  # JavaScript読み込み待機時間を増加
-            'timeout': self.timeout * 1000,  # ミリ秒に変換
-        }
+        # パラメータ構築（固定パラメータはエンコード済み）
+        params = dict(compiled.dynamic_params)
         
         # セッション番号設定
         if session_number is None:
@@ -266,11 +440,10 @@ class ScraperAPIClient:
             params.update(proxy_params)
         
         # カスタムパラメータを追加
-        if custom_params:
-            params.update(custom_params)
+        params.update(compiled.dynamic_overrides)
         
         # リクエストURL構築
-        request_url = self._build_url(url, params)
+        request_url = self._build_url(url, compiled, params)
         
         self.logger.info(f"スクレイピング開始: {url}")
         if proxy:
@@ -281,23 +454,21 @@ class ScraperAPIClient:
             response = self.session.get(
                 request_url,
                 timeout=self.timeout,
-                allow_redirects=True
+                allow_redirects=True,
+                stream=stream
             )
             
             # レスポンス処理
-            result = self._handle_response(response)
+            result = self._handle_response(response, stream=stream)
             
             # プロキシ成功を記録
             if proxy:
                 self.proxy_manager.record_proxy_result(proxy, True)
             
             # 人間らしい読み取り時間をシミュレート
-            if self.request_throttle:
-                content_length = len(result.get('content', ''))
-                reading_time = self.request_throttle.simulate_reading_time(content_length)
-                if reading_time > 1.0:  # 1秒以上の場合のみ実行
-                    self.logger.debug(f"読み取り時間シミュレート: {reading_time:.2f}秒")
-                    time.sleep(reading_time)
+            # （stream の場合は本文を読み終えた時点でチャンクのイテレータが行う）
+            if not stream:
+                self._simulate_reading(len(result.get('content', '')))
             
             self.logger.info(f"スクレイピング成功: {url}")
             return result
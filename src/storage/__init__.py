@@ -3,8 +3,10 @@ Storage modules for TikTok Research System
 """
 
 from .database import DatabaseManager
+from .detail_cache import VideoDetailCache
 
 __all__ = [
-    'DatabaseManager'
+    'DatabaseManager',
+    'VideoDetailCache'
 ]
 
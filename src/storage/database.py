@@ -17,18 +17,49 @@ from ..parser.video_data import VideoData, VideoCollection
 class DatabaseManager:
     """データベース管理クラス"""
     
-    def __init__(self, db_path: str = "data/tiktok_videos.db"):
+    # 動画データの挿入または更新（save_video / save_videos で共通）
+    _UPSERT_VIDEO_SQL = '''
+        INSERT OR REPLACE INTO videos (
+            video_id, url, title, description,
+            author_username, author_display_name, author_follower_count, author_verified,
+            view_count, like_count, comment_count, share_count,
+            upload_date, duration,
+            thumbnail_url, video_url, music_title, music_author,
+            region, language,
+            collected_at, source_page, raw_data,
+            updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    
+    # 高速モードで接続時に実行するPRAGMA（永続性を犠牲にして書き込みを高速化）
+    _FAST_MODE_PRAGMAS = (
+        "PRAGMA journal_mode=OFF",
+        "PRAGMA synchronous=OFF",
+        "PRAGMA temp_store=MEMORY",
+    )
+    
+    def __init__(self, db_path: str = "data/tiktok_videos.db", fast_mode: bool = False):
         """
         データベースマネージャーを初期化
         
         Args:
-            db_path: データベースファイルのパス
+            db_path: データベースファイルのパス（":memory:" でメモリ内データベース）
+            fast_mode: ジャーナルと同期書き込みを無効化する（使い捨てのDB向け）
         """
         self.db_path = Path(db_path)
+        self.fast_mode = fast_mode
         self.logger = get_logger(self.__class__.__name__)
         
-        # データベースディレクトリを作成
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._memory_uri = None
+        self._memory_anchor = None
+        if db_path == ":memory:":
+            # 接続ごとに別のDBにならないよう共有キャッシュのURIを使用し、
+            # インスタンスが生きている間は接続を1つ保持してDBを維持する
+            self._memory_uri = f"file:tiktok_memdb_{id(self)}?mode=memory&cache=shared"
+            self._memory_anchor = sqlite3.connect(self._memory_uri, uri=True)
+        else:
+            # データベースディレクトリを作成
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         # データベースを初期化
         self._initialize_database()
@@ -146,11 +177,21 @@ class DatabaseManager:
     @contextmanager
     def _get_connection(self):
         """データベース接続のコンテキストマネージャー"""
-        conn = sqlite3.connect(
-            self.db_path,
-            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
-        )
+        if self._memory_uri:
+            conn = sqlite3.connect(
+                self._memory_uri,
+                uri=True,
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+            )
         conn.row_factory = sqlite3.Row
+        if self.fast_mode:
+            for pragma in self._FAST_MODE_PRAGMAS:
+                conn.execute(pragma)
         try:
             yield conn
         finally:
@@ -171,27 +212,7 @@ class DatabaseManager:
                 cursor = conn.cursor()
                 
                 # 動画データを挿入または更新
-                cursor.execute('''
-                    INSERT OR REPLACE INTO videos (
-                        video_id, url, title, description,
-                        author_username, author_display_name, author_follower_count, author_verified,
-                        view_count, like_count, comment_count, share_count,
-                        upload_date, duration,
-                        thumbnail_url, video_url, music_title, music_author,
-                        region, language,
-                        collected_at, source_page, raw_data,
-                        updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    video.video_id, video.url, video.title, video.description,
-                    video.author_username, video.author_display_name, video.author_follower_count, video.author_verified,
-                    video.view_count, video.like_count, video.comment_count, video.share_count,
-                    video.upload_date, video.duration,
-                    video.thumbnail_url, video.video_url, video.music_title, video.music_author,
-                    video.region, video.language,
-                    video.collected_at, video.source_page, json.dumps(video.raw_data),
-                    datetime.now()
-                ))
+                cursor.execute(self._UPSERT_VIDEO_SQL, self._video_to_row(video, datetime.now()))
                 
                 # ハッシュタグを保存
                 self._save_hashtags(cursor, video.video_id, video.hashtags)
@@ -208,6 +229,68 @@ class DatabaseManager:
             self.logger.error(f"動画データ保存エラー ({video.video_id}): {e}")
             return False
     
+    def save_videos(self, videos: List[VideoData]) -> int:
+        """
+        複数の動画データを1トランザクションでまとめて保存
+        
+        Args:
+            videos: 動画データリスト
+            
+        Returns:
+            保存された動画数（失敗時は0）
+        """
+        videos = list(videos)
+        if not videos:
+            return 0
+        
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                
+                updated_at = datetime.now()
+                video_ids = [(video.video_id,) for video in videos]
+                
+                # 動画データを一括で挿入または更新
+                cursor.executemany(
+                    self._UPSERT_VIDEO_SQL,
+                    [self._video_to_row(video, updated_at) for video in videos]
+                )
+                
+                # ハッシュタグ・メンションを一括で置き換え
+                cursor.executemany("DELETE FROM hashtags WHERE video_id = ?", video_ids)
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO hashtags (video_id, hashtag) VALUES (?, ?)",
+                    [(video.video_id, hashtag) for video in videos for hashtag in video.hashtags]
+                )
+                cursor.executemany("DELETE FROM mentions WHERE video_id = ?", video_ids)
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO mentions (video_id, mention) VALUES (?, ?)",
+                    [(video.video_id, mention) for video in videos for mention in video.mentions]
+                )
+                
+                conn.commit()
+                
+                self.logger.debug(f"動画データを一括保存: {len(videos)} 件")
+                return len(videos)
+                
+        except Exception as e:
+            self.logger.error(f"動画データ一括保存エラー: {e}")
+            return 0
+    
+    @staticmethod
+    def _video_to_row(video: VideoData, updated_at: datetime) -> tuple:
+        """VideoDataを videos テーブルの挿入パラメータに変換"""
+        return (
+            video.video_id, video.url, video.title, video.description,
+            video.author_username, video.author_display_name, video.author_follower_count, video.author_verified,
+            video.view_count, video.like_count, video.comment_count, video.share_count,
+            video.upload_date, video.duration,
+            video.thumbnail_url, video.video_url, video.music_title, video.music_author,
+            video.region, video.language,
+            video.collected_at, video.source_page, json.dumps(video.raw_data),
+            updated_at
+        )
+    
     def _save_hashtags(self, cursor, video_id: str, hashtags: List[str]):
         """ハッシュタグを保存"""
         # 既存のハッシュタグを削除
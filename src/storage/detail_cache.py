@@ -0,0 +1,141 @@
+"""
+Video detail cache for TikTok Research System
+ScraperAPI経由で取得した動画詳細情報をメモリとディスクにキャッシュ
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+from pathlib import Path
+from contextlib import contextmanager
+
+from ..utils import json_io
+from ..utils.logger import get_logger
+
+
+class VideoDetailCache:
+    """
+    動画URLをキーとする動画詳細情報の2段キャッシュ
+    
+    SQLiteファイルに有効期限付きで保存するため、プロセスの再起動をまたいで
+    再利用できる。プロセス内で最近使用したエントリはメモリ上のLRUにも保持し、
+    ディスクの読み込みとJSONの解析を省く。操作ごとに接続を開き、LRUはロックで
+    保護するので複数スレッドから同時に使用してよい。
+    """
+    
+    def __init__(self, cache_path: str = ".cache/video_details.db", ttl_seconds: float = 3600.0,
+                 memory_size: int = 4096):
+        """
+        キャッシュを初期化
+        
+        Args:
+            cache_path: キャッシュファイルのパス
+            ttl_seconds: キャッシュの有効期間（秒）
+            memory_size: メモリ上に保持する最大エントリ数（0でメモリ上に保持しない）
+        """
+        self.cache_path = Path(cache_path)
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self.logger = get_logger(self.__class__.__name__)
+        
+        # 動画URL -> (有効期限, 動画詳細情報)。末尾ほど最近使用したエントリ
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with self._get_connection() as conn:
+            # 読み込みと書き込みを並行できるようWALモードを使用
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS video_details (
+                    video_url TEXT PRIMARY KEY,
+                    details TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            
+            # 期限切れのエントリを削除
+            conn.execute("DELETE FROM video_details WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+    
+    @contextmanager
+    def _get_connection(self):
+        """キャッシュファイルへの接続のコンテキストマネージャー"""
+        conn = sqlite3.connect(self.cache_path, timeout=30.0)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def get(self, video_url: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュ済みの動画詳細情報を取得
+        
+        Args:
+            video_url: 動画URL
+        
+        Returns:
+            動画詳細情報の辞書（未キャッシュまたは期限切れの場合はNone）
+        """
+        now = time.time()
+        
+        with self._memory_lock:
+            entry = self._memory.get(video_url)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(video_url)
+                    # 呼び出し側での変更がキャッシュに及ばないよう複製を返す
+                    return dict(entry[1])
+                del self._memory[video_url]
+        
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute(
+                    "SELECT details, expires_at FROM video_details WHERE video_url = ? AND expires_at > ?",
+                    (video_url, now)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.warning(f"キャッシュ読み込みエラー ({video_url}): {e}")
+            return None
+        
+        if not row:
+            return None
+        
+        details = json_io.loads(row[0])
+        self._remember(video_url, details, row[1])
+        return dict(details)
+    
+    def set(self, video_url: str, details: Dict[str, Any]):
+        """
+        動画詳細情報をキャッシュに保存
+        
+        Args:
+            video_url: 動画URL
+            details: 動画詳細情報の辞書
+        """
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(video_url, dict(details), expires_at)
+        
+        try:
+            with self._get_connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO video_details (video_url, details, expires_at) VALUES (?, ?, ?)",
+                    (video_url, json_io.dumps(details).decode('utf-8'), expires_at)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.warning(f"キャッシュ書き込みエラー ({video_url}): {e}")
+    
+    def _remember(self, video_url: str, details: Dict[str, Any], expires_at: float):
+        """メモリ上のLRUにエントリを追加（上限を超えた場合は最も古いものを破棄）"""
+        if self.memory_size <= 0:
+            return
+        
+        with self._memory_lock:
+            self._memory[video_url] = (expires_at, details)
+            self._memory.move_to_end(video_url)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
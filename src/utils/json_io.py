@@ -0,0 +1,139 @@
+"""
+JSON serialization helpers for TikTok Research System
+orjson（Rust実装）が利用可能なら優先し、なければ標準のjsonにフォールバック
+"""
+
+import json
+from typing import Any, Callable, Iterable, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson.JSONDecodeError は json.JSONDecodeError のサブクラス
+JSONDecodeError = json.JSONDecodeError
+
+# 文字列の途中から始まるJSON値の解析用（orjsonには同等の機能がない）
+_raw_decoder = json.JSONDecoder()
+
+
+def loads(data: Any) -> Any:
+    """
+    JSON文字列（またはバイト列）を解析
+
+    Args:
+        data: JSON文字列またはバイト列
+
+    Returns:
+        解析結果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def raw_decode(text: str, index: int = 0) -> Tuple[Any, int]:
+    """
+    文字列の指定位置から始まるJSON値を1つだけ解析
+
+    値の終端は括弧や文字列リテラルの対応から決まるため、HTML中に埋め込まれた
+    JSONを後続の文字列ごと渡してよい。
+
+    Args:
+        text: JSONを含む文字列
+        index: JSON値の開始位置
+
+    Returns:
+        解析結果と、値の直後の位置のタプル
+    """
+    return _raw_decoder.raw_decode(text, index)
+
+
+def decode_embedded(text: str, index: int = 0, terminator: str = '</script>') -> Any:
+    """
+    HTML中のscriptタグに埋め込まれたJSON値を解析
+
+    orjsonが利用可能な場合は、値が終端文字列（末尾の空白と ; を除く）の直前で
+    終わっているとみなしてorjsonで解析する。そうでない場合（値の後に別の
+    スクリプトが続く場合など）は raw_decode で値の終端を判定して解析する。
+
+    Args:
+        text: JSONを含む文字列
+        index: JSON値の開始位置
+        terminator: JSON値を含むscriptタグの終端
+
+    Returns:
+        解析結果
+    """
+    if orjson is not None:
+        end = text.find(terminator, index)
+        if end != -1:
+            try:
+                return orjson.loads(text[index:end].rstrip(' \t\r\n;'))
+            except orjson.JSONDecodeError:
+                pass
+
+    return _raw_decoder.raw_decode(text, index)[0]
+
+
+def dumps(obj: Any, indent: bool = False, default: Optional[Callable] = None) -> bytes:
+    """
+    オブジェクトをUTF-8のJSONバイト列に変換
+
+    Args:
+        obj: 変換対象のオブジェクト
+        indent: 2スペースでインデントするかどうか
+        default: シリアライズできない値の変換関数
+
+    Returns:
+        JSONバイト列（非ASCII文字はエスケープしない）
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    return json.dumps(
+        obj, ensure_ascii=False, indent=2 if indent else None, default=default
+    ).encode('utf-8')
+
+
+def dump(obj: Any, file_path: Any, indent: bool = True, default: Optional[Callable] = None):
+    """
+    オブジェクトをJSONファイルに保存
+
+    Args:
+        obj: 保存対象のオブジェクト
+        file_path: 保存先のファイルパス
+        indent: 2スペースでインデントするかどうか
+        default: シリアライズできない値の変換関数
+    """
+    with open(file_path, 'wb') as f:
+        f.write(dumps(obj, indent=indent, default=default))
+
+
+def write_array(f, items: Iterable[Any], default: Optional[Callable] = None) -> int:
+    """
+    JSON配列を要素ごとにシリアライズしてバイナリファイルに書き込み
+
+    配列全体を一つの文字列として組み立てないため、件数が多くてもメモリを圧迫しない。
+
+    Args:
+        f: 書き込み先のバイナリファイルオブジェクト
+        items: 配列の要素（イテレータ可）
+        default: シリアライズできない値の変換関数
+
+    Returns:
+        書き込んだ要素数
+    """
+    count = 0
+    f.write(b'[')
+    for item in items:
+        f.write(b',\n' if count else b'\n')
+        f.write(dumps(item, default=default))
+        count += 1
+    f.write(b'\n]' if count else b']')
+    return count
@@ -5,6 +5,7 @@
 
 import time
 import random
+import threading
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 from ..utils.logger import get_logger
@@ -282,3 +283,53 @@ class RequestThrottle:
         
         self.logger.info("リクエスト制御統計をリセットしました")
 
+
+class TokenBucket:
+    """
+    トークンバケット方式のリクエスト制御クラス
+    
+    平均レートは capacity / fill_time_s（件/秒）に保ちつつ、バケットに
+    トークンが溜まっていれば待たずに連続してリクエストできる。
+    複数スレッドから同時に acquire してもよい。
+    """
+    
+    def __init__(self, capacity: int = 3, fill_time_s: float = 60.0):
+        """
+        トークンバケットを初期化
+        
+        Args:
+            capacity: バケットの容量（連続して送れる最大リクエスト数）
+            fill_time_s: 空のバケットが満杯になるまでの時間（秒）
+        """
+        self.capacity = capacity
+        self.fill_rate = capacity / fill_time_s  # トークン/秒
+        
+        self._tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        """経過時間に応じてトークンを補充（ロック取得済みで呼び出すこと）"""
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.fill_rate)
+        self._last_refill = now
+    
+    def acquire(self) -> float:
+        """
+        トークンを1つ取得（不足している場合は補充されるまで待機）
+        
+        Returns:
+            実際の待機時間（秒）
+        """
+        total_wait = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return total_wait
+                wait_time = (1.0 - self._tokens) / self.fill_rate
+            
+            # ロックを離してから待機（他スレッドの補充・取得を妨げない）
+            time.sleep(wait_time)
+            total_wait += wait_time
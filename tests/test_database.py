@@ -88,6 +88,36 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].video_id, "test123")
     
+    def test_save_videos(self):
+        """一括保存のテスト"""
+        other_video = VideoData(
+            video_id="test456",
+            url="https://tiktok.com/test456",
+            title="Another Video",
+            view_count=300000,
+            hashtags=["other"]
+        )
+        
+        saved_count = self.db.save_videos([self.test_video, other_video])
+        self.assertEqual(saved_count, 2)
+        
+        retrieved_video = self.db.get_video("test123")
+        self.assertIsNotNone(retrieved_video)
+        self.assertEqual(retrieved_video.view_count, 1000000)
+        self.assertEqual(sorted(retrieved_video.hashtags), ["test", "video"])
+        self.assertEqual(sorted(retrieved_video.mentions), ["user1", "user2"])
+        
+        retrieved_video = self.db.get_video("test456")
+        self.assertIsNotNone(retrieved_video)
+        self.assertEqual(retrieved_video.hashtags, ["other"])
+        
+        # 再保存時はハッシュタグが置き換えられる
+        other_video.hashtags = ["replaced"]
+        self.assertEqual(self.db.save_videos([other_video]), 1)
+        self.assertEqual(self.db.get_video("test456").hashtags, ["replaced"])
+        
+        self.assertEqual(self.db.save_videos([]), 0)
+    
     def test_save_collection(self):
         """コレクション保存のテスト"""
         collection = VideoCollection(
@@ -111,6 +141,18 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertIn('today_videos', stats)
         self.assertIn('popular_hashtags', stats)
     
+    def test_memory_database_fast_mode(self):
+        """メモリ内データベース（高速モード）のテスト"""
+        db = DatabaseManager(":memory:", fast_mode=True)
+        
+        # 接続をまたいでテーブルとデータが保持されるかチェック
+        self.assertEqual(db.save_videos([self.test_video]), 1)
+        
+        retrieved_video = db.get_video("test123")
+        self.assertIsNotNone(retrieved_video)
+        self.assertEqual(set(retrieved_video.hashtags), {"test", "video"})
+        self.assertEqual(db.get_statistics()['total_videos'], 1)
+    
     def test_cleanup_old_data(self):
         """古いデータ削除のテスト"""
         # 古い動画データを作成
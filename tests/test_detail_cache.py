@@ -0,0 +1,62 @@
+"""
+Tests for video detail cache module
+"""
+
+import unittest
+import tempfile
+import os
+import time
+
+from src.storage.detail_cache import VideoDetailCache
+
+
+class TestVideoDetailCache(unittest.TestCase):
+    """動画詳細情報キャッシュのテストクラス"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache", "video_details.db")
+        self.video_url = "https://www.tiktok.com/@test/video/123"
+        self.details = {"video_id": "123", "view_count": 1000, "title": "テスト動画"}
+    
+    def tearDown(self):
+        """テストクリーンアップ"""
+        self.temp_dir.cleanup()
+    
+    def test_set_and_get(self):
+        """保存した詳細情報を取得できるかテスト"""
+        cache = VideoDetailCache(self.cache_path)
+        self.assertIsNone(cache.get(self.video_url))
+        
+        cache.set(self.video_url, self.details)
+        self.assertEqual(cache.get(self.video_url), self.details)
+        
+        # 別インスタンス（再起動後）からも取得できる
+        self.assertEqual(VideoDetailCache(self.cache_path).get(self.video_url), self.details)
+    
+    def test_memory_tier(self):
+        """メモリ上のエントリが複製で返され、上限を超えると破棄されるかテスト"""
+        cache = VideoDetailCache(self.cache_path, memory_size=1)
+        cache.set(self.video_url, self.details)
+        
+        cached = cache.get(self.video_url)
+        cached['view_count'] = 0
+        self.assertEqual(cache.get(self.video_url), self.details)
+        
+        # 上限を超えたエントリはメモリから破棄されるが、ディスクから取得できる
+        cache.set("https://www.tiktok.com/@test/video/456", {"video_id": "456"})
+        self.assertNotIn(self.video_url, cache._memory)
+        self.assertEqual(cache.get(self.video_url), self.details)
+    
+    def test_expired_entry(self):
+        """期限切れの詳細情報が返されないかテスト"""
+        cache = VideoDetailCache(self.cache_path, ttl_seconds=0.05)
+        cache.set(self.video_url, self.details)
+        
+        time.sleep(0.1)
+        self.assertIsNone(cache.get(self.video_url))
+
+
+if __name__ == '__main__':
+    unittest.main()
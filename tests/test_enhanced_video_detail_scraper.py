@@ -0,0 +1,122 @@
+"""
+Tests for enhanced video detail scraper module
+"""
+
+import unittest
+import json
+
+from bs4 import BeautifulSoup
+
+from enhanced_video_detail_scraper import VideoDetailExtractor, JSON_LD_SCRIPT_RE
+
+
+def _item_struct(desc, digg_count, unique_id):
+    """itemStruct / ItemModule の動画データを作成"""
+    return {
+        "id": "123",
+        "desc": desc,
+        "createTime": 1700000000,
+        "stats": {"playCount": 1000, "diggCount": digg_count, "commentCount": 5, "shareCount": 2},
+        "author": {"uniqueId": unique_id, "nickname": "テスト", "verified": False},
+        "video": {"duration": 15, "width": 720, "height": 1280},
+    }
+
+
+class TestItemStructExtraction(unittest.TestCase):
+    """itemInfo.itemStruct からの抽出のテストクラス"""
+    
+    def setUp(self):
+        """テストセットアップ"""
+        self.extractor = VideoDetailExtractor()
+    
+    def test_sigi_state_video_detail(self):
+        """SIGI_STATEのVideoDetailが抽出され、ItemModule・UserModuleの値を上書きするかテスト"""
+        sigi_state = {
+            "ItemModule": {"123": _item_struct("item module", 10, "item_user")},
+            "UserModule": {"users": {"user": {"uniqueId": "module_user", "followerCount": 50}}},
+            "VideoDetail": {"itemInfo": {"itemStruct": _item_struct("video detail", 20, "detail_user")}},
+        }
+        html = f"<script>window['SIGI_STATE'] = {json.dumps(sigi_state)};</script>"
+        
+        details = self.extractor._extract_from_sigi_state_enhanced(html)
+        
+        # VideoDetail は最後に解析されるため、先のモジュールの値を上書きする
+        self.assertEqual(details['description'], "video detail")
+        self.assertEqual(details['like_count'], 20)
+        self.assertEqual(details['author_username'], "detail_user")
+        # VideoDetail にない項目は先のモジュールの値が残る
+        self.assertEqual(details['author_follower_count'], 50)
+    
+    def test_universal_data_video_detail(self):
+        """__UNIVERSAL_DATA_FOR_REHYDRATION__ の webapp.video-detail から抽出されるかテスト"""
+        universal_data = {
+            "__DEFAULT_SCOPE__": {
+                "webapp.video-detail": {
+                    "itemInfo": {"itemStruct": _item_struct("universal", 30, "universal_user")},
+                    "statusCode": 0,
+                },
+            },
+        }
+        html = (
+            '<script id="__UNIVERSAL_DATA_FOR_REHYDRATION__" type="application/json">'
+            f"window['__UNIVERSAL_DATA_FOR_REHYDRATION__'] = {json.dumps(universal_data)}</script>"
+        )
+        
+        details = self.extractor._extract_from_universal_data(html)
+        
+        self.assertEqual(details, {
+            'description': "universal",
+            'create_time': 1700000000,
+            'view_count': 1000,
+            'like_count': 30,
+            'comment_count': 5,
+            'share_count': 2,
+            'author_username': "universal_user",
+            'author_display_name': "テスト",
+            'author_verified': False,
+            'duration': 15,
+            'width': 720,
+            'height': 1280,
+        })
+    
+    def test_video_detail_without_item_struct(self):
+        """itemStruct がない場合に何も設定しないかテスト"""
+        details = {}
+        self.assertFalse(self.extractor._parse_webapp_video_detail({"statusCode": 10204}, details))
+        self.assertEqual(details, {})
+
+
+class TestJSONLDScriptPattern(unittest.TestCase):
+    """JSON-LDのscriptタグ検出のテストクラス"""
+    
+    def test_matches_soup_lookup(self):
+        """find_all('script', type='application/ld+json') と同じscriptタグを検出するかテスト"""
+        cases = [
+            ('<script type="application/ld+json">{"a": 1}</script>', ['{"a": 1}']),
+            ("<script type='application/ld+json'>{\"a\": 2}</script>", ['{"a": 2}']),
+            # 引用符なしの属性値
+            ('<script type=application/ld+json>{"a": 3}</script>', ['{"a": 3}']),
+            # type以外の属性の値には一致しない
+            ('<script data-type="application/ld+json" type="text/plain">{}</script>', []),
+            # 属性値は大文字小文字を区別する
+            ('<script type="APPLICATION/LD+JSON">{}</script>', []),
+            # タグ名・属性名は区別しない
+            ('<SCRIPT TYPE="application/ld+json">{"a": 6}</SCRIPT>', ['{"a": 6}']),
+            ('<script id="ld" type = "application/ld+json" async>{"a": 7}</script>', ['{"a": 7}']),
+            ('<script type="application/ld+json+x">{}</script>', []),
+        ]
+        
+        for script, expected in cases:
+            with self.subTest(script=script):
+                html = f"<html><head>{script}</head><body></body></html>"
+                found = [match.group(1) for match in JSON_LD_SCRIPT_RE.finditer(html)]
+                soup_found = [
+                    tag.string for tag in
+                    BeautifulSoup(html, 'html.parser').find_all('script', type='application/ld+json')
+                ]
+                self.assertEqual(found, expected)
+                self.assertEqual(found, soup_found)
+
+
+if __name__ == '__main__':
+    unittest.main()